@@ -7,23 +7,44 @@ Ein einfacher Python-Client für die JTL-Wawi REST API.
 Verwendung:
     from api_client import JtlWawiClient
 
-    client = JtlWawiClient(
+    with JtlWawiClient(
         base_url="http://localhost:5883",
         api_key="FB622234-98A7-46FA-A01B-06C9D0971AAF",
         app_id="meine-firma/meine-app/v1",
         app_version="1.0.0"
-    )
+    ) as client:
+        # Kunden abrufen
+        customers = client.query_customers(search="Mustermann")
 
-    # Kunden abrufen
-    customers = client.query_customers(search="Mustermann")
+        # Auftrag erstellen
+        order = client.create_sales_order(order_data)
 
-    # Auftrag erstellen
-    order = client.create_sales_order(order_data)
+        # Alle Artikel seitenweise durchlaufen (lädt die nächste Seite im Hintergrund)
+        for item in client.iter_items():
+            print(item["Id"])
+
+        # Kompletten Artikelstamm mit 8 parallelen Seitenabrufen laden
+        for item in client.scan_items(max_workers=8):
+            print(item["Id"])
+
+Der Client hält eine eigene requests.Session mit Connection-Pool (Keep-Alive),
+damit nicht jede Anfrage einen neuen TCP-/TLS-Handshake benötigt.
 """
 
 import os
+import re
+import json
+import time
+import random
+import fnmatch
+import threading
 import requests
-from typing import Optional, Dict, Any, List
+from email.utils import parsedate_to_datetime
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from requests.adapters import HTTPAdapter
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping, Iterator, Tuple, Callable, Hashable, Union
 from dataclasses import dataclass
 
 
@@ -34,6 +55,487 @@ class ApiResponse:
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     status_code: int = 0
+    retry_after: Optional[float] = None  # Sekunden laut Retry-After-Header (429/503)
+
+    @property
+    def outcome_unknown(self) -> bool:
+        """
+        True, wenn offen ist, ob der Server eine schreibende Anfrage ausgeführt hat
+
+        Verbindungsfehler/Timeouts (0), 408, 429 und 5xx: Die Anfrage kann
+        trotzdem angekommen sein. Vor einer Wiederholung daher prüfen, ob sie
+        bereits gebucht wurde. Nur andere 4xx sind eine sichere Ablehnung.
+        """
+        return not self.success and (
+            self.status_code in (0, 408, 429) or self.status_code >= 500
+        )
+
+
+class ApiError(Exception):
+    """Fehler in Methoden, die kein ApiResponse zurückgeben können (z.B. Iteratoren)"""
+
+    def __init__(self, response: ApiResponse):
+        super().__init__(response.error)
+        self.response = response
+
+
+@dataclass
+class RequestEvent:
+    """
+    Messdaten einer API-Anfrage für Hooks
+
+    Eine Anfrage umfasst alle Wiederholungen; ``latency`` enthält auch die
+    Wartezeiten dazwischen. Zusammengefasste GET-Anfragen (coalesce) und
+    Cache-Treffer erzeugen kein eigenes Ereignis.
+    """
+    method: str
+    endpoint: str  # Vorlage ohne konkrete Ids, z.B. /customers/{id}
+    path: str  # tatsächlich angefragter Pfad, z.B. /customers/42
+    timestamp: float  # Startzeit (time.time())
+    status_code: int = 0  # 0 = Verbindungsfehler/Timeout
+    success: bool = False
+    latency: float = 0.0  # Sekunden
+    request_bytes: int = 0  # gesendeter Body
+    response_bytes: int = 0  # empfangener Body
+    retries: int = 0
+    error: Optional[str] = None
+
+
+class RequestHook:
+    """
+    Basisklasse für Hooks um jede API-Anfrage
+
+    ``before`` erhält das Ereignis mit Methode, Endpoint und Startzeit, ``after``
+    dasselbe Objekt mit Status, Latenz, Bytes und Wiederholungen. Hooks laufen
+    im Thread des Aufrufers und sollten daher schnell sein; Ausnahmen werden
+    nicht abgefangen.
+    """
+
+    def before(self, event: RequestEvent) -> None:
+        pass
+
+    def after(self, event: RequestEvent) -> None:
+        pass
+
+
+@dataclass
+class PoolStats:
+    """Statistik des Connection-Pools"""
+    requests: int = 0
+    hits: int = 0  # Anfragen über eine wiederverwendete Verbindung
+    misses: int = 0  # Anfragen, für die eine neue Verbindung aufgebaut wurde
+
+
+@dataclass
+class CacheStats:
+    """Statistik des Entity-Caches"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    revalidations: int = 0  # abgelaufene Einträge, die per lastChange bestätigt wurden
+    size: int = 0
+
+
+class _EntityCache:
+    """Thread-sicherer LRU-Cache mit TTL für Einzelabrufe (get_*)"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, ApiResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, int]) -> Tuple[Optional[ApiResponse], bool]:
+        """Liefert (Eintrag, abgelaufen); (None, False) wenn nicht vorhanden"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            self._entries.move_to_end(key)
+            expires_at, response = entry
+            return response, time.monotonic() >= expires_at
+
+    def put(self, key: Tuple[str, int], response: ApiResponse) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def count(self, name: str) -> None:
+        """Erhöht einen Zähler in den Statistiken"""
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def invalidate(self, key: Tuple[str, int]) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self.stats.hits,
+                misses=self.stats.misses,
+                evictions=self.stats.evictions,
+                revalidations=self.stats.revalidations,
+                size=len(self._entries)
+            )
+
+
+@dataclass
+class RateLimit:
+    """
+    Konfiguration des adaptiven Limiters für eine Endpoint-Gruppe
+
+    Die Rate (Token-Bucket) und die Anzahl gleichzeitiger Anfragen werden nach
+    AIMD angepasst: bei 429/503, Verbindungsfehlern oder stark steigender Latenz
+    multiplikativ verringert, bei gesunden Antworten schrittweise erhöht.
+
+    Abgesenkt wird höchstens einmal je Überlastfenster: Signale von Anfragen,
+    die vor der letzten Absenkung gesendet wurden, zählen nicht. Die Rate
+    steigt zeitabhängig um ``increase_rate * rate`` pro Sekunde, unabhängig
+    davon, wie viele Antworten in dieser Zeit eintreffen. Ein Retry-After-Header
+    hält alle Anfragen der Gruppe bis zum angegebenen Zeitpunkt an.
+    """
+    rate: float = 20.0  # max. Anfragen pro Sekunde
+    burst: int = 10  # Anfragen, die ohne Wartezeit auf einmal erlaubt sind
+    min_rate: float = 1.0
+    initial_concurrency: int = 4
+    min_concurrency: int = 1
+    max_concurrency: int = 32
+    latency_factor: float = 3.0  # Latenz > Faktor * Basislatenz gilt als Überlast (0 = aus)
+    decrease_factor: float = 0.5
+    increase_rate: float = 0.05  # Anstieg pro Sekunde ohne Überlast, als Anteil von rate
+    cooldown: float = 1.0  # Mindestabstand zwischen zwei Absenkungen in Sekunden
+
+
+@dataclass
+class LimiterStats:
+    """Aktueller Zustand eines adaptiven Limiters"""
+    rate: float = 0.0
+    concurrency_limit: int = 0
+    in_flight: int = 0
+    latency: Optional[float] = None  # geglättete Latenz in Sekunden
+    throttled: int = 0  # Antworten mit 429/503 oder Verbindungsfehler
+
+
+class _AdaptiveLimiter:
+    """Token-Bucket plus AIMD-Concurrency-Limit für eine Endpoint-Gruppe"""
+
+    def __init__(self, config: RateLimit):
+        self.config = config
+        self._cond = threading.Condition()
+        self._rate = config.rate
+        self._limit = float(config.initial_concurrency)
+        self._tokens = float(config.burst)
+        self._refilled = time.monotonic()
+        self._in_flight = 0
+        self._latency: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._last_increase = time.monotonic()
+        self._paused_until = 0.0
+        self._throttled = 0
+
+    def acquire(self) -> None:
+        """Wartet auf einen freien Slot und ein Token"""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    # Retry-After des Servers: bis dahin nichts senden
+                    self._cond.wait(self._paused_until - now)
+                    continue
+                self._tokens = min(self.config.burst, self._tokens + (now - self._refilled) * self._rate)
+                self._refilled = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                self._cond.wait((1 - self._tokens) / self._rate)
+
+    def release(self, status_code: int, latency: float, retry_after: Optional[float] = None) -> None:
+        """Gibt den Slot frei und passt Rate/Limit anhand der Antwort an"""
+        config = self.config
+        with self._cond:
+            self._in_flight -= 1
+            congested = status_code in (0, 429, 503)
+
+            if congested:
+                self._throttled += 1
+            else:
+                self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+                if self._baseline is None or self._latency < self._baseline:
+                    self._baseline = self._latency
+                else:
+                    # Basislatenz langsam nachführen, damit ein altes Minimum nicht ewig gilt
+                    self._baseline += (self._latency - self._baseline) * 0.01
+                congested = bool(config.latency_factor) and self._latency > self._baseline * config.latency_factor
+
+            now = time.monotonic()
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            if congested:
+                # Nur Anfragen, die nach der letzten Absenkung gesendet wurden, sagen etwas über die neue Rate
+                sent_at = now - latency
+                if sent_at >= self._last_decrease and now - self._last_decrease >= config.cooldown:
+                    self._limit = max(config.min_concurrency, self._limit * config.decrease_factor)
+                    self._rate = max(config.min_rate, self._rate * config.decrease_factor)
+                    self._last_decrease = now
+                    self._successes = 0
+                self._last_increase = now
+            else:
+                # Rate zeitabhängig erhöhen, damit viele schnelle Antworten sie nicht hochtreiben
+                elapsed = now - self._last_increase
+                self._last_increase = now
+                self._rate = min(config.rate, self._rate + config.rate * config.increase_rate * elapsed)
+                self._successes += 1
+                if self._successes >= int(self._limit):
+                    # Ein volles "Fenster" (etwa eine Antwortzeit) ohne Überlast: Limit um eins erhöhen
+                    self._successes = 0
+                    self._limit = min(config.max_concurrency, self._limit + 1)
+
+            self._cond.notify_all()
+
+    def snapshot(self) -> LimiterStats:
+        with self._cond:
+            return LimiterStats(
+                rate=self._rate,
+                concurrency_limit=int(self._limit),
+                in_flight=self._in_flight,
+                latency=self._latency,
+                throttled=self._throttled
+            )
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Wiederholungen für lesende Anfragen (GET und */query)
+
+    Wartezeit vor Versuch n: zufällig zwischen 0 und min(backoff_max, backoff_base * 2^n)
+    ("Full Jitter"), damit viele Clients nicht im Gleichtakt wiederholen.
+    """
+    max_attempts: int = 3
+    backoff_base: float = 0.2
+    backoff_max: float = 5.0
+    retry_statuses: Tuple[int, ...] = (0, 429, 502, 503, 504)  # 0 = Verbindungsfehler/Timeout
+
+    def delay(self, attempt: int) -> float:
+        """Wartezeit vor dem Versuch ``attempt`` (ab 1) in Sekunden"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+class _LatencyTracker:
+    """Hält die letzten Antwortzeiten und liefert ein Perzentil (für Hedging)"""
+
+    def __init__(self, window: int = 1000, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._cached: Optional[float] = None
+        self._since_update = 0
+
+    def add(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+            self._since_update += 1
+
+    def percentile(self, q: float = 0.95) -> Optional[float]:
+        """Perzentil der Antwortzeiten (None bei zu wenigen Messwerten)"""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            # Nur alle 50 Messwerte neu sortieren
+            if self._cached is None or self._since_update >= 50:
+                ordered = sorted(self._samples)
+                self._cached = ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+                self._since_update = 0
+            return self._cached
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After als Sekunden (Zahl oder HTTP-Datum); None bei fehlendem/ungültigem Wert"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class _HedgeBudget:
+    """
+    Begrenzt Zweitanfragen auf einen Anteil der Leseanfragen (Token-Bucket)
+
+    Jede Leseanfrage bringt ``ratio`` Token, jede Zweitanfrage kostet eins;
+    ``burst`` begrenzt, wie viel Guthaben sich in ruhigen Phasen ansammelt.
+    """
+
+    def __init__(self, ratio: float = 0.05, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.burst)
+
+    def take(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+def request_key(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> Tuple:
+    """Schlüssel für identische Anfragen (Methode, URL, Query-Parameter)"""
+    query = tuple(sorted((name, repr(value)) for name, value in (params or {}).items()))
+    return method.upper(), url, query
+
+
+_ID_SEGMENT = re.compile(r"/(?:\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})(?=/|$)")
+
+
+def endpoint_template(path: str) -> str:
+    """Ersetzt Ids im Pfad durch {id} (/customers/42/notes → /customers/{id}/notes)"""
+    return _ID_SEGMENT.sub("/{id}", path.split("?", 1)[0])
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def iter_json_items(
+    payload: Union[bytes, str],
+    key: str = "Items",
+    fields: Optional[Tuple[str, ...]] = None,
+    meta: Optional[Dict[str, Any]] = None
+) -> Iterator[Any]:
+    """
+    Liefert die Elemente eines JSON-Arrays einzeln, ohne das ganze Dokument zu dekodieren.
+
+    Das Dokument wird auf oberster Ebene schrittweise gelesen; von den
+    Elementen unter ``key`` ist immer nur eines als Python-Objekt im Speicher.
+    Ist das Dokument selbst ein Array, werden dessen Elemente geliefert.
+
+    Args:
+        payload: Rohe Antwort (z.B. ApiResponse.data bei ``decode=False``)
+        key: Feld der obersten Ebene mit dem Array (PagedList: "Items")
+        fields: Nur diese Felder je Element übernehmen (None = alle)
+        meta: Wird mit den übrigen Feldern der obersten Ebene befüllt, sobald
+            sie gelesen sind (Felder vor dem Array also schon beim ersten Element)
+
+    Raises:
+        ValueError: Bei ungültigem JSON
+    """
+    text = payload.decode("utf-8") if isinstance(payload, (bytes, bytearray)) else payload
+    skip = _WHITESPACE.match
+    decode = _DECODER.raw_decode
+
+    pos = skip(text, 0).end()
+    if text.startswith("[", pos):
+        yield from _iter_array(text, pos + 1, fields)
+        return
+    if not text.startswith("{", pos):
+        raise ValueError(f"JSON-Objekt oder -Array erwartet (Position {pos})")
+
+    pos = skip(text, pos + 1).end()
+    while not text.startswith("}", pos):
+        name, pos = decode(text, pos)
+        pos = skip(text, pos).end()
+        if not text.startswith(":", pos):
+            raise ValueError(f"':' erwartet (Position {pos})")
+        pos = skip(text, pos + 1).end()
+
+        if name == key and text.startswith("[", pos):
+            pos = yield from _iter_array(text, pos + 1, fields)
+        else:
+            value, pos = decode(text, pos)
+            if meta is not None:
+                meta[name] = value
+
+        pos = skip(text, pos).end()
+        if text.startswith(",", pos):
+            pos = skip(text, pos + 1).end()
+
+
+def _iter_array(text: str, pos: int, fields: Optional[Tuple[str, ...]]):
+    """Liefert die Elemente ab ``pos`` (hinter '[') und gibt die Position hinter ']' zurück"""
+    skip = _WHITESPACE.match
+    decode = _DECODER.raw_decode
+
+    pos = skip(text, pos).end()
+    if text.startswith("]", pos):
+        return pos + 1
+    while True:
+        element, pos = decode(text, pos)
+        if fields is not None and isinstance(element, dict):
+            element = {name: element.get(name) for name in fields}
+        yield element
+
+        pos = skip(text, pos).end()
+        if text.startswith("]", pos):
+            return pos + 1
+        if not text.startswith(",", pos):
+            raise ValueError(f"',' oder ']' erwartet (Position {pos})")
+        pos = skip(text, pos + 1).end()
+
+
+class _SingleFlight:
+    """
+    Fasst gleichzeitige identische Aufrufe aus mehreren Threads zusammen.
+
+    Der erste Aufrufer führt die Anfrage aus, alle weiteren warten auf dessen
+    Ergebnis und erhalten dasselbe ApiResponse-Objekt.
+    """
+
+    class _Call:
+        __slots__ = ("done", "result")
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.result: Optional[ApiResponse] = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, "_SingleFlight._Call"] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], ApiResponse]) -> ApiResponse:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+
+        if not leader:
+            call.done.wait()
+            # Der erste Aufrufer ist abgebrochen (z.B. KeyboardInterrupt): selbst anfragen
+            return call.result if call.result is not None else fn()
+
+        try:
+            call.result = fn()
+            return call.result
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
 
 
 class JtlWawiClient:
@@ -45,6 +547,9 @@ class JtlWawiClient:
         api_key: Der bei der Registrierung erhaltene API-Key
         app_id: Die App-ID (z.B. meine-firma/meine-app/v1)
         app_version: Die App-Version (z.B. 1.0.0)
+
+    Der Client sollte mit ``with`` oder über ``close()`` beendet werden,
+    damit die gepoolten Verbindungen sauber geschlossen werden.
     """
 
     def __init__(
@@ -53,7 +558,23 @@ class JtlWawiClient:
         api_key: Optional[str] = None,
         app_id: Optional[str] = None,
         app_version: Optional[str] = None,
-        api_version: str = "1.0"
+        api_version: str = "1.0",
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        timeout: float = 30,
+        cache_size: int = 0,
+        cache_ttl: float = 300,
+        coalesce: bool = True,
+        rate_limits: Optional[Dict[str, RateLimit]] = None,
+        retry: Optional[RetryPolicy] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        hedge: bool = False,
+        hedge_min_delay: float = 0.05,
+        hedge_budget: float = 0.05,
+        hooks: Optional[List[RequestHook]] = None
     ):
         """
         Initialisiert den Client.
@@ -63,6 +584,28 @@ class JtlWawiClient:
         - JTL_API_KEY
         - JTL_APP_ID
         - JTL_APP_VERSION
+
+        Args:
+            pool_connections: Anzahl der Hosts, für die ein Pool vorgehalten wird
+            pool_maxsize: Maximale Anzahl offener Verbindungen pro Host
+            pool_block: Bei vollem Pool warten statt zusätzliche Verbindung öffnen
+            keep_alive: Verbindungen nach der Antwort offen halten
+            timeout: Timeout pro Anfrage in Sekunden
+            cache_size: Max. Einträge im Entity-Cache für get_* (0 = kein Cache)
+            cache_ttl: Gültigkeit eines Cache-Eintrags in Sekunden
+            coalesce: Gleichzeitige identische GET-Anfragen zusammenfassen
+            rate_limits: Adaptive Limits pro Endpoint-Gruppe, z.B.
+                {"/stock/*": RateLimit(rate=10), "*": RateLimit(rate=50)}.
+                Das erste passende Muster gilt; ohne Treffer kein Limit.
+            retry: Wiederholungen für lesende Anfragen (None = ein Versuch)
+            connect_timeout: Timeout für den Verbindungsaufbau lesender Anfragen
+            read_timeout: Timeout für die Antwort lesender Anfragen
+            hedge: Lesende Anfragen doppelt senden, wenn nach dem p95 der
+                bisherigen Antwortzeiten noch keine Antwort da ist
+            hedge_min_delay: Minimale Wartezeit vor der Zweitanfrage in Sekunden
+            hedge_budget: Höchstens dieser Anteil der Leseanfragen wird doppelt gesendet
+            hooks: RequestHook-Instanzen, die vor und nach jeder Anfrage
+                aufgerufen werden (z.B. metrics.MetricsCollector)
         """
         self.base_url = base_url or os.getenv("JTL_API_BASE_URL", "http://localhost:5883")
         self.api_key = api_key or os.getenv("JTL_API_KEY")
@@ -73,51 +616,402 @@ class JtlWawiClient:
         if not self.api_key:
             raise ValueError("API-Key erforderlich. Setzen Sie JTL_API_KEY oder übergeben Sie api_key.")
 
-    def _get_headers(self) -> Dict[str, str]:
-        """Erstellt die Standard-Headers für API-Anfragen"""
-        return {
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retry = retry
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+
+        # Header einmalig vorberechnen (unveränderlich)
+        headers = {
             "Authorization": f"Wawi {self.api_key}",
             "api-version": self.api_version,
             "X-AppID": self.app_id,
             "X-AppVersion": self.app_version,
             "Content-Type": "application/json"
         }
+        if not keep_alive:
+            headers["Connection"] = "close"
+        self._headers: Mapping[str, str] = MappingProxyType(headers)
+
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+        self._session = requests.Session()
+        self._session.mount("http://", self._adapter)
+        self._session.mount("https://", self._adapter)
+        self._session.headers.update(self._headers)
+
+        self._cache = _EntityCache(cache_size, cache_ttl) if cache_size > 0 else None
+        self._single_flight = _SingleFlight() if coalesce else None
+        self._limiters: Dict[str, _AdaptiveLimiter] = {
+            pattern: _AdaptiveLimiter(config) for pattern, config in (rate_limits or {}).items()
+        }
+        self._read_latency = _LatencyTracker()
+        self._hedge_workers = 2 * pool_maxsize
+        self._hedge_executor = ThreadPoolExecutor(max_workers=self._hedge_workers) if hedge else None
+        self._hedge_budget = _HedgeBudget(hedge_budget)
+        self._hedge_in_flight = 0
+        self._hedge_lock = threading.Lock()
+        self._hooks: List[RequestHook] = list(hooks or [])
+
+    def __enter__(self) -> "JtlWawiClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Schließt alle gepoolten Verbindungen"""
+        if self._hedge_executor:
+            self._hedge_executor.shutdown(wait=False)
+        self._session.close()
+
+    def pool_stats(self) -> PoolStats:
+        """
+        Liefert Treffer/Fehlschläge des Connection-Pools.
+
+        Gezählt werden alle aktuell vorgehaltenen Host-Pools. Ein Hit ist eine
+        Anfrage über eine bereits offene Verbindung, ein Miss ein neuer Verbindungsaufbau.
+        """
+        stats = PoolStats()
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats.requests += pool.num_requests
+            stats.misses += pool.num_connections
+        stats.hits = max(stats.requests - stats.misses, 0)
+        return stats
+
+    # ==================== Hooks ====================
+
+    def add_hook(self, hook: RequestHook) -> RequestHook:
+        """Registriert einen Hook für alle folgenden Anfragen"""
+        self._hooks = self._hooks + [hook]
+        return hook
+
+    def remove_hook(self, hook: RequestHook) -> None:
+        """Entfernt einen registrierten Hook"""
+        self._hooks = [registered for registered in self._hooks if registered is not hook]
+
+    def _begin(self, method: str, endpoint: str) -> RequestEvent:
+        """Erzeugt das Ereignis einer Anfrage und ruft ``before`` der Hooks auf"""
+        event = RequestEvent(
+            method=method.upper(),
+            endpoint=endpoint_template(endpoint),
+            path=endpoint,
+            timestamp=time.time()
+        )
+        for hook in self._hooks:
+            hook.before(event)
+        return event
+
+    def _finish(self, event: RequestEvent, response: Optional[ApiResponse], started: float) -> None:
+        """Vervollständigt das Ereignis und ruft ``after`` der Hooks auf"""
+        event.latency = time.monotonic() - started
+        if response is not None:
+            event.status_code = response.status_code
+            event.success = response.success
+            event.error = response.error
+        for hook in self._hooks:
+            hook.after(event)
+
+    # ==================== Rate-Limits ====================
+
+    def rate_limit_stats(self) -> Dict[str, LimiterStats]:
+        """Liefert den aktuellen Zustand der adaptiven Limiter je Endpoint-Gruppe"""
+        return {pattern: limiter.snapshot() for pattern, limiter in self._limiters.items()}
+
+    def _limiter_for(self, endpoint: str) -> Optional[_AdaptiveLimiter]:
+        """Ermittelt den Limiter für einen Endpoint (erstes passendes Muster)"""
+        path = endpoint.split("?", 1)[0]
+        for pattern, limiter in self._limiters.items():
+            if fnmatch.fnmatchcase(path, pattern):
+                return limiter
+        return None
+
+    def _dispatch(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        decode: bool = True,
+        event: Optional[RequestEvent] = None,
+        sent: Optional[threading.Event] = None
+    ) -> ApiResponse:
+        """
+        Sendet eine Anfrage unter dem Limiter der passenden Endpoint-Gruppe
+
+        ``sent`` wird gesetzt, sobald der Limiter die Anfrage freigibt (für Hedging).
+        """
+        url = f"{self.base_url}{endpoint}"
+        is_read = self._is_read(method, endpoint)
+        timeout = self._timeout_for(is_read)
+        limiter = self._limiter_for(endpoint) if self._limiters else None
+
+        if limiter:
+            limiter.acquire()
+        if sent:
+            sent.set()
+        started = time.monotonic()
+        response = None
+        try:
+            response = self._send(method, url, data, params, timeout, decode, event)
+            return response
+        finally:
+            latency = time.monotonic() - started
+            if limiter:
+                if response is None:
+                    limiter.release(0, latency)
+                else:
+                    limiter.release(response.status_code, latency, response.retry_after)
+            if is_read and response is not None and response.status_code:
+                self._read_latency.add(latency)
+
+    # ==================== Wiederholungen & Hedging ====================
+
+    @staticmethod
+    def _is_read(method: str, endpoint: str) -> bool:
+        """Lesende, wiederholbare Anfrage: GET oder POST auf einen */query-Endpoint"""
+        method = method.upper()
+        return method == "GET" or (method == "POST" and endpoint.split("?", 1)[0].endswith("/query"))
+
+    def _timeout_for(self, is_read: bool) -> Union[float, Tuple[float, float]]:
+        """Timeout für requests: (connect, read) für lesende Anfragen, sonst pauschal"""
+        if is_read and (self.connect_timeout or self.read_timeout):
+            return (self.connect_timeout or self.timeout, self.read_timeout or self.timeout)
+        return self.timeout
+
+    def _execute(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        decode: bool = True
+    ) -> ApiResponse:
+        """Führt eine Anfrage inkl. Wiederholungen und Hedging (nur lesend) aus"""
+        event = self._begin(method, endpoint) if self._hooks else None
+        started = time.monotonic()
+        response = None
+        try:
+            if not self._is_read(method, endpoint):
+                response = self._dispatch(method, endpoint, data, params, decode, event)
+                return response
+
+            attempts = self.retry.max_attempts if self.retry else 1
+            for attempt in range(1, attempts + 1):
+                if event:
+                    event.retries = attempt - 1
+                if self._hedge_executor:
+                    response = self._hedged(method, endpoint, data, params, decode, event)
+                else:
+                    response = self._dispatch(method, endpoint, data, params, decode, event)
+
+                retryable = self.retry is not None and response.status_code in self.retry.retry_statuses
+                if response.success or not retryable:
+                    return response
+                if attempt < attempts:
+                    time.sleep(self.retry.delay(attempt))
+            return response
+        finally:
+            if event:
+                self._finish(event, response, started)
+
+    def _hedged(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        decode: bool = True,
+        event: Optional[RequestEvent] = None
+    ) -> ApiResponse:
+        """
+        Sendet die Anfrage und nach dem p95 der Antwortzeiten ggf. eine Zweitanfrage.
+
+        Die Wartezeit läuft erst ab dem tatsächlichen Senden (nicht ab dem
+        Einreihen in den Executor oder dem Warten auf den Limiter). Gehedgt
+        wird höchstens ``hedge_budget`` der Anfragen und nie, solange alle
+        Hedge-Worker belegt sind; dann läuft die Anfrage direkt im Aufrufer.
+        Es gilt die erste erfolgreiche Antwort; die langsamere läuft im Hintergrund aus.
+        """
+        self._hedge_budget.deposit()
+        p95 = self._read_latency.percentile(0.95)
+        if p95 is None or not self._hedge_slot():
+            return self._dispatch(method, endpoint, data, params, decode, event)
+
+        sent = threading.Event()
+        primary = self._hedge_executor.submit(self._hedge_call, method, endpoint, data, params, decode, event, sent)
+        sent.wait()
+        done, _ = wait([primary], timeout=max(p95, self.hedge_min_delay))
+        if done:
+            return primary.result()
+
+        if not self._hedge_budget.take():
+            return primary.result()
+        if not self._hedge_slot():
+            return primary.result()
+        backup = self._hedge_executor.submit(self._hedge_call, method, endpoint, data, params, decode, event)
+        pending = {primary, backup}
+        response = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                response = future.result()
+                if response.success:
+                    return response
+        return response
+
+    def _hedge_slot(self) -> bool:
+        """Reserviert einen Hedge-Worker (False, wenn alle belegt sind)"""
+        with self._hedge_lock:
+            if self._hedge_in_flight >= self._hedge_workers:
+                return False
+            self._hedge_in_flight += 1
+            return True
+
+    def _hedge_call(self, *args) -> ApiResponse:
+        """_dispatch im Hedge-Worker; gibt den reservierten Platz danach frei"""
+        try:
+            return self._dispatch(*args)
+        finally:
+            with self._hedge_lock:
+                self._hedge_in_flight -= 1
+
+    # ==================== Cache ====================
+
+    def cache_stats(self) -> CacheStats:
+        """Liefert Treffer/Fehlschläge/Verdrängungen des Entity-Caches"""
+        return self._cache.snapshot() if self._cache else CacheStats()
+
+    def clear_cache(self) -> None:
+        """Leert den Entity-Cache"""
+        if self._cache:
+            self._cache.clear()
+
+    def _invalidate(self, kind: str, entity_id: int) -> None:
+        """Entfernt einen Eintrag nach Schreibzugriffen aus dem Cache"""
+        if self._cache:
+            self._cache.invalidate((kind, entity_id))
+
+    def _cached_get(
+        self,
+        kind: str,
+        entity_id: int,
+        endpoint: str,
+        last_change_endpoint: Optional[str] = None
+    ) -> ApiResponse:
+        """
+        GET mit Read-Through-Cache.
+
+        Abgelaufene Einträge werden, falls ``last_change_endpoint`` angegeben ist,
+        über das Änderungsdatum geprüft: Ist es unverändert, bleibt der Eintrag
+        gültig und der vollständige Datensatz muss nicht neu geladen werden.
+        Zurückgegebene Daten werden geteilt und dürfen nicht verändert werden.
+        """
+        if self._cache is None:
+            return self._request("GET", endpoint)
+
+        key = (kind, entity_id)
+        cached, expired = self._cache.get(key)
+        if cached is not None and not expired:
+            self._cache.count("hits")
+            return cached
+
+        if cached is not None and last_change_endpoint:
+            known = (cached.data or {}).get("LastChange")
+            check = self._request("GET", last_change_endpoint)
+            if known and check.success and (check.data or {}).get("LastChangeDate") == known:
+                self._cache.count("revalidations")
+                self._cache.put(key, cached)
+                return cached
+
+        self._cache.count("misses")
+        response = self._request("GET", endpoint)
+        if response.success:
+            self._cache.put(key, response)
+        else:
+            self._cache.invalidate(key)
+        return response
+
+    def _get_headers(self) -> Mapping[str, str]:
+        """Liefert die vorberechneten Standard-Headers für API-Anfragen"""
+        return self._headers
 
     def _request(
         self,
         method: str,
         endpoint: str,
         data: Optional[Dict] = None,
-        params: Optional[Dict] = None
+        params: Optional[Dict] = None,
+        decode: bool = True
     ) -> ApiResponse:
         """
         Führt eine API-Anfrage durch.
 
+        Gleichzeitige identische GET-Anfragen (gleiche URL und Query-Parameter)
+        werden zusammengefasst: nur eine geht an den Server, alle Aufrufer
+        erhalten dasselbe ApiResponse.
+
         Args:
             method: HTTP-Methode (GET, POST, PUT, DELETE)
             endpoint: API-Endpoint (z.B. /customer/123)
             data: Request Body (für POST/PUT)
             params: Query-Parameter
+            decode: False = Antwort nicht dekodieren, ``data`` enthält die rohen Bytes
 
         Returns:
             ApiResponse mit Ergebnis oder Fehler
         """
-        url = f"{self.base_url}{endpoint}"
+        if self._single_flight is not None and method.upper() == "GET" and data is None:
+            key = request_key(method, endpoint, params)
+            return self._single_flight.do(
+                key if decode else key + ("bytes",),
+                lambda: self._execute(method, endpoint, data, params, decode)
+            )
+        return self._execute(method, endpoint, data, params, decode)
 
+    def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        timeout: Union[float, Tuple[float, float], None] = None,
+        decode: bool = True,
+        event: Optional[RequestEvent] = None
+    ) -> ApiResponse:
+        """Sendet die HTTP-Anfrage und wandelt die Antwort in ein ApiResponse um"""
         try:
-            response = requests.request(
+            response = self._session.request(
                 method=method,
                 url=url,
                 json=data,
                 params=params,
-                headers=self._get_headers(),
-                timeout=30
+                timeout=timeout or self.timeout
             )
+            if event:
+                # Summe über alle Versuche (bei Hedging beide Anfragen)
+                event.request_bytes += len(response.request.body or b"")
+                event.response_bytes += len(response.content)
 
             if response.status_code in (200, 201, 202):
+                if not decode:
+                    body = response.content
+                elif response.content:
+                    body = response.json()
+                else:
+                    body = None
                 return ApiResponse(
                     success=True,
-                    data=response.json() if response.content else None,
+                    data=body,
                     status_code=response.status_code
                 )
             elif response.status_code == 204:
@@ -137,7 +1031,8 @@ class JtlWawiClient:
                 return ApiResponse(
                     success=False,
                     error=f"HTTP {response.status_code}: {error_detail}",
-                    status_code=response.status_code
+                    status_code=response.status_code,
+                    retry_after=_parse_retry_after(response.headers.get("Retry-After"))
                 )
 
         except requests.exceptions.ConnectionError:
@@ -156,11 +1051,335 @@ class JtlWawiClient:
                 error=f"Fehler: {str(e)}"
             )
 
+    # ==================== Binärdaten ====================
+
+    def open_stream(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """
+        Sendet eine Anfrage und liefert die Antwort mit ungelesenem Body.
+
+        Für Bilder und PDFs: der Body wird nicht gepuffert und nicht dekodiert,
+        sondern per ``response.iter_content()`` gelesen. Die Antwort muss vom
+        Aufrufer geschlossen werden (``with client.open_stream(...) as response``).
+        Es gilt das Rate-Limit der Endpoint-Gruppe, Wiederholungen übernimmt der Aufrufer.
+
+        Raises:
+            requests.exceptions.RequestException: Bei Verbindungsfehlern und Timeouts
+        """
+        limiter = self._limiter_for(endpoint) if self._limiters else None
+        if limiter:
+            limiter.acquire()
+        event = self._begin(method, endpoint) if self._hooks else None
+        started = time.monotonic()
+        status_code = 0
+        try:
+            response = self._session.request(
+                method=method,
+                url=f"{self.base_url}{endpoint}",
+                params=params,
+                headers=headers,
+                stream=True,
+                timeout=self._timeout_for(True)
+            )
+            status_code = response.status_code
+            return response
+        finally:
+            if limiter:
+                retry_after = _parse_retry_after(response.headers.get("Retry-After")) if status_code else None
+                limiter.release(status_code, time.monotonic() - started, retry_after)
+            if event:
+                # Latenz bis zu den Headern; Body-Größe laut Content-Length
+                if status_code:
+                    event.response_bytes = int(response.headers.get("Content-Length") or 0)
+                self._finish(event, ApiResponse(success=200 <= status_code < 300, status_code=status_code), started)
+
+    # ==================== Paginierung ====================
+
+    @staticmethod
+    def _next_page_number(
+        page: Dict[str, Any],
+        page_number: int,
+        page_size: int,
+        count: Optional[int] = None
+    ) -> Optional[int]:
+        """Ermittelt die nächste Seitennummer aus einer PagedList (None = letzte Seite)"""
+        if "HasNextPage" in page:
+            if not page["HasNextPage"]:
+                return None
+            next_number = page.get("NextPageNumber") or page_number + 1
+            return next_number if next_number > page_number else None
+
+        # Ohne PagedList-Metadaten: volle Seite => es könnte weitere geben
+        if count is None:
+            count = len(page.get("Items") or [])
+        return page_number + 1 if count >= page_size else None
+
+    def paginate(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+        prefetch: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Durchläuft alle Seiten eines PagedList-Endpoints und liefert die Einträge einzeln.
+
+        Während die Einträge von Seite N verarbeitet werden, wird Seite N+1 bereits
+        im Hintergrund geladen. Es liegen nie mehr als zwei Seiten im Speicher.
+
+        Args:
+            endpoint: GET-Endpoint mit PagedList-Antwort (z.B. /items)
+            params: Zusätzliche Query-Parameter (z.B. {"searchKeyWord": "Schraube"})
+            page_size: Einträge pro Seite
+            prefetch: Nächste Seite im Hintergrund vorladen
+
+        Raises:
+            ApiError: Wenn eine Seite nicht abgerufen werden kann
+        """
+        query = dict(params or {})
+        query["pageSize"] = page_size
+
+        def fetch(page_number: int) -> ApiResponse:
+            return self._request("GET", endpoint, params={**query, "pageNumber": page_number})
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page_number = 1
+            response = fetch(page_number)
+            while True:
+                if not response.success:
+                    raise ApiError(response)
+
+                page = response.data or {}
+                next_number = self._next_page_number(page, page_number, page_size)
+                pending = executor.submit(fetch, next_number) if executor and next_number else None
+
+                yield from page.get("Items") or []
+
+                if next_number is None:
+                    return
+                response = pending.result() if pending else fetch(next_number)
+                page_number = next_number
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def stream(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+        fields: Optional[Tuple[str, ...]] = None,
+        prefetch: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Wie ``paginate``, dekodiert jede Seite aber schrittweise (siehe ``iter_json_items``).
+
+        Die Seiten werden als rohe Bytes geladen; es wird nie der komplette
+        Objektbaum einer Seite aufgebaut. Mit ``fields`` bleiben pro Eintrag nur
+        die benötigten Felder erhalten, z.B. ``fields=("ItemId", "QuantityTotal")``.
+
+        Vorgeladen wird die nächste Seite, sobald TotalItems/PageSize gelesen sind
+        (stehen in der PagedList vor Items); sonst erst nach der aktuellen Seite.
+
+        Raises:
+            ApiError: Wenn eine Seite nicht abgerufen werden kann
+            ValueError: Bei ungültigem JSON
+        """
+        query = dict(params or {})
+        query["pageSize"] = page_size
+
+        def fetch(page_number: int) -> ApiResponse:
+            return self._request("GET", endpoint, params={**query, "pageNumber": page_number}, decode=False)
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page_number = 1
+            response = fetch(page_number)
+            while True:
+                if not response.success:
+                    raise ApiError(response)
+
+                meta: Dict[str, Any] = {}
+                count = 0
+                guess, pending = None, None
+                for entry in iter_json_items(response.data or b"{}", "Items", fields, meta):
+                    if count == 0 and executor:
+                        total, size = meta.get("TotalItems"), meta.get("PageSize") or page_size
+                        if total is not None and page_number * size < total:
+                            guess = page_number + 1
+                            pending = executor.submit(fetch, guess)
+                    count += 1
+                    yield entry
+
+                next_number = self._next_page_number(meta, page_number, page_size, count)
+                if next_number is None:
+                    return
+                if pending is None or guess != next_number:
+                    response = fetch(next_number)
+                else:
+                    response = pending.result()
+                page_number = next_number
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_raw(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> ApiResponse:
+        """GET ohne JSON-Dekodierung: ``data`` enthält die rohen Antwort-Bytes"""
+        return self._request("GET", endpoint, params=params, decode=False)
+
+    def scan(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+        max_workers: int = 8,
+        key: Optional[str] = "Id"
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Vollständiger Abzug eines PagedList-Endpoints mit parallelen Seitenabrufen.
+
+        Seite 1 liefert TotalPages, die restlichen Seiten werden mit bis zu
+        ``max_workers`` gleichzeitigen Anfragen geladen. Die Einträge werden
+        trotzdem in Seitenreihenfolge geliefert.
+
+        Ändert sich der Datenbestand während des Abzugs (TotalItems weicht ab),
+        verschieben sich Einträge zwischen den Seiten. Dann werden Duplikate über
+        ``key`` herausgefiltert, neue Seiten am Ende nachgeladen und die betroffenen
+        Seiten ein zweites Mal sequenziell gelesen, um verschobene Einträge zu finden.
+
+        Args:
+            endpoint: GET-Endpoint mit PagedList-Antwort (z.B. /items)
+            params: Zusätzliche Query-Parameter
+            page_size: Einträge pro Seite
+            max_workers: Maximale Anzahl gleichzeitiger Seitenabrufe
+            key: Feld zur Duplikaterkennung (None = keine Duplikaterkennung).
+                Einträge ohne dieses Feld (z.B. /stocks) werden nie als Duplikat
+                verworfen; dann entfällt auch das zweite Lesen verschobener Seiten.
+
+        Raises:
+            ApiError: Wenn eine Seite nicht abgerufen werden kann
+        """
+        query = dict(params or {})
+        query["pageSize"] = page_size
+
+        def fetch(page_number: int) -> Dict[str, Any]:
+            response = self._request("GET", endpoint, params={**query, "pageNumber": page_number})
+            if not response.success:
+                raise ApiError(response)
+            return response.data or {}
+
+        seen = set()
+        keyless = key is None  # mindestens ein Eintrag ohne ``key``: keine Duplikaterkennung möglich
+
+        def unseen(items: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            nonlocal keyless
+            for entry in items:
+                if key is not None:
+                    entry_key = entry.get(key)
+                    if entry_key is None:
+                        keyless = True
+                    elif entry_key in seen:
+                        continue
+                    else:
+                        seen.add(entry_key)
+                yield entry
+
+        first = fetch(1)
+        total_items = first.get("TotalItems")
+        total_pages = first.get("TotalPages") or 1
+        yield from unseen(first.get("Items") or [])
+
+        first_shifted_page = None
+        last_page, page_number = first, 1
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Höchstens 2 * max_workers Seiten gleichzeitig anfordern/puffern
+            pending = deque()
+            next_page = 2
+            while next_page <= total_pages or pending:
+                while next_page <= total_pages and len(pending) < 2 * max_workers:
+                    pending.append((next_page, executor.submit(fetch, next_page)))
+                    next_page += 1
+
+                page_number, future = pending.popleft()
+                last_page = future.result()
+                if first_shifted_page is None and last_page.get("TotalItems") != total_items:
+                    first_shifted_page = page_number
+                yield from unseen(last_page.get("Items") or [])
+
+        # Bestand während des Abzugs gewachsen: weitere Seiten nachladen
+        page_number = self._next_page_number(last_page, page_number, page_size)
+        while page_number is not None:
+            last_page = fetch(page_number)
+            if first_shifted_page is None:
+                first_shifted_page = page_number
+            yield from unseen(last_page.get("Items") or [])
+            page_number = self._next_page_number(last_page, page_number, page_size)
+
+        # Einträge können über Seitengrenzen nach vorne gerutscht sein: betroffene Seiten erneut lesen
+        if first_shifted_page is not None and not keyless:
+            page_number = max(first_shifted_page - 2 * max_workers, 1)
+            while page_number is not None:
+                page = fetch(page_number)
+                yield from unseen(page.get("Items") or [])
+                page_number = self._next_page_number(page, page_number, page_size)
+
+    def scan_customers(self, page_size: int = 100, max_workers: int = 8, **params) -> Iterator[Dict[str, Any]]:
+        """Vollständiger Kundenabzug mit parallelen Seitenabrufen"""
+        return self.scan("/customers", params, page_size, max_workers)
+
+    def scan_items(self, page_size: int = 100, max_workers: int = 8, **params) -> Iterator[Dict[str, Any]]:
+        """Vollständiger Artikelabzug mit parallelen Seitenabrufen"""
+        return self.scan("/items", params, page_size, max_workers)
+
+    def iter_customers(self, search: Optional[str] = None, page_size: int = 100, **params) -> Iterator[Dict[str, Any]]:
+        """Durchläuft alle Kunden (weitere Filter als Query-Parameter, z.B. groupId=1)"""
+        if search:
+            params["searchKeyWord"] = search
+        return self.paginate("/customers", params, page_size)
+
+    def iter_items(self, search: Optional[str] = None, page_size: int = 100, **params) -> Iterator[Dict[str, Any]]:
+        """Durchläuft alle Artikel (weitere Filter als Query-Parameter, z.B. categoryId=5)"""
+        if search:
+            params["searchKeyWord"] = search
+        return self.paginate("/items", params, page_size)
+
+    def iter_sales_orders(self, page_size: int = 100, **params) -> Iterator[Dict[str, Any]]:
+        """Durchläuft alle Aufträge (Filter als Query-Parameter, z.B. customerId=42)"""
+        return self.paginate("/salesOrders", params, page_size)
+
+    def iter_invoices(self, page_size: int = 100, **params) -> Iterator[Dict[str, Any]]:
+        """Durchläuft alle Rechnungen"""
+        return self.paginate("/invoices", params, page_size)
+
+    def iter_stocks(
+        self,
+        item_id: Optional[int] = None,
+        warehouse_id: Optional[int] = None,
+        page_size: int = 100,
+        **params
+    ) -> Iterator[Dict[str, Any]]:
+        """Durchläuft alle Lagerbestände, optional gefiltert nach Artikel und Lager"""
+        if item_id:
+            params["itemId"] = item_id
+        if warehouse_id:
+            params["warehouseId"] = warehouse_id
+        return self.paginate("/stocks", params, page_size)
+
     # ==================== Kunden ====================
 
     def get_customer(self, customer_id: int) -> ApiResponse:
         """Ruft einen Kunden anhand der ID ab"""
-        return self._request("GET", f"/customer/{customer_id}")
+        return self._cached_get(
+            "customer", customer_id, f"/customer/{customer_id}",
+            last_change_endpoint=f"/customers/{customer_id}/lastChange"
+        )
 
     def query_customers(
         self,
@@ -196,17 +1415,21 @@ class JtlWawiClient:
 
     def update_customer(self, customer_id: int, customer_data: Dict[str, Any]) -> ApiResponse:
         """Aktualisiert einen Kunden"""
-        return self._request("PUT", f"/customer/{customer_id}", data=customer_data)
+        response = self._request("PUT", f"/customer/{customer_id}", data=customer_data)
+        self._invalidate("customer", customer_id)
+        return response
 
     def delete_customer(self, customer_id: int) -> ApiResponse:
         """Löscht einen Kunden"""
-        return self._request("DELETE", f"/customer/{customer_id}")
+        response = self._request("DELETE", f"/customer/{customer_id}")
+        self._invalidate("customer", customer_id)
+        return response
 
     # ==================== Aufträge ====================
 
     def get_sales_order(self, order_id: int) -> ApiResponse:
         """Ruft einen Auftrag anhand der ID ab"""
-        return self._request("GET", f"/salesorder/{order_id}")
+        return self._cached_get("salesorder", order_id, f"/salesorder/{order_id}")
 
     def query_sales_orders(
         self,
@@ -232,7 +1455,7 @@ class JtlWawiClient:
 
     def get_article(self, article_id: int) -> ApiResponse:
         """Ruft einen Artikel anhand der ID ab"""
-        return self._request("GET", f"/article/{article_id}")
+        return self._cached_get("article", article_id, f"/article/{article_id}")
 
     def query_articles(
         self,
@@ -295,6 +1518,35 @@ class JtlWawiClient:
         }
         return self._request("POST", "/stock/adjustment", data=data)
 
+    def create_stock(
+        self,
+        item_id: int,
+        warehouse_id: int,
+        quantity: float,
+        comment: Optional[str] = None,
+        storage_location_id: Optional[int] = None
+    ) -> ApiResponse:
+        """
+        Bucht eine Bestandsänderung über POST /stocks.
+
+        Args:
+            item_id: Artikel-ID
+            warehouse_id: Lager-ID
+            quantity: Menge (positiv = Zugang, negativ = Abgang)
+            comment: Kommentar (erscheint in /stocks/changes)
+            storage_location_id: Lagerplatz-ID (optional)
+        """
+        data = {
+            "ItemId": item_id,
+            "WarehouseId": warehouse_id,
+            "Quantity": quantity
+        }
+        if comment:
+            data["Comment"] = comment
+        if storage_location_id:
+            data["StorageLocationId"] = storage_location_id
+        return self._request("POST", "/stocks", data=data)
+
     # ==================== Rechnungen ====================
 
     def get_invoice(self, invoice_id: int) -> ApiResponse:
@@ -317,6 +1569,88 @@ class JtlWawiClient:
 
         return self._request("POST", "/invoice/query", data=data)
 
+    # ==================== Steuern ====================
+
+    def get_item_tax(
+        self,
+        item_id: int,
+        company_id: int,
+        departure_country: str,
+        shipment_country: str,
+        **params
+    ) -> ApiResponse:
+        """
+        Steuersatz eines Artikels für ein Länderpaar (Rate + TaxClassId)
+
+        Weitere Query-Parameter: taxNumber, invoiceCountryISO,
+        invoiceCountryStateISO, shipmentCountryStateISO.
+        Für viele Positionen ``TaxResolver`` aus tax_resolver.py verwenden.
+        """
+        return self._request(
+            "GET", f"/tax/item/{item_id}/{company_id}/{departure_country}/{shipment_country}",
+            params=params or None
+        )
+
+    def get_tax_class_tax(
+        self,
+        tax_class_id: int,
+        company_id: int,
+        departure_country: str,
+        shipment_country: str,
+        **params
+    ) -> ApiResponse:
+        """Steuersatz einer Steuerklasse für ein Länderpaar (Parameter wie ``get_item_tax``)"""
+        return self._request(
+            "GET", f"/tax/taxclass/{tax_class_id}/{company_id}/{departure_country}/{shipment_country}",
+            params=params or None
+        )
+
+    # ==================== WMS ====================
+
+    def get_picklist_positions(self, warehouse_id: int, picklist_id: int) -> ApiResponse:
+        """Ruft die Positionen einer Pickliste ab"""
+        return self._request("GET", f"/wms/{warehouse_id}/picklists/{picklist_id}")
+
+    def pick_position(
+        self,
+        warehouse_id: int,
+        picklist_id: int,
+        position_id: int,
+        quantity: float,
+        batch_number: Optional[str] = None,
+        shelf_life_expiration_date: Optional[str] = None,
+        serial_numbers: Optional[List[str]] = None
+    ) -> ApiResponse:
+        """
+        Pickt eine Picklisten-Position (wird nie automatisch wiederholt).
+
+        Für ganze Picklisten ``PicklistExecutor`` aus picking.py verwenden.
+        """
+        data: Dict[str, Any] = {"Quantity": quantity}
+        if batch_number:
+            data["BatchNumber"] = batch_number
+        if shelf_life_expiration_date:
+            data["ShelfLifeExpirationDate"] = shelf_life_expiration_date
+        if serial_numbers:
+            data["SerialNumbers"] = serial_numbers
+        return self._request(
+            "PATCH", f"/wms/{warehouse_id}/picklists/{picklist_id}/positions/{position_id}/pickPosition",
+            data=data
+        )
+
+    def change_reservation(
+        self,
+        warehouse_id: int,
+        picklist_id: int,
+        position_id: int,
+        storage_location_ids: List[int]
+    ) -> ApiResponse:
+        """Reserviert eine Position auf andere Lagerplätze um (Antwort: Error + UpdatedPositions)"""
+        return self._request(
+            "PATCH", f"/wms/{warehouse_id}/picklists/{picklist_id}/positions/{position_id}/changeReservation",
+            data={"StorageLocationList": storage_location_ids}
+        )
+
     # ==================== Firmen ====================
 
     def query_companies(self) -> ApiResponse:
@@ -327,7 +1661,7 @@ class JtlWawiClient:
 
     def get_category(self, category_id: int) -> ApiResponse:
         """Ruft eine Kategorie anhand der ID ab"""
-        return self._request("GET", f"/category/{category_id}")
+        return self._cached_get("category", category_id, f"/category/{category_id}")
 
     def query_categories(
         self,
@@ -362,26 +1696,28 @@ if __name__ == "__main__":
         print("Setzen Sie die Umgebungsvariable JTL_API_KEY oder übergeben Sie den API-Key.")
         exit(1)
 
-    # Beispiel: Kunden suchen
-    print("Suche Kunden mit 'Mustermann'...")
-    result = client.query_customers(search="Mustermann")
-
-    if result.success:
-        customers = result.data.get("Items", [])
-        print(f"Gefunden: {len(customers)} Kunden")
-        for customer in customers[:5]:
-            print(f"  - {customer.get('DisplayName', 'N/A')}")
-    else:
-        print(f"Fehler: {result.error}")
-
-    # Beispiel: Firmen abfragen
-    print("\nFrage Firmen ab...")
-    result = client.query_companies()
-
-    if result.success:
-        companies = result.data.get("Items", [])
-        print(f"Gefunden: {len(companies)} Firmen")
-        for company in companies:
-            print(f"  - {company.get('Name', 'N/A')}")
-    else:
-        print(f"Fehler: {result.error}")
+    with client:
+        # Beispiel: Kunden suchen
+        print("Suche Kunden mit 'Mustermann'...")
+        result = client.query_customers(search="Mustermann")
+
+        if result.success:
+            customers = result.data.get("Items", [])
+            print(f"Gefunden: {len(customers)} Kunden")
+            for customer in customers[:5]:
+                print(f"  - {customer.get('DisplayName', 'N/A')}")
+        else:
+            print(f"Fehler: {result.error}")
+
+        # Beispiel: Firmen abfragen
+        print("\nFrage Firmen ab...")
+        result = client.query_companies()
+
+        if result.success:
+            # /companies liefert eine Liste, ältere Server eine PagedList
+            companies = result.data if isinstance(result.data, list) else result.data.get("Items", [])
+            print(f"Gefunden: {len(companies)} Firmen")
+            for company in companies:
+                print(f"  - {company.get('Name', 'N/A')}")
+        else:
+            print(f"Fehler: {result.error}")
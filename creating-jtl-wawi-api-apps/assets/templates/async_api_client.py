@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi API Client (asyncio)
+
+Asynchrone Variante von JtlWawiClient mit gleicher Methodenoberfläche und
+gleichen ApiResponse-Ergebnissen. Ein Prozess kann damit viele Anfragen
+gleichzeitig offen halten; die Anzahl paralleler Anfragen wird über eine
+Semaphore begrenzt.
+
+Voraussetzung:
+    pip install aiohttp
+
+Verwendung:
+    import asyncio
+    from async_api_client import AsyncJtlWawiClient
+
+    async def main():
+        async with AsyncJtlWawiClient(
+            base_url="http://localhost:5883",
+            api_key="FB622234-98A7-46FA-A01B-06C9D0971AAF",
+            max_concurrency=50
+        ) as client:
+            # Einzelne Anfrage
+            customer = await client.get_customer(1)
+
+            # Viele Anfragen parallel
+            orders = await client.gather_many(
+                client.get_sales_order(order_id) for order_id in order_ids
+            )
+
+    asyncio.run(main())
+"""
+
+import os
+import json
+import time
+import asyncio
+import aiohttp
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping, Iterable, Awaitable, Hashable
+
+from api_client import ApiResponse, RequestEvent, RequestHook, request_key, endpoint_template
+
+
+class AsyncJtlWawiClient:
+    """
+    JTL-Wawi REST API Client für asyncio
+
+    Attributes:
+        base_url: Basis-URL der API (z.B. http://localhost:5883)
+        api_key: Der bei der Registrierung erhaltene API-Key
+        app_id: Die App-ID (z.B. meine-firma/meine-app/v1)
+        app_version: Die App-Version (z.B. 1.0.0)
+        max_concurrency: Maximale Anzahl gleichzeitiger Anfragen
+
+    Der Client sollte mit ``async with`` oder über ``await close()`` beendet werden.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        app_id: Optional[str] = None,
+        app_version: Optional[str] = None,
+        api_version: str = "1.0",
+        max_concurrency: int = 50,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15,
+        timeout: float = 30,
+        coalesce: bool = True,
+        hooks: Optional[List[RequestHook]] = None
+    ):
+        """
+        Initialisiert den Client.
+
+        Werte können auch über Umgebungsvariablen gesetzt werden:
+        - JTL_API_BASE_URL
+        - JTL_API_KEY
+        - JTL_APP_ID
+        - JTL_APP_VERSION
+
+        Args:
+            max_concurrency: Maximale Anzahl gleichzeitig laufender Anfragen
+            limit_per_host: Maximale Verbindungen pro Host (0 = max_concurrency)
+            keepalive_timeout: Sekunden, die eine ungenutzte Verbindung offen bleibt
+            timeout: Timeout pro Anfrage in Sekunden
+            coalesce: Gleichzeitige identische GET-Anfragen zusammenfassen
+            hooks: RequestHook-Instanzen, die vor und nach jeder Anfrage
+                aufgerufen werden (z.B. metrics.MetricsCollector)
+        """
+        self.base_url = base_url or os.getenv("JTL_API_BASE_URL", "http://localhost:5883")
+        self.api_key = api_key or os.getenv("JTL_API_KEY")
+        self.app_id = app_id or os.getenv("JTL_APP_ID", "my-app/v1")
+        self.app_version = app_version or os.getenv("JTL_APP_VERSION", "1.0.0")
+        self.api_version = api_version
+        self.max_concurrency = max_concurrency
+        self.coalesce = coalesce
+
+        if not self.api_key:
+            raise ValueError("API-Key erforderlich. Setzen Sie JTL_API_KEY oder übergeben Sie api_key.")
+
+        self._limit_per_host = limit_per_host or max_concurrency
+        self._keepalive_timeout = keepalive_timeout
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._headers: Mapping[str, str] = MappingProxyType({
+            "Authorization": f"Wawi {self.api_key}",
+            "api-version": self.api_version,
+            "X-AppID": self.app_id,
+            "X-AppVersion": self.app_version,
+            "Content-Type": "application/json"
+        })
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._inflight: Dict[Hashable, "asyncio.Future[ApiResponse]"] = {}
+        self._hooks: List[RequestHook] = list(hooks or [])
+
+    async def __aenter__(self) -> "AsyncJtlWawiClient":
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Schließt die Session und alle offenen Verbindungen"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Erstellt die Session beim ersten Zugriff (muss im laufenden Event-Loop passieren)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self._limit_per_host,
+                keepalive_timeout=self._keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=dict(self._headers),
+                timeout=self._timeout
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None
+    ) -> ApiResponse:
+        """
+        Führt eine API-Anfrage durch.
+
+        Gleichzeitige identische GET-Anfragen werden zusammengefasst: nur eine
+        geht an den Server, alle Aufrufer erhalten dasselbe ApiResponse.
+
+        Args:
+            method: HTTP-Methode (GET, POST, PUT, DELETE)
+            endpoint: API-Endpoint (z.B. /customer/123)
+            data: Request Body (für POST/PUT)
+            params: Query-Parameter
+
+        Returns:
+            ApiResponse mit Ergebnis oder Fehler
+        """
+        if not self.coalesce or method.upper() != "GET" or data is not None:
+            return await self._observed(method, endpoint, data, params)
+
+        key = request_key(method, endpoint, params)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._observed(method, endpoint, data, params))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # shield: Abbruch eines Aufrufers bricht die gemeinsame Anfrage nicht ab
+        return await asyncio.shield(future)
+
+    def add_hook(self, hook: RequestHook) -> RequestHook:
+        """Registriert einen Hook für alle folgenden Anfragen"""
+        self._hooks = self._hooks + [hook]
+        return hook
+
+    def remove_hook(self, hook: RequestHook) -> None:
+        """Entfernt einen registrierten Hook"""
+        self._hooks = [registered for registered in self._hooks if registered is not hook]
+
+    async def _observed(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None
+    ) -> ApiResponse:
+        """Sendet die Anfrage und ruft dabei die registrierten Hooks auf"""
+        url = f"{self.base_url}{endpoint}"
+        if not self._hooks:
+            return await self._send(method, url, data, params)
+
+        hooks = self._hooks
+        event = RequestEvent(
+            method=method.upper(),
+            endpoint=endpoint_template(endpoint),
+            path=endpoint,
+            timestamp=time.time(),
+            request_bytes=len(json.dumps(data).encode()) if data is not None else 0
+        )
+        for hook in hooks:
+            hook.before(event)
+        started = time.monotonic()
+        response = None
+        try:
+            response = await self._send(method, url, data, params, event)
+            return response
+        finally:
+            event.latency = time.monotonic() - started
+            if response is not None:
+                event.status_code = response.status_code
+                event.success = response.success
+                event.error = response.error
+            for hook in hooks:
+                hook.after(event)
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        event: Optional[RequestEvent] = None
+    ) -> ApiResponse:
+        """Sendet die HTTP-Anfrage und wandelt die Antwort in ein ApiResponse um"""
+        session = self._get_session()
+
+        try:
+            async with self._semaphore:
+                async with session.request(method, url, json=data, params=params) as response:
+                    body = await response.read()
+                    if event:
+                        event.response_bytes = len(body)
+
+                    if response.status in (200, 201, 202):
+                        return ApiResponse(
+                            success=True,
+                            data=await response.json(content_type=None) if body else None,
+                            status_code=response.status
+                        )
+                    elif response.status == 204:
+                        return ApiResponse(
+                            success=True,
+                            data=None,
+                            status_code=response.status
+                        )
+                    else:
+                        error_detail = ""
+                        try:
+                            error_data = await response.json(content_type=None)
+                            error_detail = error_data.get("detail", str(error_data))
+                        except Exception:
+                            error_detail = body.decode(errors="replace")
+
+                        return ApiResponse(
+                            success=False,
+                            error=f"HTTP {response.status}: {error_detail}",
+                            status_code=response.status
+                        )
+
+        except aiohttp.ClientConnectionError:
+            return ApiResponse(
+                success=False,
+                error=f"Verbindungsfehler: {url} nicht erreichbar"
+            )
+        except asyncio.TimeoutError:
+            return ApiResponse(
+                success=False,
+                error="Timeout: Server antwortet nicht"
+            )
+        except Exception as e:
+            return ApiResponse(
+                success=False,
+                error=f"Fehler: {str(e)}"
+            )
+
+    async def gather_many(self, calls: Iterable[Awaitable[ApiResponse]]) -> List[ApiResponse]:
+        """
+        Führt viele Anfragen parallel aus (begrenzt durch max_concurrency).
+
+        Args:
+            calls: Awaitables, z.B. ``client.get_customer(i) for i in ids``
+
+        Returns:
+            Liste der ApiResponses in derselben Reihenfolge wie ``calls``
+        """
+        return list(await asyncio.gather(*calls))
+
+    # ==================== Kunden ====================
+
+    async def get_customer(self, customer_id: int) -> ApiResponse:
+        """Ruft einen Kunden anhand der ID ab"""
+        return await self._request("GET", f"/customer/{customer_id}")
+
+    async def query_customers(
+        self,
+        search: Optional[str] = None,
+        page_size: int = 100,
+        page_index: int = 0
+    ) -> ApiResponse:
+        """Sucht Kunden"""
+        data = {
+            "PageSize": page_size,
+            "PageIndex": page_index
+        }
+        if search:
+            data["SearchKeyWord"] = search
+
+        return await self._request("POST", "/customer/query", data=data)
+
+    async def create_customer(self, customer_data: Dict[str, Any]) -> ApiResponse:
+        """Legt einen neuen Kunden an"""
+        return await self._request("POST", "/customer", data=customer_data)
+
+    async def update_customer(self, customer_id: int, customer_data: Dict[str, Any]) -> ApiResponse:
+        """Aktualisiert einen Kunden"""
+        return await self._request("PUT", f"/customer/{customer_id}", data=customer_data)
+
+    async def delete_customer(self, customer_id: int) -> ApiResponse:
+        """Löscht einen Kunden"""
+        return await self._request("DELETE", f"/customer/{customer_id}")
+
+    # ==================== Aufträge ====================
+
+    async def get_sales_order(self, order_id: int) -> ApiResponse:
+        """Ruft einen Auftrag anhand der ID ab"""
+        return await self._request("GET", f"/salesorder/{order_id}")
+
+    async def query_sales_orders(
+        self,
+        search: Optional[str] = None,
+        page_size: int = 100,
+        page_index: int = 0
+    ) -> ApiResponse:
+        """Sucht Aufträge"""
+        data = {
+            "PageSize": page_size,
+            "PageIndex": page_index
+        }
+        if search:
+            data["SearchKeyWord"] = search
+
+        return await self._request("POST", "/salesorder/query", data=data)
+
+    async def create_sales_order(self, order_data: Dict[str, Any]) -> ApiResponse:
+        """Legt einen neuen Auftrag an"""
+        return await self._request("POST", "/salesorder", data=order_data)
+
+    # ==================== Artikel ====================
+
+    async def get_article(self, article_id: int) -> ApiResponse:
+        """Ruft einen Artikel anhand der ID ab"""
+        return await self._request("GET", f"/article/{article_id}")
+
+    async def query_articles(
+        self,
+        search: Optional[str] = None,
+        page_size: int = 100,
+        page_index: int = 0
+    ) -> ApiResponse:
+        """Sucht Artikel"""
+        data = {
+            "PageSize": page_size,
+            "PageIndex": page_index
+        }
+        if search:
+            data["SearchKeyWord"] = search
+
+        return await self._request("POST", "/article/query", data=data)
+
+    # ==================== Lagerbestand ====================
+
+    async def query_stock(
+        self,
+        article_id: Optional[int] = None,
+        warehouse_id: Optional[int] = None,
+        page_size: int = 100,
+        page_index: int = 0
+    ) -> ApiResponse:
+        """Fragt Lagerbestand ab"""
+        data = {
+            "PageSize": page_size,
+            "PageIndex": page_index
+        }
+        if article_id:
+            data["ArticleId"] = article_id
+        if warehouse_id:
+            data["WarehouseId"] = warehouse_id
+
+        return await self._request("POST", "/stock/query", data=data)
+
+    async def adjust_stock(
+        self,
+        article_id: int,
+        warehouse_id: int,
+        quantity: float,
+        reason: str = "API-Bestandsanpassung"
+    ) -> ApiResponse:
+        """
+        Passt den Lagerbestand an.
+
+        Args:
+            article_id: Artikel-ID
+            warehouse_id: Lager-ID
+            quantity: Menge (positiv = Zugang, negativ = Abgang)
+            reason: Grund für die Anpassung
+        """
+        data = {
+            "ArticleId": article_id,
+            "WarehouseId": warehouse_id,
+            "Quantity": quantity,
+            "Reason": reason
+        }
+        return await self._request("POST", "/stock/adjustment", data=data)
+
+    # ==================== Rechnungen ====================
+
+    async def get_invoice(self, invoice_id: int) -> ApiResponse:
+        """Ruft eine Rechnung anhand der ID ab"""
+        return await self._request("GET", f"/invoice/{invoice_id}")
+
+    async def query_invoices(
+        self,
+        search: Optional[str] = None,
+        page_size: int = 100,
+        page_index: int = 0
+    ) -> ApiResponse:
+        """Sucht Rechnungen"""
+        data = {
+            "PageSize": page_size,
+            "PageIndex": page_index
+        }
+        if search:
+            data["SearchKeyWord"] = search
+
+        return await self._request("POST", "/invoice/query", data=data)
+
+    # ==================== Firmen ====================
+
+    async def query_companies(self) -> ApiResponse:
+        """Ruft alle Firmen/Mandanten ab"""
+        return await self._request("POST", "/company/query", data={"PageSize": 100})
+
+    # ==================== Kategorien ====================
+
+    async def get_category(self, category_id: int) -> ApiResponse:
+        """Ruft eine Kategorie anhand der ID ab"""
+        return await self._request("GET", f"/category/{category_id}")
+
+    async def query_categories(
+        self,
+        search: Optional[str] = None,
+        page_size: int = 100,
+        page_index: int = 0
+    ) -> ApiResponse:
+        """Sucht Kategorien"""
+        data = {
+            "PageSize": page_size,
+            "PageIndex": page_index
+        }
+        if search:
+            data["SearchKeyWord"] = search
+
+        return await self._request("POST", "/category/query", data=data)
+
+
+# ==================== Beispiele ====================
+
+async def _main():
+    try:
+        client = AsyncJtlWawiClient(max_concurrency=50)
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        print("Setzen Sie die Umgebungsvariable JTL_API_KEY oder übergeben Sie den API-Key.")
+        exit(1)
+
+    async with client:
+        # Beispiel: Erste 10 Kunden parallel abrufen
+        print("Rufe Kunden 1-10 parallel ab...")
+        results = await client.gather_many(
+            client.get_customer(customer_id) for customer_id in range(1, 11)
+        )
+
+        for customer_id, result in zip(range(1, 11), results):
+            if result.success:
+                print(f"  - {customer_id}: {result.data.get('DisplayName', 'N/A')}")
+            else:
+                print(f"  - {customer_id}: {result.error}")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
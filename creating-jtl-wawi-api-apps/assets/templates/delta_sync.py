@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi Delta-Sync
+
+Inkrementeller Abgleich von Kunden und Artikeln in eine lokale SQLite-Datei.
+Pro Entität wird ein Hochwasserstand (Watermark) gespeichert; beim nächsten
+Lauf werden nur Datensätze abgefragt, die sich seitdem geändert haben
+(``lastChangeFrom`` bei /customers, ``changedSince`` bei /items).
+
+Der Watermark wird aus den Änderungszeitpunkten der gelieferten Datensätze
+gebildet (Serverzeit, nicht lokale Uhr) und beim nächsten Lauf um ein
+Überlappungsfenster zurückgesetzt, damit Uhrenabweichungen und Datensätze,
+die während des Laufs geändert wurden, nicht verloren gehen.
+
+Verwendung:
+    from api_client import JtlWawiClient
+    from delta_sync import DeltaSync
+
+    with JtlWawiClient() as client, DeltaSync(client, "jtl_sync.sqlite") as sync:
+        for result in sync.sync_all():
+            print(result)
+
+        customer = sync.get("customers", 42)
+"""
+
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Iterator
+
+from api_client import JtlWawiClient
+
+
+@dataclass(frozen=True)
+class SyncEntity:
+    """Beschreibt eine abgleichbare Entität"""
+    name: str
+    endpoint: str
+    since_param: str  # Query-Parameter für "geändert seit"
+    change_field: str  # Feld mit dem Änderungszeitpunkt im Datensatz
+    key: str = "Id"
+
+
+ENTITIES: Dict[str, SyncEntity] = {
+    "customers": SyncEntity("customers", "/customers", "lastChangeFrom", "LastChange"),
+    "items": SyncEntity("items", "/items", "changedSince", "Changed"),
+}
+
+
+@dataclass
+class SyncResult:
+    """Ergebnis eines Sync-Laufs"""
+    entity: str
+    fetched: int = 0
+    upserted: int = 0
+    watermark: Optional[str] = None
+    full: bool = False
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS watermarks (
+    entity TEXT PRIMARY KEY,
+    high_water TEXT NOT NULL,
+    last_run TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    row_id INTEGER PRIMARY KEY,  -- stabiler Schlüssel für abhängige Indizes (VACUUM nummeriert sonst um)
+    entity TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    last_change TEXT,
+    payload TEXT NOT NULL,
+    UNIQUE (entity, id)
+);
+"""
+
+# Ältere Dateien: records ohne row_id (impliziter rowid) unter Beibehaltung der rowids umbauen
+_MIGRATE_RECORDS = """
+CREATE TABLE records_migrated (
+    row_id INTEGER PRIMARY KEY,
+    entity TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    last_change TEXT,
+    payload TEXT NOT NULL,
+    UNIQUE (entity, id)
+);
+INSERT INTO records_migrated (row_id, entity, id, last_change, payload)
+    SELECT rowid, entity, id, last_change, payload FROM records;
+DROP TABLE records;
+ALTER TABLE records_migrated RENAME TO records;
+"""
+
+_UPSERT = """
+INSERT INTO records (entity, id, last_change, payload) VALUES (?, ?, ?, ?)
+ON CONFLICT (entity, id) DO UPDATE SET
+    last_change = excluded.last_change,
+    payload = excluded.payload
+WHERE records.last_change IS NULL
+   OR excluded.last_change IS NULL
+   OR excluded.last_change >= records.last_change
+"""
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parst einen ISO-Zeitstempel der API (None bei leerem/ungültigem Wert)"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+class DeltaSync:
+    """
+    Inkrementeller Abgleich in eine lokale SQLite-Datei
+
+    Attributes:
+        client: JtlWawiClient für die API-Zugriffe
+        db_path: Pfad zur SQLite-Datei
+        overlap: Überlappungsfenster gegen Uhrenabweichungen
+        page_size: Einträge pro Seite beim Abruf
+        batch_size: Anzahl Datensätze pro Schreib-Batch
+    """
+
+    def __init__(
+        self,
+        client: JtlWawiClient,
+        db_path: str = "jtl_sync.sqlite",
+        overlap: timedelta = timedelta(minutes=5),
+        page_size: int = 500,
+        batch_size: int = 500
+    ):
+        self.client = client
+        self.db_path = db_path
+        self.overlap = overlap
+        self.page_size = page_size
+        self.batch_size = batch_size
+
+        self._db = sqlite3.connect(db_path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(records)")]
+        if "row_id" not in columns:
+            self._db.executescript(f"BEGIN;{_MIGRATE_RECORDS}COMMIT;")
+
+    def __enter__(self) -> "DeltaSync":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Schließt die SQLite-Verbindung"""
+        self._db.close()
+
+    # ==================== Watermarks ====================
+
+    def get_watermark(self, entity: str) -> Optional[str]:
+        """Liefert den gespeicherten Hochwasserstand einer Entität"""
+        row = self._db.execute(
+            "SELECT high_water FROM watermarks WHERE entity = ?", (entity,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def reset(self, entity: str) -> None:
+        """Setzt den Watermark zurück; der nächste Lauf ist ein Vollabgleich"""
+        with self._db:
+            self._db.execute("DELETE FROM watermarks WHERE entity = ?", (entity,))
+
+    # ==================== Abgleich ====================
+
+    def sync(self, entity: str) -> SyncResult:
+        """
+        Gleicht eine Entität inkrementell ab.
+
+        Ohne gespeicherten Watermark wird ein Vollabgleich durchgeführt. Alle
+        Upserts und der neue Watermark werden in einer Transaktion geschrieben;
+        bricht der Lauf ab, bleibt der alte Watermark erhalten.
+
+        Args:
+            entity: Name der Entität (siehe ENTITIES)
+
+        Raises:
+            ApiError: Wenn eine Seite nicht abgerufen werden kann
+        """
+        spec = ENTITIES[entity]
+        watermark = _parse_timestamp(self.get_watermark(entity))
+        result = SyncResult(entity=entity, full=watermark is None)
+
+        params: Dict[str, Any] = {}
+        if watermark is not None:
+            params[spec.since_param] = (watermark - self.overlap).isoformat()
+
+        high_water = watermark
+        batch: List[tuple] = []
+
+        with self._db:
+            for record in self.client.paginate(spec.endpoint, params, self.page_size):
+                result.fetched += 1
+                last_change = record.get(spec.change_field)
+                changed_at = _parse_timestamp(last_change)
+                if changed_at is not None and (high_water is None or changed_at > high_water):
+                    high_water = changed_at
+
+                batch.append((entity, record[spec.key], last_change, json.dumps(record)))
+                if len(batch) >= self.batch_size:
+                    result.upserted += self._write_batch(batch)
+                    batch = []
+
+            if batch:
+                result.upserted += self._write_batch(batch)
+
+            if high_water is not None:
+                result.watermark = high_water.isoformat()
+                self._db.execute(
+                    "INSERT INTO watermarks (entity, high_water, last_run) VALUES (?, ?, ?) "
+                    "ON CONFLICT (entity) DO UPDATE SET high_water = excluded.high_water, last_run = excluded.last_run",
+                    (entity, result.watermark, datetime.now().isoformat())
+                )
+
+        return result
+
+    def sync_all(self) -> List[SyncResult]:
+        """Gleicht alle bekannten Entitäten nacheinander ab"""
+        return [self.sync(entity) for entity in ENTITIES]
+
+    def _write_batch(self, batch: List[tuple]) -> int:
+        """Schreibt einen Batch per Upsert und liefert die Anzahl geänderter Zeilen"""
+        # rowcount zählt nur die Upserts selbst, nicht Änderungen durch Trigger
+        return self._db.executemany(_UPSERT, batch).rowcount
+
+    # ==================== Lokaler Bestand ====================
+
+    def get(self, entity: str, record_id: int) -> Optional[Dict[str, Any]]:
+        """Liest einen Datensatz aus dem lokalen Bestand"""
+        row = self._db.execute(
+            "SELECT payload FROM records WHERE entity = ? AND id = ?", (entity, record_id)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_records(self, entity: str) -> Iterator[Dict[str, Any]]:
+        """Durchläuft alle lokal gespeicherten Datensätze einer Entität"""
+        for (payload,) in self._db.execute(
+            "SELECT payload FROM records WHERE entity = ? ORDER BY id", (entity,)
+        ):
+            yield json.loads(payload)
+
+    def count(self, entity: str) -> int:
+        """Anzahl der lokal gespeicherten Datensätze einer Entität"""
+        return self._db.execute(
+            "SELECT COUNT(*) FROM records WHERE entity = ?", (entity,)
+        ).fetchone()[0]
+
+
+# ==================== Beispiele ====================
+
+if __name__ == "__main__":
+    try:
+        client = JtlWawiClient()
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        print("Setzen Sie die Umgebungsvariable JTL_API_KEY oder übergeben Sie den API-Key.")
+        exit(1)
+
+    with client, DeltaSync(client) as sync:
+        for result in sync.sync_all():
+            mode = "Vollabgleich" if result.full else "Delta"
+            print(f"{result.entity}: {result.fetched} abgerufen, {result.upserted} gespeichert "
+                  f"({mode}, Watermark: {result.watermark})")
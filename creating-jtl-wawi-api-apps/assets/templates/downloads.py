@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi Downloads (Artikelbilder & PDFs)
+
+Lädt Binärdaten wie ``/items/imagedata/{imageId}`` oder
+``/invoices/{invoiceId}/output/pdf`` parallel und direkt in Blöcken auf die
+Platte, ohne sie im Speicher zu puffern.
+
+- Inhaltsadressierter Cache: jede Datei liegt genau einmal unter ihrem
+  SHA-256 (``objects/ab/abcdef...``), egal wie viele Artikel sie verwenden.
+- Ein SQLite-Index merkt sich pro Schlüssel (z.B. ``image:4711``) Hash, ETag
+  und Version. Unveränderte Dateien werden nicht erneut geladen.
+- Abgebrochene GET-Downloads bleiben als ``.part`` liegen und werden per
+  HTTP-Range fortgesetzt.
+
+Die Spezifikation liefert Binärdaten als JSON-String (Base64); das wird beim
+Abschließen erkannt und dekodiert. Liefert der Server die Datei direkt
+(``application/pdf``, ``image/*``), wird sie unverändert übernommen.
+
+Verwendung:
+    from api_client import JtlWawiClient
+    from downloads import BlobCache
+
+    with JtlWawiClient() as client, BlobCache(client, "jtl_blobs", max_workers=4) as cache:
+        for result in cache.download_item_images([1, 2, 3]):
+            print(result.key, result.status, result.path)
+
+        for result in cache.download_invoice_pdfs(range(1000, 1200)):
+            cache.export(result.key, f"archiv/rechnung-{result.key.split(':')[1]}.pdf")
+"""
+
+import base64
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterable, Iterator
+
+import requests
+
+from api_client import JtlWawiClient, ApiError
+
+
+@dataclass
+class DownloadJob:
+    """Eine herunterzuladende Datei"""
+    key: str  # logischer Name, z.B. "image:4711" oder "invoice:123"
+    endpoint: str
+    method: str = "GET"
+    params: Optional[Dict[str, Any]] = None
+    version: Optional[str] = None  # ändert sich die Version, wird neu geladen (z.B. Bildgröße)
+
+
+@dataclass
+class DownloadResult:
+    """Ergebnis eines Downloads"""
+    key: str
+    status: str  # downloaded | cached | not_modified | failed
+    digest: Optional[str] = None
+    path: Optional[str] = None
+    size: int = 0
+    resumed: bool = False
+    error: Optional[str] = None
+    status_code: Optional[int] = None  # 0 = Verbindungsfehler/Timeout
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    key TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    version TEXT,
+    fetched_at TEXT NOT NULL
+);
+"""
+
+_DOWNLOADED, _CACHED, _NOT_MODIFIED, _FAILED = "downloaded", "cached", "not_modified", "failed"
+
+
+class BlobCache:
+    """
+    Paralleler Downloader mit inhaltsadressiertem Cache
+
+    Attributes:
+        client: JtlWawiClient für die Downloads
+        cache_dir: Verzeichnis für Objekte, Teil-Downloads und Index
+        max_workers: Maximale Anzahl gleichzeitiger Downloads
+        chunk_size: Blockgröße beim Schreiben in Bytes
+    """
+
+    def __init__(
+        self,
+        client: JtlWawiClient,
+        cache_dir: str = "jtl_blobs",
+        max_workers: int = 4,
+        chunk_size: int = 256 * 1024
+    ):
+        self.client = client
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(cache_dir, "partial"), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()  # Index wird aus den Worker-Threads beschrieben
+        # Single-Flight: pro Schlüssel lädt nur ein Worker, sonst schreiben beide in dieselbe .part-Datei
+        self._key_locks: Dict[str, list] = {}  # key -> [Lock, Anzahl Nutzer]
+        self._key_locks_lock = threading.Lock()
+
+    def __enter__(self) -> "BlobCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Schließt den Index"""
+        self._db.close()
+
+    # ==================== Jobs ====================
+
+    @staticmethod
+    def item_image(image_id: int, version: Optional[str] = None) -> DownloadJob:
+        """Bilddaten eines Artikelbilds (GET /items/imagedata/{imageId})"""
+        return DownloadJob(f"image:{image_id}", f"/items/imagedata/{image_id}", version=version)
+
+    @staticmethod
+    def invoice_pdf(invoice_id: int, form_id: Optional[int] = None) -> DownloadJob:
+        """PDF einer Rechnung (POST /invoices/{invoiceId}/output/pdf)"""
+        params = {"formId": form_id} if form_id else None
+        return DownloadJob(f"invoice:{invoice_id}", f"/invoices/{invoice_id}/output/pdf", "POST", params)
+
+    @staticmethod
+    def delivery_note_pdf(delivery_note_id: int, form_id: Optional[int] = None) -> DownloadJob:
+        """PDF eines Lieferscheins (POST /deliveryNotes/{deliveryNoteId}/output/pdf)"""
+        params = {"formId": form_id} if form_id else None
+        return DownloadJob(
+            f"deliverynote:{delivery_note_id}", f"/deliveryNotes/{delivery_note_id}/output/pdf", "POST", params
+        )
+
+    def download_item_images(self, item_ids: Iterable[int], refresh: bool = False) -> Iterator[DownloadResult]:
+        """
+        Lädt alle Bilder der angegebenen Artikel.
+
+        Die Bildliste (GET /items/{itemId}/images) liefert Größe und Dateiname;
+        sie dienen als Version, sodass nur geänderte Bilder neu geladen werden.
+
+        Raises:
+            ApiError: Wenn die Bildliste eines Artikels nicht abgerufen werden kann
+        """
+        def jobs() -> Iterator[DownloadJob]:
+            for item_id in item_ids:
+                response = self.client._request("GET", f"/items/{item_id}/images")
+                if not response.success:
+                    raise ApiError(response)
+                for image in response.data or []:
+                    version = f"{image.get('Size')}:{image.get('Filename')}"
+                    yield self.item_image(image["ImageId"], version)
+
+        return self.download(jobs(), refresh)
+
+    def download_invoice_pdfs(
+        self,
+        invoice_ids: Iterable[int],
+        form_id: Optional[int] = None,
+        refresh: bool = False
+    ) -> Iterator[DownloadResult]:
+        """Lädt die PDFs der angegebenen Rechnungen (bereits archivierte werden übersprungen)"""
+        return self.download((self.invoice_pdf(invoice_id, form_id) for invoice_id in invoice_ids), refresh)
+
+    def download_delivery_note_pdfs(
+        self,
+        delivery_note_ids: Iterable[int],
+        form_id: Optional[int] = None,
+        refresh: bool = False
+    ) -> Iterator[DownloadResult]:
+        """Lädt die PDFs der angegebenen Lieferscheine"""
+        return self.download(
+            (self.delivery_note_pdf(delivery_note_id, form_id) for delivery_note_id in delivery_note_ids), refresh
+        )
+
+    # ==================== Download ====================
+
+    def download(self, jobs: Iterable[DownloadJob], refresh: bool = False) -> Iterator[DownloadResult]:
+        """
+        Führt Downloads mit höchstens ``max_workers`` gleichzeitigen Anfragen aus.
+
+        Die Jobs werden nach und nach aus dem Iterator gelesen; die Ergebnisse
+        kommen in Auftragsreihenfolge.
+
+        Args:
+            jobs: Herunterzuladende Dateien
+            refresh: Auch bereits gecachte Dateien erneut laden
+        """
+        jobs = iter(jobs)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            for job in jobs:
+                pending.append(executor.submit(self.fetch, job, refresh))
+                if len(pending) >= 2 * self.max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def fetch(self, job: DownloadJob, refresh: bool = False) -> DownloadResult:
+        """
+        Lädt eine Datei (mit Wiederholungen laut RetryPolicy des Clients).
+
+        Gleichzeitige Aufrufe mit demselben Schlüssel laufen nacheinander; der
+        zweite findet die Datei danach im Cache (bzw. fragt per ETag nach).
+        """
+        with self._key_lock(job.key):
+            return self._fetch(job, refresh)
+
+    def _fetch(self, job: DownloadJob, refresh: bool) -> DownloadResult:
+        entry = self._lookup(job.key)
+        if entry and not refresh and entry["version"] == job.version and not entry["etag"]:
+            return self._result(job.key, _CACHED, entry)
+
+        retry = self.client.retry
+        attempts = retry.max_attempts if retry else 1
+        result = None
+        for attempt in range(1, attempts + 1):
+            result = self._fetch_once(job, None if refresh or not entry or entry["version"] != job.version else entry)
+            retryable = retry is not None and result.status_code in retry.retry_statuses
+            if result.status != _FAILED or not retryable:
+                return result
+            if attempt < attempts:
+                time.sleep(retry.delay(attempt))
+        return result
+
+    @contextmanager
+    def _key_lock(self, key: str) -> Iterator[None]:
+        with self._key_locks_lock:
+            slot = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            slot[1] += 1
+        try:
+            with slot[0]:
+                yield
+        finally:
+            with self._key_locks_lock:
+                slot[1] -= 1
+                if not slot[1]:
+                    del self._key_locks[key]
+
+    def _fetch_once(self, job: DownloadJob, entry: Optional[Dict[str, Any]]) -> DownloadResult:
+        part = self._part_path(job.key)
+        meta_path = f"{part}.json"
+        meta: Dict[str, Any] = {}
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+
+        headers: Dict[str, str] = {}
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        # Range nur bei GET: die PDF-Endpoints erzeugen die Datei per POST jedes Mal neu
+        resume = job.method == "GET" and offset > 0
+        if resume:
+            headers["Range"] = f"bytes={offset}-"
+            if meta.get("etag"):
+                headers["If-Range"] = meta["etag"]
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+
+        try:
+            with self.client.open_stream(job.method, job.endpoint, job.params, headers) as response:
+                if response.status_code == 304 and entry:
+                    self._remove_part(part)
+                    self._store(job, entry["digest"], entry["size"], entry["etag"])
+                    return self._result(job.key, _NOT_MODIFIED, entry)
+                if response.status_code == 416 and resume:
+                    # Teil-Download ist bereits vollständig
+                    return self._complete(job, part, meta)
+                if response.status_code not in (200, 206):
+                    return DownloadResult(
+                        job.key, _FAILED,
+                        error=f"HTTP {response.status_code}: {response.text[:200]}",
+                        status_code=response.status_code
+                    )
+
+                resumed = response.status_code == 206
+                meta = {
+                    "content_type": response.headers.get("Content-Type", ""),
+                    "etag": response.headers.get("ETag"),
+                } if not resumed else meta
+                with open(meta_path, "w", encoding="utf-8") as f:
+                    json.dump(meta, f)
+
+                with open(part, "ab" if resumed else "wb") as f:
+                    for chunk in response.iter_content(self.chunk_size):
+                        f.write(chunk)
+
+            result = self._complete(job, part, meta)
+            result.resumed = resumed
+            return result
+        except requests.exceptions.RequestException as e:
+            # Teil-Download bleibt liegen und wird beim nächsten Versuch fortgesetzt
+            return DownloadResult(job.key, _FAILED, error=f"Verbindungsfehler: {e}", status_code=0)
+        except (ValueError, OSError) as e:
+            self._remove_part(part)
+            return DownloadResult(job.key, _FAILED, error=f"Fehler: {e}")
+
+    def _complete(self, job: DownloadJob, part: str, meta: Dict[str, Any]) -> DownloadResult:
+        """Dekodiert ggf. Base64, hasht den Inhalt und legt ihn als Objekt ab"""
+        if "json" in meta.get("content_type", "") or _starts_with_quote(part):
+            source = part
+            fd, part = tempfile.mkstemp(dir=os.path.dirname(source), suffix=".bin")
+            with os.fdopen(fd, "wb") as target:
+                _decode_base64_json(source, target, self.chunk_size)
+            os.remove(source)
+
+        digest = hashlib.sha256()
+        size = 0
+        with open(part, "rb") as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                digest.update(chunk)
+                size += len(chunk)
+        digest_hex = digest.hexdigest()
+
+        path = self._object_path(digest_hex)
+        if os.path.exists(path):
+            os.remove(part)  # gleicher Inhalt bereits vorhanden
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(part, path)
+        self._remove_part(self._part_path(job.key))
+
+        self._store(job, digest_hex, size, meta.get("etag"))
+        return DownloadResult(job.key, _DOWNLOADED, digest_hex, path, size, status_code=200)
+
+    # ==================== Cache ====================
+
+    def path(self, key: str) -> Optional[str]:
+        """Pfad der gecachten Datei zu einem Schlüssel (None = nicht im Cache)"""
+        entry = self._lookup(key)
+        return self._object_path(entry["digest"]) if entry else None
+
+    def export(self, key: str, destination: str) -> str:
+        """
+        Legt die gecachte Datei unter ``destination`` ab (Hardlink, sonst Kopie).
+
+        Raises:
+            KeyError: Wenn der Schlüssel nicht im Cache ist
+        """
+        source = self.path(key)
+        if source is None:
+            raise KeyError(key)
+        os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+        if os.path.exists(destination):
+            os.remove(destination)
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copyfile(source, destination)
+        return destination
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT digest, size, etag, version FROM blobs WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or not os.path.exists(self._object_path(row[0])):
+            return None
+        return {"digest": row[0], "size": row[1], "etag": row[2], "version": row[3]}
+
+    def _store(self, job: DownloadJob, digest: str, size: int, etag: Optional[str]) -> None:
+        with self._db_lock, self._db:
+            self._db.execute(
+                "INSERT INTO blobs (key, digest, size, etag, version, fetched_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET digest = excluded.digest, size = excluded.size, "
+                "etag = excluded.etag, version = excluded.version, fetched_at = excluded.fetched_at",
+                (job.key, digest, size, etag, job.version, datetime.now().isoformat())
+            )
+
+    def _result(self, key: str, status: str, entry: Dict[str, Any]) -> DownloadResult:
+        return DownloadResult(key, status, entry["digest"], self._object_path(entry["digest"]), entry["size"])
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, "objects", digest[:2], digest)
+
+    def _part_path(self, key: str) -> str:
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, "partial", f"{name}.part")
+
+    @staticmethod
+    def _remove_part(part: str) -> None:
+        for path in (part, f"{part}.json"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _starts_with_quote(path: str) -> bool:
+    """JSON-String statt Binärdaten (Server ohne Content-Type)"""
+    with open(path, "rb") as f:
+        return f.read(1) == b'"'
+
+
+def _decode_base64_json(source: str, target, chunk_size: int) -> None:
+    """Dekodiert einen JSON-String mit Base64-Inhalt blockweise in eine Datei"""
+    # Blockgröße auf ein Vielfaches von 4 runden: Base64 dekodiert 4 Zeichen zu 3 Bytes
+    chunk_size = max(chunk_size - chunk_size % 4, 4)
+    rest = b""
+    with open(source, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            # Anführungszeichen, Whitespace und JSON-Escapes ("\/") entfernen
+            data = rest + chunk.translate(None, b'" \t\r\n\\')
+            usable = len(data) - len(data) % 4
+            target.write(base64.b64decode(data[:usable], validate=True))
+            rest = data[usable:]
+    if rest:
+        raise ValueError("Ungültige Base64-Daten (Länge kein Vielfaches von 4)")
+
+
+# ==================== Beispiele ====================
+
+if __name__ == "__main__":
+    import sys
+
+    try:
+        client = JtlWawiClient()
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        print("Setzen Sie die Umgebungsvariable JTL_API_KEY oder übergeben Sie den API-Key.")
+        exit(1)
+
+    item_ids = [int(arg) for arg in sys.argv[1:]] or [1]
+
+    with client, BlobCache(client, max_workers=4) as cache:
+        for result in cache.download_item_images(item_ids):
+            print(f"{result.key}: {result.status} {result.size} Bytes {result.error or ''}")
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi Spaltenspeicher (Frames)
+
+Packt große Ergebnismengen (Lagerbestände, Preise) spaltenweise in typisierte
+Arrays statt in eine Liste von Dicts. Zahlen liegen als ``array('q')`` bzw.
+``array('d')`` vor (8 Byte pro Wert), Texte wie Chargen- oder Kanal-Codes
+als Index in eine Tabelle internierter Strings.
+
+Bei 500.000 Lagerbeständen belegt die Dict-Liste mehrere hundert MB, ein
+Frame mit fünf Spalten rund 20 MB.
+
+Verwendung:
+    from api_client import JtlWawiClient
+    from frames import stock_frame
+
+    with JtlWawiClient() as client:
+        stocks = stock_frame(client)                    # streamt alle Seiten von /stocks
+        per_warehouse = stocks.group_sum("WarehouseId", "QuantityTotal")
+
+        low = stocks.filter(stocks.mask("QuantityTotal", "<", 5))
+        print(len(low), low.sum("QuantityTotal"))
+"""
+
+import math
+import operator
+import sys
+from array import array
+from itertools import compress, repeat
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Sequence, Tuple, Union
+
+from api_client import JtlWawiClient, ApiError, iter_json_items
+
+
+# Spaltentypen: "int" (Schlüssel, Mengen in Stück), "float" (Mengen, Preise), "str" (Codes)
+INT, FLOAT, STR = "int", "float", "str"
+
+# Leerwerte: NULL lässt sich in typisierten Arrays nicht speichern
+INT_NULL = 0  # Schlüssel der Wawi beginnen bei 1
+STR_NULL = -1
+
+STOCK_COLUMNS: Dict[str, str] = {
+    "ItemId": INT,
+    "WarehouseId": INT,
+    "StorageLocationId": INT,
+    "BatchNumber": STR,
+    "QuantityTotal": FLOAT,
+    "QuantityLockedForShipment": FLOAT,
+    "QuantityLockedForAvailability": FLOAT,
+    "QuantityInPickingLists": FLOAT,
+}
+
+SALES_CHANNEL_PRICE_COLUMNS: Dict[str, str] = {
+    "ItemId": INT,
+    "SalesChannelId": STR,
+    "CustomerGroupId": INT,
+    "FromQuantity": INT,
+    "NetPrice": FLOAT,
+    "ReduceStandardPriceByPercent": FLOAT,
+}
+
+_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+class _StrColumn:
+    """Dictionary-kodierte Textspalte: Codes in einem Array, jeder Text nur einmal gespeichert"""
+
+    __slots__ = ("codes", "values", "_lookup")
+
+    def __init__(self):
+        self.codes = array("l")
+        self.values: List[str] = []
+        self._lookup: Dict[str, int] = {}
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return STR_NULL
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(sys.intern(value))
+        return code
+
+    def append(self, value: Optional[str]) -> None:
+        self.codes.append(self.encode(value))
+
+    def decode(self, code: int) -> Optional[str]:
+        return None if code == STR_NULL else self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+_Column = Union[array, _StrColumn]
+
+
+class Frame:
+    """
+    Spaltenweise gespeicherte Ergebnismenge
+
+    Attributes:
+        columns: Spaltenname -> Typ ("int", "float", "str")
+    """
+
+    def __init__(self, columns: Dict[str, str]):
+        self.columns = dict(columns)
+        self._data: Dict[str, _Column] = {}
+        for name, kind in self.columns.items():
+            if kind == INT:
+                self._data[name] = array("q")
+            elif kind == FLOAT:
+                self._data[name] = array("d")
+            elif kind == STR:
+                self._data[name] = _StrColumn()
+            else:
+                raise ValueError(f"Unbekannter Spaltentyp für {name}: {kind}")
+
+    # ==================== Befüllen ====================
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Übernimmt die Spaltenwerte eines Datensatzes (weitere Felder werden ignoriert)"""
+        for name, kind in self.columns.items():
+            value = record.get(name)
+            if kind == STR:
+                self._data[name].append(value)
+            elif kind == INT:
+                self._data[name].append(INT_NULL if value is None else int(value))
+            else:
+                self._data[name].append(math.nan if value is None else float(value))
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> "Frame":
+        """Übernimmt alle Datensätze eines Iterators, ohne ihn als Liste zu halten"""
+        for record in records:
+            self.append(record)
+        return self
+
+    # ==================== Zugriff ====================
+
+    def __len__(self) -> int:
+        first = next(iter(self._data.values()), None)
+        return len(first) if first is not None else 0
+
+    def column(self, name: str) -> Union[array, List[Optional[str]]]:
+        """
+        Liefert eine Spalte.
+
+        Zahlenspalten werden direkt als Array geliefert (ohne Kopie, z.B. für
+        ``numpy.frombuffer``); Textspalten als Liste der dekodierten Werte.
+        """
+        data = self._data[name]
+        if isinstance(data, _StrColumn):
+            return [data.decode(code) for code in data.codes]
+        return data
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Durchläuft die Zeilen als Tupel in Spaltenreihenfolge"""
+        columns = [self.column(name) for name in self.columns]
+        return zip(*columns)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Wandelt den Frame zurück in eine Liste von Dicts (nur für kleine Ergebnisse)"""
+        names = list(self.columns)
+        return [dict(zip(names, row)) for row in self.rows()]
+
+    @property
+    def nbytes(self) -> int:
+        """Belegter Speicher der Spaltendaten in Bytes (ohne Text-Tabelle)"""
+        total = 0
+        for data in self._data.values():
+            values = data.codes if isinstance(data, _StrColumn) else data
+            total += values.itemsize * len(values)
+        return total
+
+    # ==================== Filtern ====================
+
+    def mask(self, name: str, op: str, value: Any) -> List[bool]:
+        """
+        Vergleicht eine ganze Spalte mit einem Wert, z.B. ``mask("WarehouseId", "==", 3)``.
+
+        Textspalten werden über ihre Codes verglichen (nur "==" und "!=").
+        """
+        compare = _OPERATORS[op]
+        data = self._data[name]
+        if isinstance(data, _StrColumn):
+            if op not in ("==", "!="):
+                raise ValueError("Textspalten unterstützen nur '==' und '!='")
+            code = data._lookup.get(value, STR_NULL - 1) if value is not None else STR_NULL
+            return list(map(compare, data.codes, repeat(code)))
+        return list(map(compare, data, repeat(value)))
+
+    def filter(self, mask: Sequence[bool]) -> "Frame":
+        """Neuer Frame mit den Zeilen, für die ``mask`` wahr ist"""
+        result = Frame(self.columns)
+        for name, data in self._data.items():
+            if isinstance(data, _StrColumn):
+                target = result._data[name]
+                target.values, target._lookup = data.values, data._lookup
+                target.codes = array("l", compress(data.codes, mask))
+            else:
+                result._data[name] = array(data.typecode, compress(data, mask))
+        return result
+
+    # ==================== Aggregation ====================
+
+    def sum(self, name: str) -> float:
+        """Summe einer Zahlenspalte (leere Werte werden übersprungen)"""
+        data = self._data[name]
+        if data.typecode == "d":
+            return math.fsum(value for value in data if value == value)
+        return sum(data)
+
+    def group_sum(self, key: str, value: str) -> Dict[Any, float]:
+        """Summe von ``value`` je Wert von ``key``, z.B. Gesamtbestand je Lager"""
+        keys = self._data[key]
+        values = self._data[value]
+        totals: Dict[Any, float] = {}
+        get = totals.get
+        codes = keys.codes if isinstance(keys, _StrColumn) else keys
+        for group, amount in zip(codes, values):
+            if amount == amount:  # NaN überspringen
+                totals[group] = get(group, 0) + amount
+        if isinstance(keys, _StrColumn):
+            return {keys.decode(code): total for code, total in totals.items()}
+        return totals
+
+    def group_count(self, key: str) -> Dict[Any, int]:
+        """Anzahl Zeilen je Wert von ``key``"""
+        keys = self._data[key]
+        counts: Dict[Any, int] = {}
+        get = counts.get
+        for group in (keys.codes if isinstance(keys, _StrColumn) else keys):
+            counts[group] = get(group, 0) + 1
+        if isinstance(keys, _StrColumn):
+            return {keys.decode(code): count for code, count in counts.items()}
+        return counts
+
+    def __repr__(self) -> str:
+        return f"Frame({len(self)} Zeilen, {', '.join(self.columns)})"
+
+
+# ==================== Sammler ====================
+
+def to_frame(records: Iterable[Dict[str, Any]], columns: Dict[str, str]) -> Frame:
+    """Packt einen Iterator von Datensätzen (z.B. ``client.stream(...)``) in einen Frame"""
+    return Frame(columns).extend(records)
+
+
+def stock_frame(
+    client: JtlWawiClient,
+    item_id: Optional[int] = None,
+    warehouse_id: Optional[int] = None,
+    page_size: int = 1000,
+    columns: Dict[str, str] = STOCK_COLUMNS
+) -> Frame:
+    """
+    Lädt alle Lagerbestände (GET /stocks) spaltenweise.
+
+    Die Seiten werden schrittweise dekodiert und nur die Spalten aus
+    ``columns`` übernommen; es entsteht zu keinem Zeitpunkt eine Dict-Liste.
+
+    Raises:
+        ApiError: Wenn eine Seite nicht abgerufen werden kann
+    """
+    params: Dict[str, Any] = {}
+    if item_id:
+        params["itemId"] = item_id
+    if warehouse_id:
+        params["warehouseId"] = warehouse_id
+    return to_frame(client.stream("/stocks", params, page_size, fields=tuple(columns)), columns)
+
+
+def sales_channel_price_frame(
+    client: JtlWawiClient,
+    item_ids: Iterable[int],
+    columns: Dict[str, str] = SALES_CHANNEL_PRICE_COLUMNS
+) -> Frame:
+    """
+    Lädt die Verkaufskanal-Preise (GET /items/{id}/salesChannelPrices) mehrerer Artikel spaltenweise.
+
+    Raises:
+        ApiError: Wenn die Preise eines Artikels nicht abgerufen werden können
+    """
+    frame = Frame(columns)
+    fields = tuple(columns)
+    for item_id in item_ids:
+        response = client.get_raw(f"/items/{item_id}/salesChannelPrices")
+        if not response.success:
+            raise ApiError(response)
+        frame.extend(iter_json_items(response.data or b"[]", fields=fields))
+    return frame
+
+
+# ==================== Beispiele ====================
+
+if __name__ == "__main__":
+    try:
+        client = JtlWawiClient()
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        print("Setzen Sie die Umgebungsvariable JTL_API_KEY oder übergeben Sie den API-Key.")
+        exit(1)
+
+    with client:
+        stocks = stock_frame(client)
+        print(f"{stocks} ({stocks.nbytes / 1024 / 1024:.1f} MB)")
+
+        for warehouse_id, total in sorted(stocks.group_sum("WarehouseId", "QuantityTotal").items()):
+            print(f"Lager {warehouse_id}: {total:g}")
+
+        empty = stocks.filter(stocks.mask("QuantityTotal", "<=", 0))
+        print(f"{len(empty)} Lagerplätze ohne Bestand")
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi API Metriken
+
+Sammelt über einen RequestHook Latenz-Histogramme, Statuscodes, Bytes und
+Wiederholungen je Endpoint-Vorlage (z.B. ``GET /customers/{id}``) und
+exportiert sie im Prometheus-Textformat.
+
+Verwendung:
+    from api_client import JtlWawiClient
+    from metrics import MetricsCollector
+
+    metrics = MetricsCollector()
+    with JtlWawiClient(hooks=[metrics]) as client:
+        for item in client.scan_items():
+            ...
+
+    print(metrics.report())  # Endpoints nach Gesamtzeit sortiert
+
+    # Für den Textfile-Collector des node_exporter
+    metrics.write_textfile("/var/lib/node_exporter/jtl_wawi.prom")
+"""
+
+import os
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List, Tuple
+
+from api_client import RequestEvent, RequestHook
+
+# Obergrenzen der Histogramm-Buckets in Sekunden (Prometheus-Standard)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class EndpointStats:
+    """Aggregierte Messwerte eines Endpoints"""
+    method: str
+    endpoint: str
+    count: int = 0
+    errors: int = 0  # Anfragen ohne Erfolg (inkl. Verbindungsfehler)
+    retries: int = 0
+    total_seconds: float = 0.0
+    mean_ms: float = 0.0
+    p50_ms: Optional[float] = None  # aus dem Histogramm geschätzt
+    p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    statuses: Dict[int, int] = field(default_factory=dict)  # 0 = Verbindungsfehler/Timeout
+
+
+class _Series:
+    """Rohdaten eines Endpoints (nur unter dem Lock des Collectors verändern)"""
+
+    __slots__ = ("buckets", "count", "sum", "errors", "retries", "request_bytes", "response_bytes", "statuses")
+
+    def __init__(self, bucket_count: int):
+        self.buckets = [0] * (bucket_count + 1)  # letzter Eintrag: +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.errors = 0
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.statuses: Dict[int, int] = {}
+
+
+def _quantile(q: float, bounds: Tuple[float, ...], buckets: List[int], count: int) -> Optional[float]:
+    """Schätzt ein Quantil aus den Bucket-Zählern (linear interpoliert wie histogram_quantile)"""
+    if not count:
+        return None
+    rank = q * count
+    seen = 0
+    for index, in_bucket in enumerate(buckets):
+        if seen + in_bucket >= rank and in_bucket:
+            if index == len(bounds):
+                return bounds[-1]  # im +Inf-Bucket: höchste bekannte Grenze
+            lower = bounds[index - 1] if index else 0.0
+            return lower + (bounds[index] - lower) * (rank - seen) / in_bucket
+        seen += in_bucket
+    return bounds[-1]
+
+
+def _label(value: str) -> str:
+    """Maskiert einen Label-Wert für das Prometheus-Textformat"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsCollector(RequestHook):
+    """
+    Thread-sicherer Hook, der Anfragen je (Methode, Endpoint-Vorlage) aggregiert
+
+    Kann für mehrere Clients (auch AsyncJtlWawiClient) gleichzeitig verwendet werden.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def before(self, event: RequestEvent) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def after(self, event: RequestEvent) -> None:
+        index = bisect_left(self.buckets, event.latency)
+        with self._lock:
+            self._in_flight -= 1
+            key = (event.method, event.endpoint)
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.buckets))
+            series.buckets[index] += 1
+            series.count += 1
+            series.sum += event.latency
+            series.errors += not event.success
+            series.retries += event.retries
+            series.request_bytes += event.request_bytes
+            series.response_bytes += event.response_bytes
+            series.statuses[event.status_code] = series.statuses.get(event.status_code, 0) + 1
+
+    def reset(self) -> None:
+        """Verwirft alle Messwerte"""
+        with self._lock:
+            self._series.clear()
+
+    # ==================== Auswertung ====================
+
+    def snapshot(self) -> List[EndpointStats]:
+        """Messwerte aller Endpoints, nach Gesamtzeit absteigend sortiert"""
+        with self._lock:
+            series = [
+                (method, endpoint, s.count, s.sum, s.errors, s.retries,
+                 s.request_bytes, s.response_bytes, dict(s.statuses), list(s.buckets))
+                for (method, endpoint), s in self._series.items()
+            ]
+
+        result = []
+        for method, endpoint, count, total, errors, retries, sent, received, statuses, buckets in series:
+            quantiles = [_quantile(q, self.buckets, buckets, count) for q in (0.5, 0.95, 0.99)]
+            p50, p95, p99 = [round(value * 1000, 2) if value is not None else None for value in quantiles]
+            result.append(EndpointStats(
+                method=method,
+                endpoint=endpoint,
+                count=count,
+                errors=errors,
+                retries=retries,
+                total_seconds=round(total, 3),
+                mean_ms=round(total / count * 1000, 2) if count else 0.0,
+                p50_ms=p50,
+                p95_ms=p95,
+                p99_ms=p99,
+                request_bytes=sent,
+                response_bytes=received,
+                statuses=statuses
+            ))
+        result.sort(key=lambda stats: stats.total_seconds, reverse=True)
+        return result
+
+    def report(self, limit: int = 20) -> str:
+        """Tabelle der Endpoints mit dem größten Anteil an der Gesamtzeit"""
+        stats = self.snapshot()
+        total = sum(entry.total_seconds for entry in stats) or 1.0
+        lines = [
+            f"{'Endpoint':<45} {'Anzahl':>7} {'Zeit s':>8} {'Anteil':>7} {'Ø ms':>8} "
+            f"{'p95 ms':>8} {'Fehler':>6} {'Wdh.':>5} {'KB':>9}"
+        ]
+        for entry in stats[:limit]:
+            name = f"{entry.method} {entry.endpoint}"
+            p95 = f"{entry.p95_ms:.1f}" if entry.p95_ms is not None else "-"
+            lines.append(
+                f"{name[:45]:<45} {entry.count:>7} {entry.total_seconds:>8.2f} "
+                f"{entry.total_seconds / total:>7.1%} {entry.mean_ms:>8.1f} {p95:>8} "
+                f"{entry.errors:>6} {entry.retries:>5} {entry.response_bytes / 1024:>9.0f}"
+            )
+        return "\n".join(lines)
+
+    # ==================== Prometheus ====================
+
+    def to_prometheus(self, prefix: str = "jtl_wawi") -> str:
+        """Exportiert alle Messwerte im Prometheus-Textformat (Version 0.0.4)"""
+        with self._lock:
+            series = sorted(
+                ((key, list(s.buckets), s.sum, s.count, s.retries, s.request_bytes, s.response_bytes,
+                  sorted(s.statuses.items()))
+                 for key, s in self._series.items()),
+                key=lambda entry: entry[0]
+            )
+            in_flight = self._in_flight
+
+        requests_total = [
+            f"# HELP {prefix}_requests_total Anzahl der API-Anfragen nach Statuscode (0 = Verbindungsfehler)",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+        duration = [
+            f"# HELP {prefix}_request_duration_seconds Dauer der API-Anfragen inkl. Wiederholungen",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        retries_total = [
+            f"# HELP {prefix}_retries_total Wiederholte Versuche",
+            f"# TYPE {prefix}_retries_total counter",
+        ]
+        request_bytes = [
+            f"# HELP {prefix}_request_bytes_total Gesendete Body-Bytes",
+            f"# TYPE {prefix}_request_bytes_total counter",
+        ]
+        response_bytes = [
+            f"# HELP {prefix}_response_bytes_total Empfangene Body-Bytes",
+            f"# TYPE {prefix}_response_bytes_total counter",
+        ]
+
+        for (method, endpoint), buckets, total, count, retries, sent, received, statuses in series:
+            labels = f'method="{_label(method)}",endpoint="{_label(endpoint)}"'
+            for status, hits in statuses:
+                requests_total.append(f'{prefix}_requests_total{{{labels},status="{status}"}} {hits}')
+            cumulative = 0
+            for bound, in_bucket in zip(self.buckets, buckets):
+                cumulative += in_bucket
+                duration.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            duration.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            duration.append(f"{prefix}_request_duration_seconds_sum{{{labels}}} {total}")
+            duration.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {count}")
+            retries_total.append(f"{prefix}_retries_total{{{labels}}} {retries}")
+            request_bytes.append(f"{prefix}_request_bytes_total{{{labels}}} {sent}")
+            response_bytes.append(f"{prefix}_response_bytes_total{{{labels}}} {received}")
+
+        in_flight_lines = [
+            f"# HELP {prefix}_requests_in_flight Laufende API-Anfragen",
+            f"# TYPE {prefix}_requests_in_flight gauge",
+            f"{prefix}_requests_in_flight {in_flight}",
+        ]
+        return "\n".join(
+            requests_total + duration + retries_total + request_bytes + response_bytes + in_flight_lines
+        ) + "\n"
+
+    def write_textfile(self, path: str, prefix: str = "jtl_wawi") -> None:
+        """
+        Schreibt den Export atomar in eine Datei (Textfile-Collector des node_exporter).
+
+        Die Datei wird erst unter einem temporären Namen geschrieben und dann
+        umbenannt, damit der Collector nie eine halbe Datei liest.
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus(prefix))
+        os.replace(temporary, path)
+
+
+# ==================== Beispiele ====================
+
+if __name__ == "__main__":
+    from api_client import JtlWawiClient, RetryPolicy
+
+    metrics = MetricsCollector()
+    try:
+        client = JtlWawiClient(hooks=[metrics], retry=RetryPolicy())
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        print("Setzen Sie die Umgebungsvariable JTL_API_KEY oder übergeben Sie den API-Key.")
+        exit(1)
+
+    with client:
+        print("Lade Kunden und Artikel...")
+        for customer in client.iter_customers(page_size=20):
+            client._request("GET", f"/customers/{customer['Id']}")
+        sum(1 for _ in client.scan_items(page_size=100))
+
+    print()
+    print(metrics.report())
+    print()
+    print(metrics.to_prometheus())
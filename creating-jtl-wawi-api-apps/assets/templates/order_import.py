@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi Auftragsimport
+
+Importiert große Mengen Aufträge (z.B. Marktplatz-Exporte) aus JSONL oder
+CSV mit begrenzter Parallelität und wiederaufnehmbar.
+
+- Die Datei wird zeilenweise gelesen, nie vollständig in den Speicher.
+- Jeder Auftrag wird vor dem Senden geprüft; ungültige Aufträge landen mit
+  Fehlermeldung im Journal und werden nicht gesendet.
+- Pro Auftrag zwei Anfragen: POST /salesOrders, danach alle Positionen in
+  einem POST /salesOrders/{id}/lineitems.
+- Ein SQLite-Journal mit der externen Auftragsnummer (``ExternalNumber``) als
+  Schlüssel hält den Fortschritt fest. Ein erneuter Lauf überspringt fertige
+  Aufträge. Ist nach einem Abbruch, Timeout oder 5xx unklar, ob eine Anfrage
+  angekommen ist, wird beim Server nachgesehen (``externalOrderNumber`` bzw.
+  vorhandene Positionen), statt doppelt anzulegen.
+
+Eingabeformate:
+    JSONL: ein Auftrag pro Zeile im Format von CreateSalesOrder, Positionen
+           unter "LineItems" (Format CreateSalesOrderLineItem)
+    CSV:   eine Zeile pro Position; Spaltennamen mit Punkt für verschachtelte
+           Felder (BillingAddress.LastName), Positionsfelder mit "LineItem."
+           (LineItem.ItemId, LineItem.Quantity). Aufeinanderfolgende Zeilen
+           mit gleicher ExternalNumber bilden einen Auftrag.
+
+Verwendung:
+    from api_client import JtlWawiClient
+    from order_import import OrderImporter
+
+    with JtlWawiClient(pool_maxsize=8) as client, OrderImporter(client, "order_journal.sqlite") as importer:
+        result = importer.import_file("marktplatz_export.jsonl")
+        print(result)
+"""
+
+import csv
+import json
+import os
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Tuple
+
+from api_client import JtlWawiClient, ApiResponse, ApiError
+
+# Felder, die in CSV-Dateien als Zahl gelesen werden
+_DECIMAL_FIELDS = {
+    "Quantity", "SalesPriceNet", "SalesPriceGross", "Discount", "PurchasePriceNet", "TaxRate",
+    "TotalGrossAmount", "CurrencyFactor", "StillToPay", "CashDiscount", "ShippingCosts",
+}
+_INTEGER_FIELDS = {"PaymentTarget", "CashDiscountDays", "PaymentStatus"}
+
+LINE_ITEM_PREFIX = "LineItem."
+
+# Schlüssel für nicht lesbare Zeilen: read_jsonl liefert {PARSE_ERROR: Meldung}, run() meldet sie als ungültig
+PARSE_ERROR = "_ParseError"
+
+
+@dataclass
+class ImportResult:
+    """Ergebnis eines Importlaufs"""
+    created: int = 0  # in diesem Lauf vollständig angelegt
+    skipped: int = 0  # bereits in einem früheren Lauf angelegt
+    recovered: int = 0  # nach Abbruch beim Server gefunden statt erneut angelegt
+    invalid: int = 0  # Prüfung fehlgeschlagen, nicht gesendet
+    failed: int = 0  # abgelehnt oder Ausgang unklar, werden beim nächsten Lauf geprüft bzw. erneut versucht
+    duplicates: int = 0  # ExternalNumber mehrfach in der Eingabe
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    external_number TEXT PRIMARY KEY,
+    status TEXT NOT NULL,  -- invalid | sending | created | items_sending | done | failed
+    order_id INTEGER,
+    line_items INTEGER NOT NULL DEFAULT 0,
+    source_line INTEGER,
+    error TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_status ON orders (status);
+"""
+
+# Statusübergänge:
+#   sending -> created -> items_sending -> done
+#   sending/items_sending bleiben nach Abbruch, Timeout, 408, 429 oder 5xx stehen
+#   (Ausgang unklar); nur eine Ablehnung (übrige 4xx) führt zu failed bzw. created
+_INVALID, _SENDING, _CREATED, _ITEMS_SENDING, _DONE, _FAILED = (
+    "invalid", "sending", "created", "items_sending", "done", "failed"
+)
+
+
+# ==================== Eingabe ====================
+
+def read_jsonl(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Liest Aufträge zeilenweise aus einer JSONL-Datei: (Zeilennummer, Auftrag).
+
+    Eine nicht lesbare Zeile (kein JSON-Objekt, kein UTF-8) bricht den Import
+    nicht ab, sondern wird als ``{PARSE_ERROR: Meldung}`` geliefert.
+    """
+    with open(path, "rb") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                order = json.loads(line.decode("utf-8-sig" if line_no == 1 else "utf-8"))
+            except ValueError as e:
+                order = {PARSE_ERROR: f"Zeile {line_no} ist kein gültiges JSON: {e}"}
+            if not isinstance(order, dict):
+                order = {PARSE_ERROR: f"Zeile {line_no} ist kein JSON-Objekt"}
+            yield line_no, order
+
+
+def _csv_value(name: str, value: str) -> Any:
+    """Wandelt einen CSV-Wert anhand des Feldnamens in Zahl oder Text um"""
+    field = name.rsplit(".", 1)[-1]
+    if field in _DECIMAL_FIELDS:
+        return float(value.replace(",", "."))
+    if field in _INTEGER_FIELDS or field.endswith("Id"):
+        return int(value)
+    return value
+
+
+def _set_path(target: Dict[str, Any], path: str, value: Any) -> None:
+    """Setzt ein verschachteltes Feld (BillingAddress.LastName)"""
+    *parents, field = path.split(".")
+    for parent in parents:
+        target = target.setdefault(parent, {})
+    target[field] = value
+
+
+def read_csv(path: str, delimiter: Optional[str] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Liest Aufträge aus einer CSV-Datei (eine Zeile pro Position).
+
+    Das Trennzeichen wird ohne Angabe erkannt (``;`` bei deutschem Excel).
+    Ungültige Zahlen werden als Text übernommen und bei der Prüfung gemeldet.
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if delimiter is None:
+            sample = f.read(4096)
+            f.seek(0)
+            try:
+                delimiter = csv.Sniffer().sniff(sample, delimiters=";,\t").delimiter
+            except csv.Error:
+                delimiter = ","
+
+        order: Optional[Dict[str, Any]] = None
+        order_line = 0
+        reader = csv.DictReader(f, delimiter=delimiter)
+        for row in reader:
+            number = (row.get("ExternalNumber") or "").strip()
+            if order is None or number != order.get("ExternalNumber"):
+                if order is not None:
+                    yield order_line, order
+                order, order_line = {"LineItems": []}, reader.line_num
+
+            line_item: Dict[str, Any] = {}
+            for name, value in row.items():
+                if name is None or value is None or value.strip() == "":
+                    continue
+                value = value.strip()
+                try:
+                    value = _csv_value(name, value)
+                except ValueError:
+                    pass
+                if name.startswith(LINE_ITEM_PREFIX):
+                    _set_path(line_item, name[len(LINE_ITEM_PREFIX):], value)
+                else:
+                    _set_path(order, name, value)
+            if line_item:
+                order["LineItems"].append(line_item)
+
+        if order is not None:
+            yield order_line, order
+
+
+def read_orders(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Wählt den Leser anhand der Dateiendung (.jsonl/.ndjson oder .csv)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return read_jsonl(path)
+    if extension == ".csv":
+        return read_csv(path)
+    raise ValueError(f"Unbekanntes Format: {path} (erwartet .jsonl oder .csv)")
+
+
+# ==================== Prüfung ====================
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate_order(order: Dict[str, Any]) -> List[str]:
+    """
+    Prüft einen Auftrag vor dem Senden.
+
+    Returns:
+        Liste der Fehlermeldungen (leer = gültig)
+    """
+    errors = []
+    if not str(order.get("ExternalNumber") or "").strip():
+        errors.append("ExternalNumber fehlt")
+    for field in ("CompanyId", "CustomerId"):
+        if not isinstance(order.get(field), int) or isinstance(order.get(field), bool):
+            errors.append(f"{field} fehlt oder ist keine Zahl")
+    if order.get("SalesOrderDate"):
+        try:
+            datetime.fromisoformat(str(order["SalesOrderDate"]).replace("Z", "+00:00"))
+        except ValueError:
+            errors.append(f"SalesOrderDate ungültig: {order['SalesOrderDate']}")
+
+    line_items = order.get("LineItems") or []
+    if not isinstance(line_items, list):
+        return errors + ["LineItems muss eine Liste sein"]
+    for index, item in enumerate(line_items, 1):
+        if not _is_number(item.get("Quantity")) or item["Quantity"] <= 0:
+            errors.append(f"Position {index}: Quantity fehlt oder ist nicht positiv")
+        if not item.get("ItemId") and not item.get("Name"):
+            errors.append(f"Position {index}: ItemId oder Name erforderlich")
+        for field in ("SalesPriceNet", "SalesPriceGross", "Discount", "TaxRate"):
+            if field in item and not _is_number(item[field]):
+                errors.append(f"Position {index}: {field} ist keine Zahl")
+    return errors
+
+
+# ==================== Import ====================
+
+class OrderImporter:
+    """
+    Wiederaufnehmbarer Auftragsimport mit Journal
+
+    Attributes:
+        client: JtlWawiClient für die Anlage
+        journal_path: Pfad zum SQLite-Journal
+        max_workers: Maximale Anzahl gleichzeitig importierter Aufträge
+        disable_workflows: Automatische Workflows bei der Anlage unterdrücken
+    """
+
+    def __init__(
+        self,
+        client: JtlWawiClient,
+        journal_path: str = "order_journal.sqlite",
+        max_workers: int = 8,
+        disable_workflows: bool = False
+    ):
+        self.client = client
+        self.journal_path = journal_path
+        self.max_workers = max_workers
+        self.disable_workflows = disable_workflows
+
+        self._db = sqlite3.connect(journal_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()  # Journal wird aus den Worker-Threads beschrieben
+
+    def __enter__(self) -> "OrderImporter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Schließt das Journal"""
+        self._db.close()
+
+    # ==================== Journal ====================
+
+    def _journal(self, number: str, status: str, **fields) -> None:
+        """Schreibt den Status eines Auftrags (Insert oder Update)"""
+        columns = {"status": status, "updated_at": datetime.now().isoformat(), **fields}
+        names = ", ".join(columns)
+        updates = ", ".join(f"{name} = excluded.{name}" for name in columns)
+        with self._db_lock, self._db:
+            self._db.execute(
+                f"INSERT INTO orders (external_number, {names}) VALUES (?, {', '.join('?' * len(columns))}) "
+                f"ON CONFLICT (external_number) DO UPDATE SET {updates}",
+                (number, *columns.values())
+            )
+
+    def _state(self, number: str) -> Tuple[Optional[str], Optional[int]]:
+        """Status und Auftrags-Id aus dem Journal"""
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT status, order_id FROM orders WHERE external_number = ?", (number,)
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def summary(self) -> Dict[str, int]:
+        """Anzahl der Aufträge je Status im Journal"""
+        with self._db_lock:
+            return dict(self._db.execute("SELECT status, COUNT(*) FROM orders GROUP BY status").fetchall())
+
+    def errors(self, limit: int = 100) -> List[Tuple[str, str, Optional[int], str]]:
+        """Ungültige und fehlgeschlagene Aufträge: (ExternalNumber, Status, Zeile, Fehler)"""
+        with self._db_lock:
+            return self._db.execute(
+                "SELECT external_number, status, source_line, error FROM orders "
+                "WHERE status IN (?, ?) ORDER BY source_line LIMIT ?",
+                (_INVALID, _FAILED, limit)
+            ).fetchall()
+
+    # ==================== Ablauf ====================
+
+    def import_file(self, path: str) -> ImportResult:
+        """Importiert eine JSONL- oder CSV-Datei"""
+        return self.run(read_orders(path))
+
+    def run(self, orders: Iterable[Tuple[int, Dict[str, Any]]]) -> ImportResult:
+        """
+        Importiert Aufträge mit begrenzter Parallelität.
+
+        Die Eingabe wird nur so weit gelesen, wie Worker frei sind. Fertige
+        Aufträge aus früheren Läufen werden ohne Anfrage übersprungen.
+
+        Args:
+            orders: (Zeilennummer, Auftrag), z.B. aus read_orders()
+        """
+        result = ImportResult()
+        with self._db_lock:
+            done = {number for (number,) in self._db.execute(
+                "SELECT external_number FROM orders WHERE status = ?", (_DONE,)
+            )}
+        seen = set()
+        in_flight: deque = deque()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for line_no, order in orders:
+                if PARSE_ERROR in order:
+                    # Ohne ExternalNumber unter der Zeilennummer im Journal
+                    result.invalid += 1
+                    self._journal(f"<Zeile {line_no}>", _INVALID, source_line=line_no, error=order[PARSE_ERROR])
+                    continue
+                number = str(order.get("ExternalNumber") or "").strip()
+                if number in done:
+                    result.skipped += 1
+                    continue
+                if number and number in seen:
+                    result.duplicates += 1
+                    continue
+                seen.add(number)
+
+                errors = validate_order(order)
+                if errors:
+                    result.invalid += 1
+                    if number:
+                        self._journal(number, _INVALID, source_line=line_no, error="; ".join(errors))
+                    continue
+
+                if len(in_flight) >= 2 * self.max_workers:
+                    self._collect(in_flight.popleft().result(), result)
+                in_flight.append(executor.submit(self._import_order, number, order, line_no))
+
+            while in_flight:
+                self._collect(in_flight.popleft().result(), result)
+        return result
+
+    @staticmethod
+    def _collect(outcome: str, result: ImportResult) -> None:
+        setattr(result, outcome, getattr(result, outcome) + 1)
+
+    def _import_order(self, number: str, order: Dict[str, Any], line_no: int) -> str:
+        """Legt einen Auftrag samt Positionen an (läuft im Worker); liefert das Zählerfeld"""
+        line_items = order.get("LineItems") or []
+        status, order_id = self._state(number)
+        recovered = False
+
+        # Ausgang der Auftragsanlage nach Abbruch unklar: beim Server nachsehen
+        if status == _SENDING:
+            try:
+                order_id = self._find_order(number)
+            except ApiError as e:
+                # Auch bei 4xx bleibt "sending": failed nur nach abgelehntem POST /salesOrders
+                self._note_error(number, e.response.error)
+                return "failed"
+            recovered = order_id is not None
+            status = _CREATED if recovered else None
+            if recovered:
+                self._journal(number, _CREATED, order_id=order_id)
+
+        if order_id is None:
+            self._journal(number, _SENDING, source_line=line_no, line_items=len(line_items), error=None)
+            payload = {key: value for key, value in order.items() if key != "LineItems"}
+            params = {"disableAutomaticWorkflows": "true"} if self.disable_workflows else None
+            response = self.client._request("POST", "/salesOrders", data=payload, params=params)
+            if not response.success:
+                return self._fail(number, response)
+            order_id = (response.data or {}).get("Id")
+            self._journal(number, _CREATED, order_id=order_id)
+            status = _CREATED
+
+        # Ausgang der Positionsanlage nach Abbruch unklar: vorhandene Positionen zählen
+        if status == _ITEMS_SENDING:
+            existing = self._count_line_items(order_id)
+            if existing is None:
+                # status_code 0: Status bleibt "items_sending", der nächste Lauf prüft erneut
+                return self._fail(number, ApiResponse(success=False, error="Positionen nicht prüfbar"), order_id)
+            if existing >= len(line_items):
+                self._journal(number, _DONE, error=None)
+                return "recovered"
+            if existing:
+                return self._fail(number, ApiResponse(
+                    success=False,
+                    error=f"Auftrag {order_id} hat {existing} von {len(line_items)} Positionen, bitte manuell prüfen"
+                ), order_id)
+
+        if line_items:
+            self._journal(number, _ITEMS_SENDING)
+            response = self.client._request("POST", f"/salesOrders/{order_id}/lineitems", data=line_items)
+            if not response.success:
+                return self._fail(number, response, order_id)
+
+        self._journal(number, _DONE, error=None)
+        return "recovered" if recovered else "created"
+
+    def _fail(self, number: str, response: ApiResponse, order_id: Optional[int] = None) -> str:
+        """
+        Hält einen Fehler fest.
+
+        Ist der Ausgang unklar (Verbindungsfehler, Timeout, 408, 429, 5xx),
+        bleibt der Status "sending" bzw. "items_sending" stehen, damit der
+        nächste Lauf beim Server nachsieht, statt erneut anzulegen. Bei einer
+        Ablehnung (übrige 4xx) wird der Auftrag "failed"; ein angelegter
+        Auftrag bleibt "created" und erhält beim nächsten Lauf nur die Positionen.
+        """
+        if not response.outcome_unknown:
+            status = _CREATED if order_id is not None else _FAILED
+            self._journal(number, status, error=response.error)
+        else:
+            self._note_error(number, response.error)
+        return "failed"
+
+    def _note_error(self, number: str, error: Optional[str]) -> None:
+        """Hält nur die Fehlermeldung fest, der Status bleibt unverändert"""
+        with self._db_lock, self._db:
+            self._db.execute("UPDATE orders SET error = ? WHERE external_number = ?", (error, number))
+
+    def _find_order(self, number: str) -> Optional[int]:
+        """
+        Sucht einen Auftrag über die externe Auftragsnummer.
+
+        Returns:
+            Auftrags-Id oder None, wenn der Auftrag nicht existiert
+
+        Raises:
+            ApiError: Wenn die Suche fehlschlägt (Ausgang bleibt unklar)
+        """
+        response = self.client._request(
+            "GET", "/salesOrders", params={"externalOrderNumber": number, "pageSize": 10}
+        )
+        if not response.success:
+            raise ApiError(response)
+        for order in (response.data or {}).get("Items", []):
+            if order.get("ExternalNumber") == number:
+                return order.get("Id")
+        return None
+
+    def _count_line_items(self, order_id: int) -> Optional[int]:
+        """Anzahl vorhandener Positionen eines Auftrags (None bei Fehler)"""
+        response = self.client._request("GET", f"/salesOrders/{order_id}/lineitems")
+        return len(response.data or []) if response.success else None
+
+
+# ==================== Beispiele ====================
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        print("Verwendung: python order_import.py <datei.jsonl|datei.csv>")
+        exit(1)
+
+    try:
+        client = JtlWawiClient(pool_maxsize=8)
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        print("Setzen Sie die Umgebungsvariable JTL_API_KEY oder übergeben Sie den API-Key.")
+        exit(1)
+
+    with client, OrderImporter(client, max_workers=8) as importer:
+        started = time.monotonic()
+        result = importer.import_file(sys.argv[1])
+        print(f"{result} in {time.monotonic() - started:.1f} s")
+        print(f"Journal: {importer.summary()}")
+        for number, status, line_no, error in importer.errors(limit=20):
+            print(f"  Zeile {line_no}: {number} ({status}): {error}")
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi Picklisten-Ausführung (WMS)
+
+Pickt ganze Picklisten bzw. Pickwellen parallel statt Position für Position.
+
+- Positionen laufen in Spuren (Lanes): Innerhalb einer Spur strikt in der
+  Eingabereihenfolge, Spuren untereinander parallel (``max_workers``).
+  Standard ist eine Spur je Position (z.B. mehrere Teilpicks mit
+  verschiedenen Chargen). ``order_by="location"`` legt alle Positionen mit
+  gleichem Lagerplatz und Artikel in eine Spur, falls gleichzeitige Picks
+  auf denselben Platz beim Server Konflikte erzeugen.
+- Picks werden vom Client nie automatisch wiederholt. Ist der Ausgang unklar
+  (Verbindungsfehler, 408, 429, 5xx), prüft der Executor erst den
+  Positionsstatus (``GET /wms/{warehouseId}/picklists/{picklistId}``); erneut
+  gepickt wird nur bei den Status der RetryPolicy und wenn die Position noch
+  nicht gepickt ist. Eine unklare Umreservierung wird nur wiederholt, wenn die
+  Position nachweislich unverändert ist.
+- Schlägt ein Pick mit 400/409 fehl und sind für die Aufgabe
+  Ausweich-Lagerplätze angegeben, wird die Reservierung über
+  ``changeReservation`` umgebucht (bei PartialReserved/NothingReserved mit
+  Backoff erneut versucht) und die aktualisierten Positionen werden gepickt.
+- ``on_progress`` erhält nach jeder Position den Zwischenstand.
+
+Verwendung:
+    from api_client import JtlWawiClient
+    from picking import PicklistExecutor
+
+    with JtlWawiClient(pool_maxsize=8) as client:
+        executor = PicklistExecutor(client, max_workers=8, on_progress=print)
+        result = executor.run_picklists(warehouse_id=1, picklist_ids=[1201, 1202, 1203])
+        print(result)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Iterable, Callable, Hashable, Tuple
+
+from api_client import JtlWawiClient, ApiResponse, ApiError, RetryPolicy
+
+# PickListStatus laut Spezifikation
+STATUS_CREATED, STATUS_IN_PROGRESS, STATUS_PICKED = 10, 11, 20
+
+# ChangeReservationError laut Spezifikation
+RESERVATION_OK, RESERVATION_UNKNOWN, RESERVATION_PARTIAL, RESERVATION_NOTHING = 0, 1, 2, 3
+
+# Ergebnis je Aufgabe
+PICKED = "picked"
+ALREADY_PICKED = "already_picked"  # war schon gepickt (z.B. nach Verbindungsabbruch)
+PARTIAL = "partial"  # nach Umreservierung nur teilweise reserviert und gepickt
+FAILED = "failed"
+
+
+@dataclass
+class PickTask:
+    """Ein Pick einer Picklisten-Position"""
+    warehouse_id: int
+    picklist_id: int
+    position_id: int
+    quantity: float
+    item_id: Optional[int] = None
+    storage_location_id: Optional[int] = None
+    batch_number: Optional[str] = None
+    shelf_life_expiration_date: Optional[str] = None
+    serial_numbers: Optional[List[str]] = None
+    alternative_locations: Optional[List[int]] = None  # Lagerplätze für changeReservation bei Konflikt
+
+    @classmethod
+    def from_position(cls, position: Dict[str, Any], **overrides) -> "PickTask":
+        """Erzeugt die Aufgabe aus einer PickListPosition (ganze Menge)"""
+        values = dict(
+            warehouse_id=position["WarehouseId"],
+            picklist_id=position["PicklistId"],
+            position_id=position["Id"],
+            quantity=position["Quantity"],
+            item_id=position.get("ItemId"),
+            storage_location_id=position.get("StorageLocationId"),
+        )
+        values.update(overrides)
+        return cls(**values)
+
+
+@dataclass
+class PickOutcome:
+    """Ergebnis einer Aufgabe"""
+    task: PickTask
+    status: str  # picked | already_picked | partial | failed
+    position_ids: List[int] = field(default_factory=list)  # tatsächlich gepickte Positionen
+    attempts: int = 0
+    rereserved: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class WaveProgress:
+    """Zwischenstand einer Welle"""
+    total: int
+    done: int
+    picked: int
+    failed: int
+    retries: int
+    elapsed: float
+    per_second: float
+
+
+@dataclass
+class WaveResult:
+    """Ergebnis einer Welle"""
+    total: int = 0
+    picked: int = 0
+    already_picked: int = 0
+    partial: int = 0
+    rereserved: int = 0
+    failed: int = 0
+    retries: int = 0  # wiederholte Picks und Umreservierungen
+    seconds: float = 0.0
+    failures: List[PickOutcome] = field(default_factory=list)
+
+
+def _error_text(response: ApiResponse) -> str:
+    return f"HTTP {response.status_code}: {response.error}" if response.error else f"HTTP {response.status_code}"
+
+
+class PicklistExecutor:
+    """
+    Führt Picks vieler Positionen parallel aus
+
+    Attributes:
+        client: Der JtlWawiClient (``pool_maxsize`` mindestens ``max_workers``)
+        max_workers: Parallel laufende Spuren; klein halten, der Server bucht jede Position einzeln
+        order_by: "position" (Spur je Position) oder "location" (Spur je Lagerplatz + Artikel)
+        max_attempts: Versuche je Pick bei Verbindungsfehlern, 429 und 5xx
+        reservation_attempts: Versuche für changeReservation bei Konflikten
+        retry: Wartezeiten zwischen den Versuchen (Full Jitter)
+        on_progress: Wird nach jeder Position mit dem Zwischenstand aufgerufen
+    """
+
+    def __init__(
+        self,
+        client: JtlWawiClient,
+        max_workers: int = 8,
+        order_by: str = "position",
+        max_attempts: int = 4,
+        reservation_attempts: int = 3,
+        retry: Optional[RetryPolicy] = None,
+        on_progress: Optional[Callable[[WaveProgress], None]] = None
+    ):
+        if order_by not in ("position", "location"):
+            raise ValueError(f"order_by muss 'position' oder 'location' sein, nicht {order_by!r}")
+        self.client = client
+        self.max_workers = max_workers
+        self.order_by = order_by
+        self.max_attempts = max_attempts
+        self.reservation_attempts = reservation_attempts
+        self.retry = retry or RetryPolicy()
+        self.on_progress = on_progress
+
+        self._lock = threading.Lock()
+        self._result = WaveResult()
+        self._started = 0.0
+        self._done = 0
+
+    # ==================== Aufgaben ====================
+
+    def load_tasks(self, warehouse_id: int, picklist_ids: Iterable[int]) -> Tuple[List[PickTask], int]:
+        """
+        Lädt die offenen Positionen mehrerer Picklisten parallel.
+
+        Returns:
+            (Aufgaben in Reihenfolge der Picklisten, Anzahl bereits gepickter Positionen)
+
+        Raises:
+            ApiError: Wenn eine Pickliste nicht abgerufen werden kann
+        """
+        picklist_ids = list(picklist_ids)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(picklist_ids)))) as executor:
+            responses = list(executor.map(
+                lambda picklist_id: self.client.get_picklist_positions(warehouse_id, picklist_id), picklist_ids
+            ))
+
+        tasks, already_picked = [], 0
+        for response in responses:
+            if not response.success:
+                raise ApiError(response)
+            for position in response.data or []:
+                if (position.get("Status") or 0) >= STATUS_PICKED:
+                    already_picked += 1
+                else:
+                    tasks.append(PickTask.from_position(position))
+        return tasks, already_picked
+
+    def _lane_key(self, task: PickTask) -> Hashable:
+        if self.order_by == "location" and task.storage_location_id is not None:
+            return ("location", task.warehouse_id, task.storage_location_id, task.item_id)
+        return ("position", task.warehouse_id, task.picklist_id, task.position_id)
+
+    # ==================== Ausführung ====================
+
+    def run_picklists(self, warehouse_id: int, picklist_ids: Iterable[int]) -> WaveResult:
+        """Pickt alle offenen Positionen der Picklisten"""
+        tasks, already_picked = self.load_tasks(warehouse_id, picklist_ids)
+        result = self.run(tasks)
+        result.total += already_picked
+        result.already_picked += already_picked
+        return result
+
+    def run(self, tasks: Iterable[PickTask]) -> WaveResult:
+        """
+        Führt die Aufgaben aus; Reihenfolge bleibt je Spur erhalten.
+
+        Returns:
+            WaveResult mit allen Fehlschlägen in ``failures``
+        """
+        lanes: Dict[Hashable, List[PickTask]] = {}
+        for task in tasks:
+            lanes.setdefault(self._lane_key(task), []).append(task)
+
+        with self._lock:
+            self._result = WaveResult(total=sum(len(lane) for lane in lanes.values()))
+            self._started = time.monotonic()
+            self._done = 0
+
+        # Lange Spuren zuerst, damit sie nicht am Ende allein laufen
+        ordered = sorted(lanes.values(), key=len, reverse=True)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for _ in executor.map(self._run_lane, ordered):
+                pass
+
+        with self._lock:
+            result = self._result
+            result.seconds = round(time.monotonic() - self._started, 3)
+        return result
+
+    def _run_lane(self, tasks: List[PickTask]) -> None:
+        for task in tasks:
+            try:
+                outcome = self._execute(task)
+            except Exception as e:  # eine Position darf die Welle nicht abbrechen
+                outcome = PickOutcome(task, FAILED, error=f"{type(e).__name__}: {e}")
+            self._record(outcome)
+
+    def _record(self, outcome: PickOutcome) -> None:
+        with self._lock:
+            result = self._result
+            if outcome.status == PICKED:
+                result.picked += 1
+            elif outcome.status == ALREADY_PICKED:
+                result.already_picked += 1
+            elif outcome.status == PARTIAL:
+                result.partial += 1
+            else:
+                result.failed += 1
+            if outcome.status != PICKED and outcome.status != ALREADY_PICKED:
+                result.failures.append(outcome)
+            result.rereserved += outcome.rereserved
+            result.retries += max(0, outcome.attempts - 1)
+            self._done += 1
+            elapsed = time.monotonic() - self._started
+            progress = WaveProgress(
+                total=result.total,
+                done=self._done,
+                picked=result.picked + result.partial,
+                failed=result.failed,
+                retries=result.retries,
+                elapsed=round(elapsed, 2),
+                per_second=round(self._done / elapsed, 1) if elapsed else 0.0
+            )
+        if self.on_progress:
+            self.on_progress(progress)
+
+    def _execute(self, task: PickTask, allow_rereserve: bool = True) -> PickOutcome:
+        """Ein Pick inkl. Statusprüfung vor Wiederholungen und Umreservierung"""
+        outcome = PickOutcome(task, FAILED)
+        while True:
+            outcome.attempts += 1
+            response = self.client.pick_position(
+                task.warehouse_id, task.picklist_id, task.position_id, task.quantity,
+                task.batch_number, task.shelf_life_expiration_date, task.serial_numbers
+            )
+            if response.success:
+                outcome.status = PICKED
+                outcome.position_ids.append(task.position_id)
+                return outcome
+
+            outcome.error = _error_text(response)
+            if response.outcome_unknown:
+                # Unklar, ob der Pick angekommen ist (auch 408/500): erst nachsehen
+                status = self._position_status(task)
+                if status is not None and status >= STATUS_PICKED:
+                    outcome.status = ALREADY_PICKED
+                    outcome.position_ids.append(task.position_id)
+                    return outcome
+                if status is None:
+                    outcome.error += " (Ausgang unklar, Positionsstatus nicht abrufbar)"
+                # Erneut gesendet wird nur bei den Status der RetryPolicy
+                if response.status_code not in self.retry.retry_statuses or outcome.attempts >= self.max_attempts:
+                    return outcome
+                time.sleep(self.retry.delay(outcome.attempts))
+                continue
+
+            if response.status_code in (400, 409) and allow_rereserve and task.alternative_locations:
+                return self._rereserve_and_pick(task, outcome)
+            return outcome
+
+    def _position(self, task: PickTask) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """(Abruf erfolgreich, Picklisten-Position der Aufgabe oder None)"""
+        response = self.client.get_picklist_positions(task.warehouse_id, task.picklist_id)
+        if not response.success:
+            return False, None
+        for position in response.data or []:
+            if position.get("Id") == task.position_id:
+                return True, position
+        return True, None
+
+    def _position_status(self, task: PickTask) -> Optional[int]:
+        _, position = self._position(task)
+        return position.get("Status") if position else None
+
+    def _reservation_unchanged(self, task: PickTask) -> bool:
+        """
+        True, wenn eine Umreservierung sicher nicht ausgeführt wurde: Die Position
+        besteht noch ungepickt, liegt auf keinem Ausweich-Lagerplatz und hat
+        noch mindestens die Menge der Aufgabe.
+        """
+        found, position = self._position(task)
+        if not found or position is None:
+            return False
+        return (
+            (position.get("Status") or 0) < STATUS_PICKED
+            and position.get("StorageLocationId") not in (task.alternative_locations or [])
+            and (position.get("Quantity") or 0) >= task.quantity
+        )
+
+    def _rereserve_and_pick(self, task: PickTask, outcome: PickOutcome) -> PickOutcome:
+        """Bucht die Reservierung auf die Ausweich-Lagerplätze um und pickt die neuen Positionen"""
+        updated: List[Dict[str, Any]] = []
+        partial = False
+        for attempt in range(1, self.reservation_attempts + 1):
+            outcome.attempts += 1
+            response = self.client.change_reservation(
+                task.warehouse_id, task.picklist_id, task.position_id, task.alternative_locations
+            )
+            if response.success:
+                error = (response.data or {}).get("Error") or RESERVATION_OK
+                updated = (response.data or {}).get("UpdatedPositions") or []
+                if error == RESERVATION_OK and updated:
+                    break
+                if error == RESERVATION_PARTIAL and updated and attempt == self.reservation_attempts:
+                    partial = True
+                    break
+                outcome.error = f"changeReservation: Error {error}"
+            else:
+                outcome.error = f"changeReservation: {_error_text(response)}"
+                if response.outcome_unknown and not self._reservation_unchanged(task):
+                    # Umbuchung evtl. ausgeführt, die neuen Positionen sind aber unbekannt
+                    outcome.error += " (Ausgang unklar, Reservierung bitte prüfen)"
+                    return outcome
+                if response.status_code not in self.retry.retry_statuses and response.status_code != 409:
+                    return outcome
+            updated = []
+            if attempt < self.reservation_attempts:
+                time.sleep(self.retry.delay(attempt))
+
+        if not updated:
+            return outcome
+        outcome.rereserved = True
+
+        serials = list(task.serial_numbers or [])
+        for position in updated:
+            count = int(position.get("Quantity") or 0)
+            sub = PickTask.from_position(
+                position,
+                batch_number=task.batch_number,
+                shelf_life_expiration_date=task.shelf_life_expiration_date,
+                serial_numbers=serials[:count] if serials else None
+            )
+            serials = serials[count:]
+            result = self._execute(sub, allow_rereserve=False)
+            outcome.attempts += result.attempts
+            if result.status not in (PICKED, ALREADY_PICKED):
+                outcome.error = f"Position {sub.position_id}: {result.error}"
+                return outcome
+            outcome.position_ids.append(sub.position_id)
+
+        outcome.status = PARTIAL if partial else PICKED
+        if not partial:
+            outcome.error = None
+        return outcome
+
+
+# ==================== Beispiele ====================
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 3:
+        print("Verwendung: python picking.py <lager-id> <picklisten-id> [<picklisten-id> ...]")
+        exit(1)
+
+    try:
+        client = JtlWawiClient(pool_maxsize=8)
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        print("Setzen Sie die Umgebungsvariable JTL_API_KEY oder übergeben Sie den API-Key.")
+        exit(1)
+
+    def report(progress: WaveProgress) -> None:
+        print(f"  {progress.done}/{progress.total} Positionen, {progress.failed} Fehler, "
+              f"{progress.per_second:.0f}/s", end="\r")
+
+    with client:
+        executor = PicklistExecutor(client, max_workers=8, on_progress=report)
+        result = executor.run_picklists(int(sys.argv[1]), [int(value) for value in sys.argv[2:]])
+        print()
+        print(result)
+        for failure in result.failures[:20]:
+            print(f"  Position {failure.task.position_id} ({failure.status}): {failure.error}")
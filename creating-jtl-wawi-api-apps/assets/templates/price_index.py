@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi Preisindex
+
+Ermittelt den effektiven Nettopreis eines Artikels für Kunde, Kundengruppe,
+Verkaufskanal und Menge lokal aus dem Speicher statt über drei Anfragen je
+Artikel und Angebot.
+
+Geladen werden je Artikel:
+- der Standardpreis (``ItemPriceData.SalesPriceNet`` aus /items)
+- Kundenpreise (``/items/{id}/customerPrices``)
+- Kundengruppen-/Verkaufskanal-Preise (``/items/{id}/salesChannelPrices``)
+- Sonderpreise (``/items/{id}/specialprices``)
+
+Die API bietet diese Tabellen nur je Artikel an. Der erste ``load()`` fragt
+deshalb alle Artikel parallel ab; danach lädt ``refresh()`` nur die
+Artikel neu, die ``/items?changedSince=`` als geändert meldet.
+
+Preisfindung (``resolve``):
+1. Kundenpreis des Kunden, sonst Preis für (Verkaufskanal, Kundengruppe),
+   sonst Standardpreis. Bei Staffeln gilt die höchste ``FromQuantity`` bis
+   zur angefragten Menge. Staffeln ohne ``NetPrice`` reduzieren den
+   Standardpreis um ``ReduceStandardPriceByPercent``.
+2. Ein gültiger Sonderpreis für (Verkaufskanal, Kundengruppe) ersetzt das
+   Ergebnis, wenn er günstiger ist (aktiv, im Zeitraum, ggf. Mindestbestand).
+
+Verwendung:
+    from api_client import JtlWawiClient
+    from price_index import PriceIndex
+
+    with JtlWawiClient(pool_maxsize=16) as client:
+        prices = PriceIndex(client, max_workers=16)
+        prices.load()
+
+        price = prices.resolve(item_id=42, customer_group_id=1, sales_channel_id="1-1-1",
+                               quantity=10, customer_id=1001)
+        print(price.net_price, price.source)
+
+        prices.refresh()  # z.B. alle 5 Minuten
+"""
+
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+
+from api_client import JtlWawiClient, ApiError
+
+# Preisquellen in PriceResult.source
+CUSTOMER, SALES_CHANNEL, STANDARD, SPECIAL = "customer", "sales_channel", "standard", "special"
+
+
+@dataclass
+class PriceResult:
+    """Effektiver Nettopreis einer Position"""
+    net_price: float
+    source: str  # customer | sales_channel | standard | special
+    from_quantity: int = 0  # Staffelgrenze, aus der der Preis stammt
+
+
+@dataclass
+class PriceIndexStats:
+    """Umfang und Stand des Index"""
+    items: int = 0
+    customer_prices: int = 0
+    sales_channel_prices: int = 0
+    special_prices: int = 0
+    watermark: Optional[str] = None  # höchster Changed-Zeitstempel der Artikel
+    failed: int = 0  # Artikel, deren Preise beim letzten Laden fehlten (nächstes refresh())
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parst einen ISO-Zeitstempel der API als lokale Zeit ohne Zeitzone"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+class _Tiers:
+    """Staffelpreise, nach FromQuantity sortiert (bisect statt Schleife)"""
+
+    __slots__ = ("quantities", "prices")
+
+    def __init__(self, rows: Iterable[Dict[str, Any]]):
+        by_quantity = {}
+        for row in rows:
+            by_quantity[row.get("FromQuantity") or 0] = (row.get("NetPrice"), row.get("ReduceStandardPriceByPercent"))
+        self.quantities = sorted(by_quantity)
+        self.prices = [by_quantity[quantity] for quantity in self.quantities]
+
+    def lookup(self, quantity: float, standard: float) -> Optional[Tuple[float, int]]:
+        index = bisect_right(self.quantities, quantity) - 1
+        if index < 0:
+            return None
+        net_price, reduce_percent = self.prices[index]
+        if net_price is None:  # 0.0 ist ein gültiger Preis (Gratisartikel)
+            net_price = standard * (1 - (reduce_percent or 0) / 100)
+        return net_price, self.quantities[index]
+
+
+class _ItemPrices:
+    """Alle Preise eines Artikels (wird bei Änderungen als Ganzes ersetzt)"""
+
+    __slots__ = ("standard", "customers", "channels", "special", "special_from", "special_until",
+                 "special_min_stock")
+
+    def __init__(self, standard: float, customer_rows: List[Dict[str, Any]],
+                 channel_rows: List[Dict[str, Any]], special: Optional[Dict[str, Any]]):
+        self.standard = standard
+
+        grouped: Dict[Any, List[Dict[str, Any]]] = {}
+        for row in customer_rows:
+            grouped.setdefault(row.get("CustomerId"), []).append(row)
+        self.customers = {key: _Tiers(rows) for key, rows in grouped.items()}
+
+        grouped = {}
+        for row in channel_rows:
+            grouped.setdefault((row.get("SalesChannelId"), row.get("CustomerGroupId")), []).append(row)
+        self.channels = {key: _Tiers(rows) for key, rows in grouped.items()}
+
+        self.special: Dict[Tuple[Any, Any], float] = {}
+        self.special_from = self.special_until = None
+        self.special_min_stock = None
+        if special and special.get("IsActive"):
+            self.special = {
+                (entry.get("SalesChannelId"), entry.get("CustomerGroupId")): entry["NetPrice"]
+                for entry in special.get("SpecialPrice") or []
+                if entry.get("IsActive") and entry.get("NetPrice") is not None
+            }
+            self.special_from = _parse_timestamp(special.get("StartDate"))
+            if special.get("EndDateActive"):
+                self.special_until = _parse_timestamp(special.get("EndDate"))
+            if special.get("TillAmountActive"):
+                self.special_min_stock = special.get("TillAmountInStockSmallerThan")
+
+    def special_price(self, key: Tuple[Any, Any], at: datetime, stock: Optional[float]) -> Optional[float]:
+        price = self.special.get(key)
+        if price is None:
+            return None
+        if self.special_from and at < self.special_from:
+            return None
+        if self.special_until and at > self.special_until:
+            return None
+        # Sonderpreis endet, sobald der Bestand unter die Grenze fällt (nur prüfbar mit Bestand)
+        if self.special_min_stock is not None and stock is not None and stock < self.special_min_stock:
+            return None
+        return price
+
+
+class PriceIndex:
+    """
+    Preisindex im Speicher mit inkrementeller Aktualisierung
+
+    Lesezugriffe (``resolve``) sind lock-frei; Aktualisierungen ersetzen die
+    Preise eines Artikels als Ganzes.
+
+    Attributes:
+        client: Der JtlWawiClient für Abrufe
+        max_workers: Parallel geladene Artikel (Pool des Clients entsprechend groß wählen)
+        overlap: Überlappung beim Delta-Abruf gegen Uhrenabweichungen
+        page_size: Seitengröße beim Artikel-Abzug
+    """
+
+    def __init__(
+        self,
+        client: JtlWawiClient,
+        max_workers: int = 16,
+        overlap: timedelta = timedelta(minutes=2),
+        page_size: int = 500
+    ):
+        self.client = client
+        self.max_workers = max_workers
+        self.overlap = overlap
+        self.page_size = page_size
+
+        self._items: Dict[int, _ItemPrices] = {}
+        self._watermark: Optional[datetime] = None
+        self._failed: Dict[int, float] = {}  # Artikel-Id -> Standardpreis
+        self._write_lock = threading.Lock()
+
+    # ==================== Laden ====================
+
+    def load(self, item_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Lädt die Preise aller (oder der angegebenen) Artikel.
+
+        Returns:
+            Anzahl geladener Artikel
+
+        Raises:
+            ApiError: Wenn der Artikel-Abzug fehlschlägt
+        """
+        if item_ids is None:
+            standards = self._scan_items({})
+        else:
+            standards = {}
+            for item_id in item_ids:
+                response = self.client._request("GET", f"/items/{item_id}")
+                if not response.success:
+                    raise ApiError(response)
+                standards[item_id] = (response.data.get("ItemPriceData") or {}).get("SalesPriceNet") or 0.0
+        return self._load_prices(standards)
+
+    def refresh(self) -> int:
+        """
+        Lädt nur die seit dem letzten Lauf geänderten Artikel neu
+        (``/items?changedSince=``) sowie zuvor fehlgeschlagene.
+
+        Returns:
+            Anzahl neu geladener Artikel
+        """
+        if self._watermark is None:
+            return self.load()
+        since = (self._watermark - self.overlap).isoformat()
+        standards = self._scan_items({"changedSince": since})
+        for item_id, standard in list(self._failed.items()):
+            standards.setdefault(item_id, standard)
+        return self._load_prices(standards)
+
+    def refresh_items(self, item_ids: Iterable[int]) -> int:
+        """Lädt die Preise bestimmter Artikel neu, z.B. nach eigenen Preisänderungen"""
+        return self.load(item_ids)
+
+    def _scan_items(self, params: Dict[str, Any]) -> Dict[int, float]:
+        """Artikel-Ids mit Standardpreis; schiebt den Watermark auf den höchsten Changed-Wert"""
+        standards: Dict[int, float] = {}
+        high_water = self._watermark
+        for item in self.client.paginate("/items", params, self.page_size):
+            standards[item["Id"]] = (item.get("ItemPriceData") or {}).get("SalesPriceNet") or 0.0
+            changed = _parse_timestamp(item.get("Changed"))
+            if changed and (high_water is None or changed > high_water):
+                high_water = changed
+        self._watermark = high_water
+        return standards
+
+    def _fetch(self, item_id: int, standard: float) -> Tuple[int, Optional[_ItemPrices], bool]:
+        """Lädt die drei Preistabellen eines Artikels; liefert (Id, Preise, Erfolg)"""
+        responses = [
+            self.client._request("GET", f"/items/{item_id}/{table}")
+            for table in ("customerPrices", "salesChannelPrices", "specialprices")
+        ]
+        if any(response.status_code == 404 for response in responses[:2]):
+            return item_id, None, True  # Artikel gelöscht
+        if not all(response.success or response.status_code == 404 for response in responses):
+            return item_id, None, False
+        customer, channel, special = responses
+        return item_id, _ItemPrices(
+            standard,
+            customer.data or [],
+            channel.data or [],
+            special.data if special.success else None
+        ), True
+
+    def _load_prices(self, standards: Dict[int, float]) -> int:
+        if not standards:
+            return 0
+        loaded = 0
+        with self._write_lock, ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(lambda entry: self._fetch(*entry), standards.items())
+            for item_id, prices, ok in results:
+                if not ok:
+                    self._failed[item_id] = standards[item_id]
+                    continue
+                self._failed.pop(item_id, None)
+                if prices is None:
+                    self._items.pop(item_id, None)
+                else:
+                    self._items[item_id] = prices
+                    loaded += 1
+        return loaded
+
+    # ==================== Preisfindung ====================
+
+    def resolve(
+        self,
+        item_id: int,
+        customer_group_id: Optional[int] = None,
+        sales_channel_id: Optional[str] = None,
+        quantity: float = 1,
+        customer_id: Optional[int] = None,
+        stock: Optional[float] = None,
+        at: Optional[datetime] = None
+    ) -> Optional[PriceResult]:
+        """
+        Effektiver Nettopreis aus dem Speicher.
+
+        Args:
+            item_id: Artikel
+            customer_group_id: Kundengruppe des Kunden
+            sales_channel_id: Verkaufskanal (SalesChannelId, z.B. "1-1-1")
+            quantity: Menge der Position (für Staffelpreise)
+            customer_id: Kunde (für Kundenpreise)
+            stock: Aktueller Bestand (für Sonderpreise mit Mindestbestand)
+            at: Zeitpunkt (Standard: jetzt)
+
+        Returns:
+            PriceResult oder None, wenn der Artikel nicht im Index ist
+        """
+        prices = self._items.get(item_id)
+        if prices is None:
+            return None
+
+        standard = prices.standard
+        found = None
+        source = STANDARD
+        if customer_id is not None and customer_id in prices.customers:
+            found = prices.customers[customer_id].lookup(quantity, standard)
+            source = CUSTOMER
+        if found is None:
+            tiers = prices.channels.get((sales_channel_id, customer_group_id))
+            if tiers is not None:
+                found = tiers.lookup(quantity, standard)
+                source = SALES_CHANNEL
+        if found is None:
+            found = (standard, 0)
+            source = STANDARD
+        result = PriceResult(net_price=found[0], source=source, from_quantity=found[1])
+
+        if prices.special:
+            special = prices.special_price((sales_channel_id, customer_group_id), at or datetime.now(), stock)
+            if special is not None and special < result.net_price:
+                return PriceResult(net_price=special, source=SPECIAL)
+        return result
+
+    def resolve_lines(
+        self,
+        lines: Iterable[Dict[str, Any]],
+        customer_group_id: Optional[int] = None,
+        sales_channel_id: Optional[str] = None,
+        customer_id: Optional[int] = None
+    ) -> List[Optional[PriceResult]]:
+        """Preise für Positionen mit ``ItemId`` und ``Quantity`` (gleiche Reihenfolge)"""
+        now = datetime.now()
+        return [
+            self.resolve(line.get("ItemId"), customer_group_id, sales_channel_id,
+                         line.get("Quantity") or 1, customer_id, at=now)
+            for line in lines
+        ]
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._items
+
+    def stats(self) -> PriceIndexStats:
+        items = list(self._items.values())
+        return PriceIndexStats(
+            items=len(items),
+            customer_prices=sum(len(t.quantities) for p in items for t in p.customers.values()),
+            sales_channel_prices=sum(len(t.quantities) for p in items for t in p.channels.values()),
+            special_prices=sum(len(p.special) for p in items),
+            watermark=self._watermark.isoformat() if self._watermark else None,
+            failed=len(self._failed)
+        )
+
+
+# ==================== Beispiele ====================
+
+if __name__ == "__main__":
+    import time
+
+    try:
+        client = JtlWawiClient(pool_maxsize=16)
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        print("Setzen Sie die Umgebungsvariable JTL_API_KEY oder übergeben Sie den API-Key.")
+        exit(1)
+
+    with client:
+        prices = PriceIndex(client, max_workers=16)
+        started = time.perf_counter()
+        prices.load()
+        print(f"Geladen in {time.perf_counter() - started:.1f} s: {prices.stats()}")
+
+        started = time.perf_counter()
+        rounds = 100_000
+        for n in range(rounds):
+            prices.resolve(n % 100 + 1, customer_group_id=1, sales_channel_id="1-1-1", quantity=n % 20 + 1)
+        print(f"resolve: {(time.perf_counter() - started) / rounds * 1e6:.2f} µs je Aufruf")
+
+        started = time.perf_counter()
+        print(f"refresh: {prices.refresh()} Artikel in {time.perf_counter() - started:.2f} s")
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi Stammdaten-Cache
+
+Hält selten geänderte Nachschlagedaten (Steuerklassen, Zahlungs- und
+Versandarten, Lager, Verkaufskanäle, Firmen, Kundengruppen, ...) im Speicher
+und als versionierten Snapshot auf der Festplatte.
+
+- Der erste Prozess lädt alle Datensätze parallel vom Server und schreibt
+  den Snapshot (JSON, atomar ersetzt).
+- Spätere Prozesse starten aus dem Snapshot ohne eine einzige Anfrage.
+  Ist er älter als ``max_age``, wird er trotzdem sofort verwendet und im
+  Hintergrund aktualisiert.
+- Ein Hintergrund-Thread lädt alle ``refresh_interval`` Sekunden neu. Die
+  Versionsnummer des Snapshots steigt nur, wenn sich ein Datensatz
+  tatsächlich geändert hat (SHA-256 des Inhalts).
+- Schlägt ein Abruf fehl, bleibt der letzte Stand des Datensatzes erhalten.
+
+Verwendung:
+    from api_client import JtlWawiClient
+    from reference_data import ReferenceData
+
+    with JtlWawiClient() as client, ReferenceData(client, "reference_data.json") as ref:
+        tax_class = ref.by_id("taxClasses", 1)
+        payment = ref.default("paymentMethods")
+        warehouses = ref.find("warehouses", CompanyId=1)
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Iterable, Callable
+
+from api_client import JtlWawiClient, ApiError
+
+# Version des Dateiformats; Snapshots mit anderem Format werden ignoriert
+SNAPSHOT_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class ReferenceSet:
+    """Beschreibt einen Stammdaten-Endpoint"""
+    name: str
+    endpoint: str
+    paged: bool = False  # PagedList statt Array
+    key: str = "Id"
+
+
+REFERENCE_SETS: Dict[str, ReferenceSet] = {ref.name: ref for ref in (
+    ReferenceSet("taxClasses", "/taxClasses"),
+    ReferenceSet("paymentMethods", "/paymentMethods"),
+    ReferenceSet("shippingMethods", "/shippingMethods"),
+    ReferenceSet("shippingClasses", "/shippingClasses"),
+    ReferenceSet("warehouses", "/warehouses", paged=True),
+    ReferenceSet("salesChannels", "/salesChannels"),
+    ReferenceSet("companies", "/companies"),
+    ReferenceSet("customerGroups", "/customerGroups"),
+    ReferenceSet("customerCategories", "/customerCategories"),
+    ReferenceSet("productGroups", "/productGroups"),
+    ReferenceSet("manufacturers", "/manufacturers"),
+    ReferenceSet("onHoldReasons", "/onHoldReasons"),
+    ReferenceSet("colorCodes", "/colorCodes"),
+    ReferenceSet("availabilities", "/availabilities"),
+)}
+
+
+@dataclass
+class ReferenceStats:
+    """Zustand des Caches"""
+    source: str = "none"  # snapshot | server | none
+    version: int = 0
+    datasets: int = 0
+    records: int = 0
+    oldest_age: Optional[float] = None  # Sekunden seit dem ältesten Abruf
+    refreshes: int = 0
+    failures: int = 0
+    missing: List[str] = field(default_factory=list)  # noch nie erfolgreich geladen
+    last_error: Optional[str] = None
+
+
+class _Dataset:
+    """Stand eines Datensatzes samt Index (Einträge werden nie verändert, nur ersetzt)"""
+
+    __slots__ = ("items", "index", "hash", "fetched_at")
+
+    def __init__(self, items: List[Dict[str, Any]], key: str, digest: str, fetched_at: float):
+        self.items = items
+        self.index = {item.get(key): item for item in items}
+        self.hash = digest
+        self.fetched_at = fetched_at
+
+
+def _digest(items: List[Dict[str, Any]]) -> str:
+    encoded = json.dumps(items, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ReferenceData:
+    """
+    Stammdaten-Cache mit Snapshot-Datei und Aktualisierung im Hintergrund
+
+    Lesezugriffe sind lock-frei: eine Aktualisierung ersetzt den Stand eines
+    Datensatzes als Ganzes. Die gelieferten Einträge nicht verändern.
+
+    Attributes:
+        client: Der JtlWawiClient für Abrufe
+        path: Pfad der Snapshot-Datei
+        sets: Zu ladende Datensätze (Standard: alle aus REFERENCE_SETS)
+        max_age: Ab diesem Alter (Sekunden) wird ein Snapshot beim Laden aktualisiert
+        refresh_interval: Abstand der Hintergrund-Aktualisierung (0 = keine)
+        on_change: Wird nach einer Aktualisierung mit den geänderten Namen aufgerufen
+    """
+
+    def __init__(
+        self,
+        client: JtlWawiClient,
+        path: str = "reference_data.json",
+        sets: Optional[Iterable[str]] = None,
+        max_age: float = 86400,
+        refresh_interval: float = 3600,
+        max_workers: int = 8,
+        on_change: Optional[Callable[[List[str]], None]] = None
+    ):
+        self.client = client
+        self.path = path
+        self.sets = [REFERENCE_SETS[name] for name in (sets or REFERENCE_SETS)]
+        self.max_age = max_age
+        self.refresh_interval = refresh_interval
+        self.max_workers = max_workers
+        self.on_change = on_change
+
+        self._data: Dict[str, _Dataset] = {}
+        self._version = 0
+        self._source = "none"
+        self._refreshes = 0
+        self._failures = 0
+        self._last_error: Optional[str] = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._warmup: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "ReferenceData":
+        self.load()
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Beendet die Hintergrund-Aktualisierung"""
+        self._stop.set()
+        for thread in (self._thread, self._warmup):
+            if thread:
+                thread.join()
+        self._thread = self._warmup = None
+
+    # ==================== Laden ====================
+
+    def load(self) -> str:
+        """
+        Startet aus dem Snapshot oder lädt vom Server, falls keiner passt.
+
+        Ein veralteter oder unvollständiger Snapshot wird sofort verwendet;
+        die Aktualisierung läuft dann im Hintergrund (auch ohne ``start()``).
+
+        Returns:
+            "snapshot" oder "server"
+        """
+        if self._read_snapshot():
+            self._source = "snapshot"
+            if self._stale_sets():
+                self._warmup = threading.Thread(target=self._refresh_quietly, name="reference-data-warmup", daemon=True)
+                self._warmup.start()
+        else:
+            self.refresh()
+            self._source = "server"
+        return self._source
+
+    def _read_snapshot(self) -> bool:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if snapshot.get("format") != SNAPSHOT_FORMAT or snapshot.get("base_url") != self.client.base_url:
+            return False
+
+        data = {}
+        for ref in self.sets:
+            entry = snapshot.get("datasets", {}).get(ref.name)
+            if entry:
+                data[ref.name] = _Dataset(entry["items"], ref.key, entry["hash"], entry["fetched_at"])
+        if not data:
+            return False
+        self._data = data
+        self._version = snapshot.get("version", 0)
+        return True
+
+    def _write_snapshot(self) -> None:
+        """Schreibt den Snapshot atomar (temporäre Datei + Umbenennen)"""
+        data = self._data
+        snapshot = {
+            "format": SNAPSHOT_FORMAT,
+            "version": self._version,
+            "base_url": self.client.base_url,
+            "written_at": time.time(),
+            "datasets": {
+                name: {"fetched_at": dataset.fetched_at, "hash": dataset.hash, "items": dataset.items}
+                for name, dataset in data.items()
+            },
+        }
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporary, self.path)
+
+    def _stale_sets(self) -> List[ReferenceSet]:
+        now = time.time()
+        return [
+            ref for ref in self.sets
+            if ref.name not in self._data or now - self._data[ref.name].fetched_at > self.max_age
+        ]
+
+    # ==================== Aktualisierung ====================
+
+    def _fetch(self, ref: ReferenceSet) -> List[Dict[str, Any]]:
+        if ref.paged:
+            return list(self.client.paginate(ref.endpoint, page_size=500, prefetch=False))
+        response = self.client._request("GET", ref.endpoint)
+        if not response.success:
+            raise ApiError(response)
+        return response.data or []
+
+    def refresh(self, names: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Lädt Datensätze parallel neu und schreibt den Snapshot.
+
+        Args:
+            names: Nur diese Datensätze (Standard: alle)
+
+        Returns:
+            Namen der Datensätze, deren Inhalt sich geändert hat
+        """
+        wanted = set(names) if names is not None else None
+        sets = [ref for ref in self.sets if wanted is None or ref.name in wanted]
+
+        with self._refresh_lock:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(sets) or 1)) as executor:
+                futures = {ref.name: (ref, executor.submit(self._fetch, ref)) for ref in sets}
+
+            fetched_at = time.time()
+            data = dict(self._data)
+            changed = []
+            for name, (ref, future) in futures.items():
+                try:
+                    items = future.result()
+                except Exception as e:
+                    self._failures += 1
+                    self._last_error = f"{name}: {e}"
+                    continue
+                digest = _digest(items)
+                previous = data.get(name)
+                if previous is None or previous.hash != digest:
+                    data[name] = _Dataset(items, ref.key, digest, fetched_at)
+                    changed.append(name)
+                else:
+                    previous.fetched_at = fetched_at
+
+            if changed:
+                self._version += 1
+            self._data = data
+            self._refreshes += 1
+            try:
+                self._write_snapshot()
+            except OSError as e:
+                self._last_error = f"Snapshot: {e}"
+
+        if changed and self.on_change:
+            self.on_change(changed)
+        return changed
+
+    def _refresh_quietly(self, names: Optional[Iterable[str]] = None) -> None:
+        try:
+            self.refresh(names)
+        except Exception as e:  # Hintergrund-Thread darf nicht sterben
+            self._failures += 1
+            self._last_error = str(e)
+
+    def start(self) -> None:
+        """Startet die periodische Aktualisierung im Hintergrund"""
+        if self._thread or not self.refresh_interval:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="reference-data", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            self._refresh_quietly()
+
+    # ==================== Abfragen ====================
+
+    def get(self, name: str) -> List[Dict[str, Any]]:
+        """Alle Einträge eines Datensatzes (leer, solange er nie geladen wurde)"""
+        if name not in REFERENCE_SETS:
+            raise KeyError(f"Unbekannter Stammdaten-Datensatz: {name}")
+        dataset = self._data.get(name)
+        return dataset.items if dataset else []
+
+    def by_id(self, name: str, entity_id: Any) -> Optional[Dict[str, Any]]:
+        """Eintrag anhand seines Schlüssels (meist ``Id``)"""
+        self.get(name)
+        dataset = self._data.get(name)
+        return dataset.index.get(entity_id) if dataset else None
+
+    def find(self, name: str, **fields: Any) -> List[Dict[str, Any]]:
+        """Einträge, deren Felder den angegebenen Werten entsprechen"""
+        return [
+            item for item in self.get(name)
+            if all(item.get(key) == value for key, value in fields.items())
+        ]
+
+    def default(self, name: str) -> Optional[Dict[str, Any]]:
+        """Standard-Eintrag (``IsDefault`` bzw. ``IsStandard``), z.B. bei taxClasses oder customerGroups"""
+        for item in self.get(name):
+            if item.get("IsDefault") or item.get("IsStandard"):
+                return item
+        return None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def stats(self) -> ReferenceStats:
+        data = self._data
+        now = time.time()
+        return ReferenceStats(
+            source=self._source,
+            version=self._version,
+            datasets=len(data),
+            records=sum(len(dataset.items) for dataset in data.values()),
+            oldest_age=round(now - min(d.fetched_at for d in data.values()), 1) if data else None,
+            refreshes=self._refreshes,
+            failures=self._failures,
+            missing=[ref.name for ref in self.sets if ref.name not in data],
+            last_error=self._last_error
+        )
+
+
+# ==================== Beispiele ====================
+
+if __name__ == "__main__":
+    try:
+        client = JtlWawiClient()
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        print("Setzen Sie die Umgebungsvariable JTL_API_KEY oder übergeben Sie den API-Key.")
+        exit(1)
+
+    with client:
+        started = time.perf_counter()
+        ref = ReferenceData(client, refresh_interval=0)
+        source = ref.load()
+        print(f"Geladen aus {source} in {(time.perf_counter() - started) * 1000:.1f} ms")
+        print(ref.stats())
+
+        tax_class = ref.default("taxClasses")
+        print(f"Standard-Steuerklasse: {tax_class.get('Name') if tax_class else '-'}")
+        for company in ref.get("companies"):
+            print(f"  Firma {company.get('Id')}: {company.get('Name')}")
+        ref.close()
@@ -14,6 +14,7 @@ Konfiguration:
     Umgebungsvariablen oder .env-Datei:
     - JTL_API_BASE_URL: z.B. http://localhost:5883
     - JTL_CHALLENGE_CODE: Beliebiger String (max. 30 Zeichen)
+    - JTL_POLL_INTERVAL: Sekunden zwischen den Statusabfragen (Standard: 5)
 """
 
 import os
@@ -27,7 +28,7 @@ from typing import Optional
 # Konfiguration
 BASE_URL = os.getenv("JTL_API_BASE_URL", "http://localhost:5883")
 CHALLENGE_CODE = os.getenv("JTL_CHALLENGE_CODE", "mein-geheimer-code")
-POLL_INTERVAL = 5  # Sekunden
+POLL_INTERVAL = float(os.getenv("JTL_POLL_INTERVAL", "5"))  # Sekunden
 MAX_POLL_ATTEMPTS = 120  # 10 Minuten
 
 # App-Konfiguration (ANPASSEN!)
@@ -179,19 +180,26 @@ def poll_for_approval(registration_id: str) -> RegistrationResult:
     )
 
 
+def format_credentials(base_url: str, api_key: str, granted_scopes: str, app_config: dict = APP_CONFIG) -> str:
+    """Inhalt der Credential-Datei (.env-Format)"""
+    return (
+        f"# JTL-Wawi API Credentials\n"
+        f"# Generiert am: {time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"# WICHTIG: Diese Datei sicher aufbewahren!\n\n"
+        f"JTL_API_BASE_URL={base_url}\n"
+        f"JTL_API_KEY={api_key}\n"
+        f"JTL_APP_ID={app_config['AppId']}\n"
+        f"JTL_APP_VERSION={app_config['Version']}\n"
+        f"JTL_GRANTED_SCOPES={granted_scopes}\n"
+    )
+
+
 def save_api_key(api_key: str, granted_scopes: str):
     """Speichert den API-Key in einer Datei"""
     env_file = ".env.jtl"
 
     with open(env_file, "w") as f:
-        f.write(f"# JTL-Wawi API Credentials\n")
-        f.write(f"# Generiert am: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"# WICHTIG: Diese Datei sicher aufbewahren!\n\n")
-        f.write(f"JTL_API_BASE_URL={BASE_URL}\n")
-        f.write(f"JTL_API_KEY={api_key}\n")
-        f.write(f"JTL_APP_ID={APP_CONFIG['AppId']}\n")
-        f.write(f"JTL_APP_VERSION={APP_CONFIG['Version']}\n")
-        f.write(f"JTL_GRANTED_SCOPES={granted_scopes}\n")
+        f.write(format_credentials(BASE_URL, api_key, granted_scopes))
 
     print(f"\n✓ API-Key gespeichert in: {env_file}")
     print("  WICHTIG: Diese Datei sicher aufbewahren und NICHT committen!")
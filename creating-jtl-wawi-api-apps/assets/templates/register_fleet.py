@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi App-Registrierung für viele Installationen
+
+Registriert dieselbe App (``APP_CONFIG`` aus register_app.py) bei vielen
+JTL-Wawi-Installationen gleichzeitig, z.B. beim Rollout einer MultiInstance-
+oder PerUser-App (``RegistrationType`` 1/2).
+
+- Alle Registrierungsanfragen (POST /authentication) werden parallel gesendet.
+- Die Statusabfragen aller Installationen laufen über einen gemeinsamen
+  Zeitplan: Der Abstand wächst je Installation von ``poll_interval`` bis
+  ``max_interval``, Fehler (Verbindung, 429, 5xx) verlängern ihn stärker.
+  Eine Semaphore begrenzt die gleichzeitig offenen Anfragen.
+- Jeder API-Key wird sofort nach der Genehmigung in eine eigene
+  Credential-Datei geschrieben (Format wie ``.env.jtl``, Rechte 0600).
+- Ein SQLite-Journal hält die Registration-IDs fest. Nach einem Abbruch wird
+  beim nächsten Lauf weiter abgefragt statt neu registriert; Installationen
+  mit vorhandener Credential-Datei werden übersprungen.
+
+Voraussetzung:
+    pip install aiohttp
+
+Verwendung:
+    python register_fleet.py installationen.json
+
+    installationen.json:
+    [
+        {"name": "filiale-nord", "base_url": "http://10.0.1.5:5883", "challenge_code": "nord-7f3a"},
+        {"name": "filiale-sued", "base_url": "http://10.0.2.5:5883"}
+    ]
+
+    Alternativ CSV mit Kopfzeile name,base_url[,challenge_code][,credential_file].
+    Ohne challenge_code gilt JTL_CHALLENGE_CODE.
+
+    Aus Python:
+        import asyncio
+        from register_fleet import FleetRegistrar, read_targets
+
+        registrar = FleetRegistrar(read_targets("installationen.json"), output_dir="credentials")
+        results = asyncio.run(registrar.run())
+"""
+
+import os
+import sys
+import csv
+import json
+import heapq
+import random
+import sqlite3
+import asyncio
+import itertools
+import aiohttp
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Iterable, Callable
+
+from register_app import APP_CONFIG, CHALLENGE_CODE, POLL_INTERVAL, RegistrationResult, format_credentials
+
+# Zustände im Journal
+NEW = "new"  # noch nicht (erfolgreich) eingereicht
+PENDING = "pending"  # eingereicht, wartet auf Genehmigung in JTL-Wawi
+APPROVED = "approved"
+REJECTED = "rejected"
+FAILED = "failed"  # nicht behebbarer Fehler (z.B. 400, X-ChallengeCode abgelehnt)
+TIMEOUT = "timeout"
+
+FINAL_STATES = (APPROVED, REJECTED, FAILED, TIMEOUT)
+
+# Statuscodes, nach denen später erneut versucht wird
+_TRANSIENT_STATUSES = (408, 429, 500, 502, 503, 504)
+
+
+@dataclass
+class Target:
+    """Eine JTL-Wawi-Installation"""
+    name: str
+    base_url: str
+    challenge_code: str = CHALLENGE_CODE
+    credential_file: Optional[str] = None  # Standard: <output_dir>/<name>.env
+
+
+@dataclass
+class FleetResult(RegistrationResult):
+    """Ergebnis der Registrierung bei einer Installation"""
+    name: str = ""
+    status: str = NEW
+    credential_file: Optional[str] = None
+    polls: int = 0
+
+
+def read_targets(path: str) -> List[Target]:
+    """Liest die Installationen aus einer JSON-Liste oder CSV-Datei"""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith(".json"):
+            rows = json.load(f)
+        else:
+            rows = list(csv.DictReader(f))
+
+    targets = []
+    names = set()
+    for row in rows:
+        name = (row.get("name") or "").strip()
+        base_url = (row.get("base_url") or "").strip().rstrip("/")
+        if not name or not base_url:
+            raise ValueError(f"Eintrag ohne name oder base_url: {row}")
+        if name in names:
+            raise ValueError(f"Name mehrfach vergeben: {name}")
+        names.add(name)
+        targets.append(Target(
+            name=name,
+            base_url=base_url,
+            challenge_code=(row.get("challenge_code") or "").strip() or CHALLENGE_CODE,
+            credential_file=(row.get("credential_file") or "").strip() or None
+        ))
+    return targets
+
+
+class _Registration:
+    """Laufzeitzustand einer Installation (nur in der Event-Loop verändern)"""
+
+    __slots__ = ("target", "credential_file", "registration_id", "status", "interval",
+                 "polls", "error", "api_key", "granted_scopes")
+
+    def __init__(self, target: Target, credential_file: str, interval: float):
+        self.target = target
+        self.credential_file = credential_file
+        self.registration_id: Optional[str] = None
+        self.status = NEW
+        self.interval = interval
+        self.polls = 0
+        self.error: Optional[str] = None
+        self.api_key: Optional[str] = None
+        self.granted_scopes: Optional[str] = None
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS registrations (
+    name TEXT PRIMARY KEY,
+    base_url TEXT NOT NULL,
+    registration_id TEXT,
+    status TEXT NOT NULL,  -- new | pending | approved | rejected | failed | timeout
+    polls INTEGER NOT NULL DEFAULT 0,
+    credential_file TEXT,
+    error TEXT,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+class FleetRegistrar:
+    """
+    Registriert eine App parallel bei vielen JTL-Wawi-Installationen
+
+    Attributes:
+        targets: Die Installationen
+        app_config: Registrierungsdaten der App (Standard: APP_CONFIG)
+        output_dir: Verzeichnis für Credential-Dateien ohne eigenen Pfad
+        journal_path: SQLite-Journal mit den Registration-IDs
+        poll_interval: Erster Abstand zwischen zwei Statusabfragen (Sekunden)
+        max_interval: Obergrenze des Abstands
+        backoff: Faktor, um den der Abstand je ausstehender Abfrage wächst
+        timeout: Gesamtdauer, nach der ausstehende Registrierungen aufgegeben werden
+        max_concurrency: Gleichzeitig offene Anfragen über alle Installationen
+        on_result: Wird für jede Installation mit Endzustand aufgerufen
+    """
+
+    def __init__(
+        self,
+        targets: Iterable[Target],
+        app_config: Optional[Dict[str, Any]] = None,
+        output_dir: str = "credentials",
+        journal_path: str = "register_fleet.sqlite",
+        poll_interval: float = POLL_INTERVAL,
+        max_interval: float = 60.0,
+        backoff: float = 1.5,
+        timeout: float = 1800.0,
+        max_concurrency: int = 20,
+        request_timeout: float = 30.0,
+        on_result: Optional[Callable[[FleetResult], None]] = None
+    ):
+        self.targets = list(targets)
+        self.app_config = app_config or APP_CONFIG
+        self.output_dir = output_dir
+        self.poll_interval = poll_interval
+        self.max_interval = max(max_interval, poll_interval)
+        self.backoff = backoff
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout
+        self.on_result = on_result
+
+        self._db = sqlite3.connect(journal_path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "FleetRegistrar":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    # ==================== Journal ====================
+
+    def _save(self, registration: _Registration) -> None:
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO registrations "
+                "(name, base_url, registration_id, status, polls, credential_file, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (registration.target.name, registration.target.base_url, registration.registration_id,
+                 registration.status, registration.polls, registration.credential_file,
+                 registration.error, datetime.now().isoformat(timespec="seconds"))
+            )
+
+    def _restore(self, registration: _Registration) -> None:
+        """Übernimmt eine ausstehende Registrierung aus einem früheren Lauf"""
+        row = self._db.execute(
+            "SELECT base_url, registration_id, status, polls FROM registrations WHERE name = ?",
+            (registration.target.name,)
+        ).fetchone()
+        if row and row[2] == PENDING and row[1] and row[0] == registration.target.base_url:
+            registration.registration_id = row[1]
+            registration.status = PENDING
+            registration.polls = row[3]
+
+    def summary(self) -> Dict[str, int]:
+        """Anzahl der Installationen je Zustand laut Journal"""
+        return dict(self._db.execute("SELECT status, COUNT(*) FROM registrations GROUP BY status"))
+
+    # ==================== Ablauf ====================
+
+    async def run(self) -> Dict[str, FleetResult]:
+        """
+        Registriert bei allen Installationen und wartet, bis jede einen
+        Endzustand erreicht hat (genehmigt, abgelehnt, Fehler oder Timeout).
+
+        Returns:
+            FleetResult je Installationsname
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        results: Dict[str, FleetResult] = {}
+        queue = []  # Heap aus (fällig um, Reihenfolge, Registrierung)
+        order = itertools.count()
+
+        for target in self.targets:
+            credential_file = target.credential_file or os.path.join(self.output_dir, f"{target.name}.env")
+            registration = _Registration(target, credential_file, self.poll_interval)
+            if os.path.exists(credential_file):
+                registration.status = APPROVED
+                results[target.name] = self._result(registration)
+                continue
+            self._restore(registration)
+            self._save(registration)
+            # Neue Registrierungen sofort, fortgesetzte nach dem ersten Intervall
+            due = loop.time() if registration.status == NEW else loop.time() + self.poll_interval
+            heapq.heappush(queue, (due, next(order), registration))
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        running = set()
+
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            while queue or running:
+                now = loop.time()
+                while queue and queue[0][0] <= now:
+                    _, _, registration = heapq.heappop(queue)
+                    if now >= deadline:
+                        registration.status = TIMEOUT
+                        registration.error = f"Keine Genehmigung nach {self.timeout:.0f} Sekunden"
+                        self._finish(registration, results)
+                        continue
+                    running.add(asyncio.ensure_future(self._step(session, semaphore, registration)))
+
+                wait = max(0.0, queue[0][0] - now) if queue else None
+                if not running:
+                    if queue:
+                        await asyncio.sleep(wait)
+                    continue
+
+                done, running = await asyncio.wait(running, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    registration, delay = task.result()
+                    if registration.status in FINAL_STATES:
+                        self._finish(registration, results)
+                    else:
+                        self._save(registration)
+                        heapq.heappush(queue, (min(loop.time() + delay, deadline), next(order), registration))
+
+        return results
+
+    async def _step(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                    registration: _Registration):
+        """Einreichen oder Status abfragen; liefert die Registrierung und die Wartezeit bis zum nächsten Schritt"""
+        target = registration.target
+        headers = {"api-version": "1.0", "X-ChallengeCode": target.challenge_code}
+        try:
+            async with semaphore:
+                if registration.status == NEW:
+                    async with session.post(f"{target.base_url}/authentication",
+                                            json=self.app_config, headers=headers) as response:
+                        return registration, self._submitted(registration, response.status,
+                                                             await self._body(response))
+                async with session.get(f"{target.base_url}/authentication/{registration.registration_id}",
+                                       headers=headers) as response:
+                    return registration, self._polled(registration, response.status,
+                                                      await self._body(response))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            registration.error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            return registration, self._delay(registration, failed=True)
+
+    @staticmethod
+    async def _body(response: aiohttp.ClientResponse) -> Any:
+        """JSON oder Text der Antwort; fehlerhafte Kodierung einer Installation bricht den Lauf nicht ab"""
+        raw = await response.read()
+        try:
+            text = raw.decode(response.charset or "utf-8", errors="replace")
+        except LookupError:  # unbekannter charset im Content-Type
+            text = raw.decode("utf-8", errors="replace")
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+
+    def _submitted(self, registration: _Registration, status: int, body: Any) -> float:
+        if status in (200, 201, 202) and isinstance(body, dict):
+            registration_id = (body.get("RequestStatusInfo") or {}).get("RegistrationRequestId")
+            if registration_id:
+                registration.registration_id = registration_id
+                registration.status = PENDING
+                registration.error = None
+                registration.interval = self.poll_interval
+                return self._delay(registration)
+        return self._http_error(registration, status, body)
+
+    def _polled(self, registration: _Registration, status: int, body: Any) -> float:
+        registration.polls += 1
+        if status == 404:
+            # Registrierung ist dem Server unbekannt (z.B. REST-Server neu gestartet): neu einreichen
+            registration.registration_id = None
+            registration.status = NEW
+            registration.error = "Registration-ID unbekannt, wird neu eingereicht"
+            return self._delay(registration, failed=True)
+        if status != 200 or not isinstance(body, dict):
+            return self._http_error(registration, status, body)
+
+        state = (body.get("RequestStatusInfo") or {}).get("Status")
+        if state == 1:
+            api_key = (body.get("Token") or {}).get("ApiKey")
+            if api_key:
+                registration.status = APPROVED
+                registration.api_key = api_key
+                registration.granted_scopes = body.get("GrantedScopes", "")
+                registration.error = None
+                return 0.0
+        elif state == 2:
+            registration.status = REJECTED
+            registration.error = "App-Registrierung wurde in JTL-Wawi abgelehnt"
+            return 0.0
+        registration.error = None
+        return self._delay(registration)
+
+    def _http_error(self, registration: _Registration, status: int, body: Any) -> float:
+        detail = (body.get("detail") or body.get("title")) if isinstance(body, dict) else str(body)[:200]
+        registration.error = f"HTTP {status}: {detail}" if detail else f"HTTP {status}"
+        if status in _TRANSIENT_STATUSES:
+            return self._delay(registration, failed=True)
+        registration.status = FAILED
+        return 0.0
+
+    def _delay(self, registration: _Registration, failed: bool = False) -> float:
+        """Nächster Abstand mit Backoff und ±20 % Streuung, damit die Abfragen sich verteilen"""
+        current = registration.interval
+        factor = self.backoff * 2 if failed else self.backoff
+        registration.interval = min(self.max_interval, current * factor)
+        return current * random.uniform(0.8, 1.2)
+
+    # ==================== Ergebnisse ====================
+
+    def _finish(self, registration: _Registration, results: Dict[str, FleetResult]) -> None:
+        if registration.status == APPROVED:
+            try:
+                self._write_credentials(registration)
+            except OSError as e:
+                # Key nicht verwerfen (er wird nur einmal ausgeliefert), aber auch nie ins Journal schreiben
+                registration.status = FAILED
+                registration.error = (
+                    f"Credential-Datei {registration.credential_file} nicht schreibbar ({e}); "
+                    f"{self._rescue_key(registration)}"
+                )
+        self._save(registration)
+        result = results[registration.target.name] = self._result(registration)
+        if self.on_result:
+            self.on_result(result)
+
+    def _write_credentials(self, registration: _Registration) -> None:
+        """Schreibt die Credential-Datei atomar mit Rechten 0600"""
+        path = registration.credential_file
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(format_credentials(registration.target.base_url, registration.api_key,
+                                       registration.granted_scopes, self.app_config))
+        os.replace(temporary, path)
+
+    def _rescue_key(self, registration: _Registration) -> str:
+        """
+        Sichert einen API-Key, dessen Credential-Datei nicht geschrieben werden konnte.
+
+        Zuerst als Datei (0600) im Home-Verzeichnis, sonst einmalig auf stderr.
+
+        Returns:
+            Hinweis für Journal und Bericht (ohne den Key)
+        """
+        fallback = os.path.join(os.path.expanduser("~"), f".jtl-{registration.target.name}.env")
+        try:
+            fd = os.open(fallback, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(format_credentials(registration.target.base_url, registration.api_key,
+                                           registration.granted_scopes, self.app_config))
+            return f"API-Key in {fallback} gesichert (0600), bitte nach {registration.credential_file} verschieben"
+        except OSError:
+            print(f"API-Key für {registration.target.name} ({registration.target.base_url}): "
+                  f"{registration.api_key}", file=sys.stderr)
+            return "API-Key einmalig auf stderr ausgegeben"
+
+    @staticmethod
+    def _result(registration: _Registration) -> FleetResult:
+        return FleetResult(
+            success=registration.status == APPROVED,
+            api_key=registration.api_key,
+            granted_scopes=registration.granted_scopes,
+            error=registration.error,
+            name=registration.target.name,
+            status=registration.status,
+            credential_file=registration.credential_file,
+            polls=registration.polls
+        )
+
+
+# ==================== Beispiele ====================
+
+if __name__ == "__main__":
+    import time
+
+    if len(sys.argv) < 2:
+        print("Verwendung: python register_fleet.py <installationen.json|installationen.csv> [ausgabeverzeichnis]")
+        exit(1)
+
+    try:
+        targets = read_targets(sys.argv[1])
+    except (OSError, ValueError) as e:
+        print(f"Fehler: {e}")
+        exit(1)
+
+    def report(result: FleetResult) -> None:
+        if result.success:
+            print(f"✓ {result.name}: genehmigt → {result.credential_file}")
+        else:
+            print(f"✗ {result.name}: {result.status} ({result.error})")
+
+    print(f"Registriere {APP_CONFIG['AppId']} bei {len(targets)} Installationen...")
+    print("Bitte die App jeweils in JTL-Wawi genehmigen: Admin → App-Registrierung → Genehmigen")
+    print()
+
+    started = time.monotonic()
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else "credentials"
+    with FleetRegistrar(targets, output_dir=output_dir, on_result=report) as registrar:
+        try:
+            results = asyncio.run(registrar.run())
+        except KeyboardInterrupt:
+            print("\nAbgebrochen – ein erneuter Aufruf setzt ausstehende Registrierungen fort.")
+            exit(130)
+        print()
+        print(f"Fertig in {time.monotonic() - started:.1f} s: {registrar.summary()}")
+    exit(0 if all(result.success for result in results.values()) else 1)
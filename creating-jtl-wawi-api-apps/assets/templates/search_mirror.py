@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi Suchspiegel
+
+Lokale Kopie von Kunden und Artikeln in SQLite mit FTS5-Volltextindex über
+Namen, Nummern, EAN/GTIN und Adressfelder. Suchen werden lokal in wenigen
+Millisekunden beantwortet statt über die langsame Serversuche
+(``searchKeyWord``). Ist der Spiegel älter als ``max_age``, wird die Anfrage
+an den Server weitergereicht.
+
+Befüllt wird der Spiegel über DeltaSync (``GET /customers``, ``GET /items``
+mit Watermark); Trigger halten den Index bei jedem Upsert aktuell.
+
+Verwendung:
+    from api_client import JtlWawiClient
+    from search_mirror import SearchMirror
+
+    with JtlWawiClient() as client, SearchMirror(client, "jtl_sync.sqlite") as mirror:
+        mirror.refresh()  # z.B. alle 5 Minuten per Cron
+
+        result = mirror.query_customers(search="Mustermann")
+        for customer in result.data["Items"]:
+            print(customer["Number"])
+
+        result = mirror.query_articles(search="4006381333931")  # EAN
+"""
+
+import re
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Tuple
+
+from api_client import JtlWawiClient, ApiResponse
+from delta_sync import DeltaSync, SyncResult
+
+# JSON-Pfade je Entität und Index-Spalte
+INDEXED_FIELDS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "customers": {
+        "name": (
+            "$.DisplayName", "$.BillingAddress.Company", "$.BillingAddress.Company2",
+            "$.BillingAddress.FirstName", "$.BillingAddress.LastName",
+        ),
+        "numbers": (
+            "$.Number", "$.AccountsReceivableNumber", "$.TaxIdentificationNumber",
+            "$.BillingAddress.VatID", "$.BillingAddress.EmailAddress", "$.BillingAddress.PhoneNumber",
+        ),
+        "address": (
+            "$.BillingAddress.Street", "$.BillingAddress.PostalCode", "$.BillingAddress.City",
+            "$.Shipmentaddress.Company", "$.Shipmentaddress.LastName", "$.Shipmentaddress.Street",
+            "$.Shipmentaddress.PostalCode", "$.Shipmentaddress.City",
+        ),
+    },
+    "items": {
+        "name": ("$.Name", "$.SearchTerms"),
+        "numbers": (
+            "$.SKU", "$.Identifiers.Gtin", "$.Identifiers.ManufacturerNumber", "$.Identifiers.ISBN",
+            "$.Identifiers.UPC", "$.Identifiers.OwnIdentifier", "$.Identifiers.Asins", "$.Taric",
+        ),
+        "address": (),
+    },
+}
+
+# Gewichtung für bm25 in der Reihenfolge der Index-Spalten (name, numbers, address)
+RANK_WEIGHTS = (10.0, 5.0, 1.0)
+
+_COLUMNS = ("name", "numbers", "address")
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _index_sql(entity: str, row: str) -> str:
+    """INSERT in den Index einer Entität; Felder einer Spalte werden aus dem JSON-Payload verbunden"""
+    columns = []
+    for column in _COLUMNS:
+        paths = INDEXED_FIELDS[entity][column]
+        parts = [f"coalesce(json_extract({row}.payload, '{path}'), '')" for path in paths]
+        columns.append(" || ' ' || ".join(parts) or "''")
+    return (
+        f"INSERT INTO search_{entity} (rowid, {', '.join(_COLUMNS)}) "
+        f"SELECT {row}.row_id, {', '.join(columns)}"
+    )
+
+
+def _schema(entity: str) -> str:
+    """Eigener FTS5-Index je Entität (rowid = records.row_id) plus Trigger auf der records-Tabelle von DeltaSync"""
+    table = f"search_{entity}"
+    return f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+    {', '.join(_COLUMNS)},
+    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON records WHEN new.entity = '{entity}' BEGIN
+    {_index_sql(entity, "new")};
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_update AFTER UPDATE ON records WHEN new.entity = '{entity}' BEGIN
+    DELETE FROM {table} WHERE rowid = old.row_id;
+    {_index_sql(entity, "new")};
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON records WHEN old.entity = '{entity}' BEGIN
+    DELETE FROM {table} WHERE rowid = old.row_id;
+END;
+"""
+
+
+def match_expression(search: str) -> Optional[str]:
+    """
+    Wandelt einen Suchbegriff in einen FTS5-Ausdruck um.
+
+    Durch Leerzeichen getrennte Begriffe müssen alle vorkommen, der jeweils
+    letzte Teil wird als Präfix gesucht. Zusammenhängende Teile wie
+    ``K-10042`` werden als Phrase gesucht, damit kurze Teile (``k``) nicht
+    einzeln den ganzen Bestand treffen: ``"Muster K-10042"`` →
+    ``"muster"* "k 10042"*``. Sonderzeichen werden nie als FTS5-Syntax interpretiert.
+    """
+    phrases = []
+    for word in search.lower().split():
+        tokens = _TOKEN.findall(word)
+        if tokens:
+            phrases.append(f'"{" ".join(tokens)}"*')
+    return " ".join(phrases) or None
+
+
+@dataclass
+class MirrorStats:
+    """Zähler des Suchspiegels"""
+    local: int = 0  # lokal beantwortete Suchen
+    fallbacks: int = 0  # an den Server weitergereicht (Spiegel veraltet)
+
+
+class SearchMirror(DeltaSync):
+    """
+    Durchsuchbarer lokaler Spiegel von Kunden und Artikeln
+
+    Attributes:
+        client: JtlWawiClient für Abgleich und Server-Fallback
+        db_path: Pfad zur SQLite-Datei (kann mit DeltaSync geteilt werden)
+        max_age: Maximales Alter des letzten Abgleichs, danach fragt der Spiegel den Server
+        rank_limit: Bis zu dieser Trefferzahl nach Relevanz sortieren, darüber
+            in Speicherreihenfolge (bm25 muss sonst jeden Treffer bewerten)
+    """
+
+    def __init__(
+        self,
+        client: JtlWawiClient,
+        db_path: str = "jtl_sync.sqlite",
+        max_age: timedelta = timedelta(minutes=15),
+        rank_limit: int = 2000,
+        **sync_options
+    ):
+        super().__init__(client, db_path, **sync_options)
+        self.max_age = max_age
+        self.rank_limit = rank_limit
+        self.stats = MirrorStats()
+        for entity in INDEXED_FIELDS:
+            self._db.executescript(_schema(entity))
+            # Datensätze, die vor dem Anlegen der Trigger gespeichert wurden
+            indexed = self._db.execute(f"SELECT COUNT(*) FROM search_{entity}").fetchone()[0]
+            if indexed != self.count(entity):
+                self.rebuild_index(entity)
+
+    def rebuild_index(self, entity: str) -> None:
+        """Baut den Volltextindex einer Entität aus den gespeicherten Datensätzen neu auf"""
+        table = f"search_{entity}"
+        with self._db:
+            self._db.execute(f"DELETE FROM {table}")
+            self._db.execute(f"{_index_sql(entity, 'records')} FROM records WHERE entity = ?", (entity,))
+            self._db.execute(f"INSERT INTO {table} ({table}) VALUES ('optimize')")
+
+    # ==================== Abgleich ====================
+
+    def refresh(self) -> List[SyncResult]:
+        """Gleicht Kunden und Artikel inkrementell ab (aktualisiert den Index)"""
+        return [self.sync(entity) for entity in INDEXED_FIELDS]
+
+    def last_refresh(self, entity: str) -> Optional[datetime]:
+        """Zeitpunkt des letzten Abgleichs einer Entität (lokale Zeit)"""
+        row = self._db.execute("SELECT last_run FROM watermarks WHERE entity = ?", (entity,)).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def is_fresh(self, entity: str) -> bool:
+        """True, wenn der letzte Abgleich jünger als ``max_age`` ist"""
+        last_run = self.last_refresh(entity)
+        return last_run is not None and datetime.now() - last_run <= self.max_age
+
+    # ==================== Suche ====================
+
+    def search(self, entity: str, search: Optional[str] = None, limit: int = 100, offset: int = 0) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Durchsucht den lokalen Bestand einer Entität.
+
+        Ohne Suchbegriff werden alle Datensätze nach Id geliefert, sonst nach
+        Relevanz (Treffer im Namen vor Nummern vor Adresse) bzw. bei mehr als
+        ``rank_limit`` Treffern in Speicherreihenfolge.
+
+        Returns:
+            (Gesamtzahl der Treffer, Datensätze der angeforderten Seite)
+        """
+        expression = match_expression(search) if search else None
+        if expression is None:
+            total = self.count(entity)
+            rows = self._db.execute(
+                "SELECT payload FROM records WHERE entity = ? ORDER BY id LIMIT ? OFFSET ?",
+                (entity, limit, offset)
+            ).fetchall()
+            return total, [json.loads(payload) for (payload,) in rows]
+
+        table = f"search_{entity}"
+        total = self._db.execute(f"SELECT COUNT(*) FROM {table} WHERE {table} MATCH ?", (expression,)).fetchone()[0]
+        if total <= self.rank_limit:
+            order = f"bm25({table}, {', '.join(str(weight) for weight in RANK_WEIGHTS)})"
+        else:
+            order = "s.rowid"  # Einfügereihenfolge, ohne Sortierung aller Treffer
+        rows = self._db.execute(
+            f"SELECT r.payload FROM {table} AS s JOIN records AS r ON r.row_id = s.rowid "
+            f"WHERE {table} MATCH ? ORDER BY {order} LIMIT ? OFFSET ?",
+            (expression, limit, offset)
+        ).fetchall()
+        return total, [json.loads(payload) for (payload,) in rows]
+
+    def _query(self, entity: str, endpoint: str, search: Optional[str], page_size: int, page_index: int) -> ApiResponse:
+        """Beantwortet eine Suche lokal oder, falls der Spiegel veraltet ist, über den Server"""
+        if not self.is_fresh(entity):
+            self.stats.fallbacks += 1
+            params: Dict[str, Any] = {"pageNumber": page_index + 1, "pageSize": page_size}
+            if search:
+                params["searchKeyWord"] = search
+            return self.client._request("GET", endpoint, params=params)
+
+        self.stats.local += 1
+        total, items = self.search(entity, search, page_size, page_index * page_size)
+        total_pages = (total + page_size - 1) // page_size
+        page_number = page_index + 1
+        return ApiResponse(
+            success=True,
+            data={
+                "TotalItems": total,
+                "PageNumber": page_number,
+                "PageSize": page_size,
+                "Items": items,
+                "TotalPages": total_pages,
+                "HasPreviousPage": page_number > 1,
+                "HasNextPage": page_number < total_pages,
+                "NextPageNumber": page_number + 1 if page_number < total_pages else None,
+                "PreviousPageNumber": page_number - 1 if page_number > 1 else None,
+            },
+            status_code=200
+        )
+
+    def query_customers(self, search: Optional[str] = None, page_size: int = 100, page_index: int = 0) -> ApiResponse:
+        """
+        Sucht Kunden (gleiche Signatur wie JtlWawiClient.query_customers).
+
+        Args:
+            search: Suchbegriff (Name, Kundennummer, E-Mail, PLZ, Ort, ...)
+            page_size: Einträge pro Seite
+            page_index: Seitennummer (0-basiert)
+        """
+        return self._query("customers", "/customers", search, page_size, page_index)
+
+    def query_articles(self, search: Optional[str] = None, page_size: int = 100, page_index: int = 0) -> ApiResponse:
+        """Sucht Artikel nach Name, SKU, EAN/GTIN, Herstellernummer, ISBN, UPC oder ASIN"""
+        return self._query("items", "/items", search, page_size, page_index)
+
+
+# ==================== Beispiele ====================
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    try:
+        client = JtlWawiClient()
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        print("Setzen Sie die Umgebungsvariable JTL_API_KEY oder übergeben Sie den API-Key.")
+        exit(1)
+
+    search = " ".join(sys.argv[1:]) or "Mustermann"
+
+    with client, SearchMirror(client) as mirror:
+        for result in mirror.refresh():
+            print(f"{result.entity}: {result.fetched} abgerufen, {mirror.count(result.entity)} im Spiegel")
+
+        started = time.perf_counter()
+        result = mirror.query_customers(search=search, page_size=10)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        if result.success:
+            print(f"\n{result.data['TotalItems']} Kunden für '{search}' ({elapsed:.1f} ms):")
+            for customer in result.data["Items"]:
+                address = customer.get("BillingAddress") or {}
+                print(f"  - {customer.get('Number')}: {address.get('Company') or address.get('LastName')}")
+        else:
+            print(f"Fehler: {result.error}")
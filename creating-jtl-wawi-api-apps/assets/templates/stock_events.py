@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi Bestandsänderungs-Feed
+
+Liefert Bestandsänderungen aus GET /stocks/changes als fortlaufenden,
+duplikatfreien Ereignisstrom, ohne den ganzen Katalog per /stocks abzufragen.
+
+- Pro Artikel wird ein Watermark (jüngstes ``ChangedDate``) gespeichert; jede
+  Abfrage beginnt bei ``Watermark - overlap``.
+- Das Abfrageintervall passt sich an: Artikel mit Änderungen werden im
+  ``hot_interval`` abgefragt, ohne Änderungen verdoppelt sich das Intervall
+  bis ``cold_interval``.
+- Fällige Artikel werden pro Durchlauf gebündelt und parallel abgefragt.
+- Ereignisse aus dem Überlappungsfenster werden über einen Fingerabdruck
+  erkannt und nur einmal geliefert. Gezählt wird je Fingerabdruck, damit
+  gleiche Buchungen (zweimal -1 in derselben Sekunde) beide ankommen.
+- Alle Zeitstempel werden in UTC verglichen; ``ChangedDate`` ohne Offset
+  gilt als ``server_timezone``.
+
+Watermarks, Intervalle und Fingerabdrücke liegen in SQLite und überstehen
+einen Neustart. Sie werden je Artikel erst gespeichert, wenn alle neuen
+Ereignisse des Artikels bestätigt sind (``ack``; ``events()`` und ``run()``
+bestätigen nach der Verarbeitung). Bricht der Verbraucher ab, werden die
+unbestätigten Ereignisse erneut geliefert (at-least-once).
+
+Verwendung:
+    from api_client import JtlWawiClient
+    from stock_events import StockChangeFeed
+
+    with JtlWawiClient(pool_maxsize=8) as client, StockChangeFeed(client) as feed:
+        feed.watch(shop_item_ids)
+        feed.touch([item_id])  # z.B. nach einer Bestellung: sofort und häufig abfragen
+
+        for event in feed.events():
+            shop.update_stock(event.item_id, event.warehouse_id, event.quantity)
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Callable, Tuple
+
+from api_client import JtlWawiClient, ApiError
+
+
+@dataclass(frozen=True)
+class StockChangeEvent:
+    """Eine Bestandsänderung aus /stocks/changes"""
+    item_id: int
+    warehouse_id: Optional[int]
+    storage_location_id: Optional[int]
+    quantity: float
+    changed: str  # ChangedDate wie vom Server geliefert
+    comment: Optional[str] = None
+    username: Optional[str] = None
+    batch_number: Optional[str] = None
+    shelf_life_expiration: Optional[str] = None
+
+    @classmethod
+    def from_change(cls, change: Dict[str, Any]) -> "StockChangeEvent":
+        return cls(
+            item_id=change.get("ItemId"),
+            warehouse_id=change.get("WarehouseId"),
+            storage_location_id=change.get("StorageLocationId"),
+            quantity=change.get("Quantity") or 0.0,
+            changed=change.get("ChangedDate"),
+            comment=change.get("Comment"),
+            username=change.get("Username"),
+            batch_number=change.get("BatchNumber"),
+            shelf_life_expiration=change.get("ShelfLifeExpirationDate")
+        )
+
+    def fingerprint(self) -> str:
+        """Identität der Änderung (die API liefert keine Id)"""
+        raw = "\x1f".join(str(value) for value in (
+            self.item_id, self.warehouse_id, self.storage_location_id, self.quantity, self.changed,
+            self.comment, self.username, self.batch_number, self.shelf_life_expiration
+        ))
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+
+@dataclass
+class FeedStats:
+    """Zähler über die Lebensdauer des Feeds"""
+    polls: int = 0  # abgefragte Artikel
+    events: int = 0  # gelieferte Ereignisse
+    duplicates: int = 0  # im Überlappungsfenster erneut gesehen
+    errors: int = 0  # fehlgeschlagene Abfragen (werden im nächsten Intervall wiederholt)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    item_id INTEGER PRIMARY KEY,
+    watermark TEXT NOT NULL,  -- jüngstes ChangedDate (UTC)
+    interval REAL NOT NULL,  -- aktuelles Abfrageintervall in Sekunden
+    next_poll REAL NOT NULL  -- Unix-Zeit der nächsten Abfrage
+);
+CREATE INDEX IF NOT EXISTS items_next_poll ON items (next_poll);
+CREATE TABLE IF NOT EXISTS seen (
+    item_id INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    changed TEXT NOT NULL,
+    occurrences INTEGER NOT NULL DEFAULT 1,  -- gleiche Änderungen im Fenster (die API liefert keine Id)
+    PRIMARY KEY (item_id, fingerprint)
+);
+"""
+
+_MIN_TIME = datetime.min.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class _PendingItem:
+    """Neuer Zustand eines Artikels, der erst nach Bestätigung aller Ereignisse gespeichert wird"""
+    watermark: str
+    interval: float
+    seen: List[Tuple[str, str, int]] = field(default_factory=list)  # (Fingerabdruck, ChangedDate, Anzahl)
+    remaining: int = 0  # noch nicht bestätigte Ereignisse
+
+
+def _to_utc(moment: datetime, default_tz: tzinfo) -> datetime:
+    """Rechnet nach UTC um; Zeitpunkte ohne Offset gelten als ``default_tz``"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=default_tz)
+    return moment.astimezone(timezone.utc)
+
+
+def _parse_timestamp(value: Optional[str], default_tz: tzinfo = timezone.utc) -> Optional[datetime]:
+    """Parst einen ISO-Zeitstempel der API nach UTC (None bei leerem/ungültigem Wert)"""
+    if not value:
+        return None
+    try:
+        return _to_utc(datetime.fromisoformat(value.replace("Z", "+00:00")), default_tz)
+    except ValueError:
+        return None
+
+
+class StockChangeFeed:
+    """
+    Ereignisstrom über /stocks/changes mit adaptiver Abfrage pro Artikel
+
+    Attributes:
+        client: JtlWawiClient für die Abfragen
+        state_path: Pfad zur SQLite-Datei mit Watermarks und Fingerabdrücken
+        hot_interval: Intervall in Sekunden für Artikel mit frischen Änderungen
+        cold_interval: Maximales Intervall für Artikel ohne Änderungen
+        backoff: Faktor, um den das Intervall nach einer leeren Abfrage wächst
+        overlap: Überlappungsfenster gegen Uhrenabweichungen und verspätete Buchungen
+        max_workers: Maximale Anzahl paralleler Abfragen
+        batch_size: Maximale Anzahl Artikel pro Durchlauf (dringendste zuerst)
+        server_timezone: Zeitzone für Zeitstempel ohne Offset (ChangedDate, ``since``)
+    """
+
+    def __init__(
+        self,
+        client: JtlWawiClient,
+        state_path: str = "stock_feed.sqlite",
+        hot_interval: float = 5.0,
+        cold_interval: float = 900.0,
+        backoff: float = 2.0,
+        overlap: timedelta = timedelta(minutes=2),
+        max_workers: int = 8,
+        batch_size: int = 64,
+        page_size: int = 500,
+        server_timezone: tzinfo = timezone.utc
+    ):
+        self.client = client
+        self.state_path = state_path
+        self.hot_interval = hot_interval
+        self.cold_interval = cold_interval
+        self.backoff = backoff
+        self.overlap = overlap
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.page_size = page_size
+        self.server_timezone = server_timezone
+        self.stats = FeedStats()
+
+        self._db = sqlite3.connect(state_path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(seen)")}
+        if "occurrences" not in columns:  # Zustandsdatei einer älteren Version
+            self._db.execute("ALTER TABLE seen ADD COLUMN occurrences INTEGER NOT NULL DEFAULT 1")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending: Dict[int, _PendingItem] = {}
+
+    def __enter__(self) -> "StockChangeFeed":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Beendet die Worker und schließt die SQLite-Verbindung"""
+        self._executor.shutdown(wait=True)
+        self._db.close()
+
+    # ==================== Artikel ====================
+
+    def watch(self, item_ids: Iterable[int], since: Optional[datetime] = None) -> None:
+        """
+        Nimmt Artikel in den Feed auf (bereits beobachtete bleiben unverändert).
+
+        Args:
+            item_ids: Artikel-IDs
+            since: Änderungen ab diesem Zeitpunkt liefern (ohne Offset: server_timezone); Standard: jetzt
+        """
+        watermark = _to_utc(since, self.server_timezone) if since else datetime.now(timezone.utc)
+        watermark = watermark.isoformat()
+        now = time.time()
+        with self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO items (item_id, watermark, interval, next_poll) VALUES (?, ?, ?, ?)",
+                ((item_id, watermark, self.hot_interval, now) for item_id in item_ids)
+            )
+
+    def unwatch(self, item_ids: Iterable[int]) -> None:
+        """Entfernt Artikel aus dem Feed"""
+        ids = [(item_id,) for item_id in item_ids]
+        with self._db:
+            self._db.executemany("DELETE FROM items WHERE item_id = ?", ids)
+            self._db.executemany("DELETE FROM seen WHERE item_id = ?", ids)
+
+    def touch(self, item_ids: Iterable[int]) -> None:
+        """Markiert Artikel als heiß: sofort und danach im hot_interval abfragen"""
+        with self._db:
+            self._db.executemany(
+                "UPDATE items SET interval = ?, next_poll = ? WHERE item_id = ?",
+                ((self.hot_interval, time.time(), item_id) for item_id in item_ids)
+            )
+
+    def watched(self) -> int:
+        """Anzahl der beobachteten Artikel"""
+        return self._db.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    # ==================== Abfrage ====================
+
+    def _watermark(self, value: str) -> datetime:
+        """Gespeichertes Watermark in UTC (ältere Zustandsdateien enthalten Serverzeit ohne Offset)"""
+        return _to_utc(datetime.fromisoformat(value), self.server_timezone)
+
+    def _fetch(self, item_id: int, watermark: str) -> Optional[List[Dict[str, Any]]]:
+        """Lädt die Änderungen eines Artikels ab Watermark - overlap (None bei Fehler, läuft im Worker)"""
+        start = self._watermark(watermark) - self.overlap
+        params = {"itemId": item_id, "startDate": start.astimezone(self.server_timezone).isoformat()}
+        try:
+            return list(self.client.paginate("/stocks/changes", params, self.page_size))
+        except ApiError:
+            return None
+
+    def poll_once(self) -> List[StockChangeEvent]:
+        """
+        Fragt alle fälligen Artikel (höchstens batch_size) parallel ab.
+
+        Watermark und Fingerabdrücke eines Artikels werden erst mit ``ack``
+        gespeichert. Noch unbestätigte Ereignisse eines früheren Aufrufs werden
+        verworfen und beim nächsten Abruf erneut geliefert.
+
+        Returns:
+            Neue Ereignisse, nach ChangedDate sortiert
+        """
+        self._pending.clear()
+        now = time.time()
+        due: List[Tuple[int, str, float]] = self._db.execute(
+            "SELECT item_id, watermark, interval FROM items WHERE next_poll <= ? ORDER BY next_poll LIMIT ?",
+            (now, self.batch_size)
+        ).fetchall()
+        if not due:
+            return []
+
+        futures = [self._executor.submit(self._fetch, item_id, watermark) for item_id, watermark, _ in due]
+        events: List[StockChangeEvent] = []
+        with self._db:
+            for (item_id, watermark, interval), future in zip(due, futures):
+                changes = future.result()
+                self.stats.polls += 1
+                if changes is None:
+                    self.stats.errors += 1
+                    self._db.execute(
+                        "UPDATE items SET next_poll = ? WHERE item_id = ?", (time.time() + interval, item_id)
+                    )
+                    continue
+                item_events, pending = self._apply(item_id, watermark, interval, changes)
+                if item_events:
+                    pending.remaining = len(item_events)
+                    self._pending[item_id] = pending  # bleibt fällig, bis ack() speichert
+                else:
+                    self._commit(item_id, pending)
+                events.extend(item_events)
+
+        events.sort(key=lambda event: _parse_timestamp(event.changed, self.server_timezone) or _MIN_TIME)
+        self.stats.events += len(events)
+        return events
+
+    def _apply(self, item_id: int, watermark: str, interval: float,
+               changes: List[Dict[str, Any]]) -> Tuple[List[StockChangeEvent], _PendingItem]:
+        """Filtert bekannte Änderungen und berechnet den neuen Zustand des Artikels (ohne zu speichern)"""
+        high_water = self._watermark(watermark)
+        floor = high_water - self.overlap
+        # Die Antwort enthält das ganze Fenster: je Fingerabdruck ist nur neu, was über die bekannte Anzahl hinausgeht
+        seen = dict(self._db.execute(
+            "SELECT fingerprint, occurrences FROM seen WHERE item_id = ?", (item_id,)
+        ))
+
+        events = []
+        counts: Counter = Counter()
+        changed_at: Dict[str, str] = {}
+        for change in changes:
+            event = StockChangeEvent.from_change(change)
+            changed = _parse_timestamp(event.changed, self.server_timezone)
+            if changed is None or changed < floor:
+                continue  # vor dem Abfragefenster (Server hat startDate ignoriert)
+            fingerprint = event.fingerprint()
+            counts[fingerprint] += 1
+            if counts[fingerprint] <= seen.get(fingerprint, 0):
+                self.stats.duplicates += 1
+                continue
+            events.append(event)
+            changed_at[fingerprint] = changed.isoformat()
+            if changed > high_water:
+                high_water = changed
+
+        new_seen = [(fingerprint, changed, counts[fingerprint]) for fingerprint, changed in changed_at.items()]
+
+        interval = self.hot_interval if events else min(self.cold_interval, interval * self.backoff)
+        return events, _PendingItem(high_water.isoformat(), interval, new_seen)
+
+    def _commit(self, item_id: int, pending: _PendingItem) -> None:
+        """Speichert Watermark, Fingerabdrücke und nächste Abfrage eines Artikels"""
+        self._db.executemany(
+            "INSERT INTO seen (item_id, fingerprint, changed, occurrences) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (item_id, fingerprint) DO UPDATE SET occurrences = MAX(occurrences, excluded.occurrences)",
+            ((item_id, fingerprint, changed, count) for fingerprint, changed, count in pending.seen)
+        )
+        self._db.execute(
+            "UPDATE items SET watermark = ?, interval = ?, next_poll = ? WHERE item_id = ?",
+            (pending.watermark, pending.interval, time.time() + pending.interval, item_id)
+        )
+        # Fingerabdrücke vor dem nächsten Abfragefenster werden nicht mehr gebraucht
+        self._db.execute(
+            "DELETE FROM seen WHERE item_id = ? AND changed < ?",
+            (item_id, (self._watermark(pending.watermark) - self.overlap).isoformat())
+        )
+
+    def ack(self, events: Iterable[StockChangeEvent]) -> None:
+        """
+        Bestätigt verarbeitete Ereignisse aus poll_once().
+
+        Sobald alle Ereignisse eines Artikels bestätigt sind, werden dessen
+        Watermark und Fingerabdrücke gespeichert; sie werden dann auch nach
+        einem Neustart nicht erneut geliefert.
+        """
+        with self._db:
+            for event in events:
+                pending = self._pending.get(event.item_id)
+                if pending is None:
+                    continue
+                pending.remaining -= 1
+                if pending.remaining <= 0:
+                    self._commit(event.item_id, self._pending.pop(event.item_id))
+
+    def next_due(self) -> Optional[float]:
+        """Sekunden bis zur nächsten fälligen Abfrage (None ohne beobachtete Artikel)"""
+        row = self._db.execute("SELECT MIN(next_poll) FROM items").fetchone()
+        return None if row[0] is None else max(row[0] - time.time(), 0.0)
+
+    # ==================== Ereignisstrom ====================
+
+    def events(self, stop: Optional[threading.Event] = None, idle: float = 1.0) -> Iterator[StockChangeEvent]:
+        """
+        Liefert Ereignisse fortlaufend, bis ``stop`` gesetzt wird.
+
+        Ein Ereignis gilt als verarbeitet (``ack``), sobald der Verbraucher das
+        nächste anfordert. Bricht die Schleife mit einer Ausnahme ab, bleiben
+        die Ereignisse des Artikels unbestätigt und werden erneut geliefert.
+
+        Zwischen den Durchläufen wird bis zur nächsten fälligen Abfrage
+        gewartet, höchstens ``idle`` Sekunden (damit touch() schnell wirkt).
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            for event in self.poll_once():
+                yield event
+                self.ack([event])
+            wait = self.next_due()
+            stop.wait(idle if wait is None else min(wait, idle))
+
+    def run(self, callback: Callable[[StockChangeEvent], None], stop: Optional[threading.Event] = None) -> None:
+        """Ruft ``callback`` für jedes Ereignis auf, bis ``stop`` gesetzt wird (ack nach jedem Aufruf)"""
+        for event in self.events(stop):
+            callback(event)
+
+
+# ==================== Beispiele ====================
+
+if __name__ == "__main__":
+    import sys
+
+    try:
+        client = JtlWawiClient(pool_maxsize=8)
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        print("Setzen Sie die Umgebungsvariable JTL_API_KEY oder übergeben Sie den API-Key.")
+        exit(1)
+
+    item_ids = [int(value) for value in sys.argv[1:]] or list(range(1, 101))
+
+    with client, StockChangeFeed(client, max_workers=8) as feed:
+        feed.watch(item_ids)
+        print(f"Beobachte {feed.watched()} Artikel (Strg+C beendet)...")
+        try:
+            for event in feed.events():
+                print(f"  {event.changed}  Artikel {event.item_id}  Lager {event.warehouse_id}: "
+                      f"{event.quantity:+g}  {event.comment or ''}")
+        except KeyboardInterrupt:
+            pass
+        print(f"\n{feed.stats}")
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi Bulk-Bestandsbuchungen
+
+Puffert viele kleine Bestandsbewegungen (+1/-1), saldiert sie pro
+(Artikel, Lager) über ein Zeitfenster und bucht nur die Nettoänderung über
+POST /stocks. Aus Millionen Bewegungen werden so wenige tausend Anfragen.
+
+Alle Bewegungen und Buchungen laufen über ein SQLite-Journal:
+- Angenommene Bewegungen werden sofort saldiert ins Journal geschrieben und
+  überstehen einen Absturz.
+- Jede Nettobuchung erhält eine Journal-ID, die im Kommentar der Buchung
+  mitgesendet wird. Ist nach einem Absturz, Timeout oder 5xx unklar, ob eine
+  Buchung beim Server angekommen ist, wird über /stocks/changes nach dieser ID
+  gesucht, statt blind erneut zu buchen.
+- Vom Server abgelehnte Buchungen (z.B. unbekannter Artikel) werden nicht
+  endlos wiederholt, sondern als "failed" über errors() gemeldet und nach
+  einer Korrektur mit retry_failed() erneut eingeplant.
+
+Verwendung:
+    from api_client import JtlWawiClient
+    from stock_pipeline import StockPipeline
+
+    with JtlWawiClient(pool_maxsize=8) as client:
+        with StockPipeline(client, "stock_journal.sqlite", window=5, max_workers=8) as pipeline:
+            for movement in warehouse_feed():
+                pipeline.add(movement.article_id, movement.warehouse_id, movement.quantity)
+        # Beim Verlassen wird der Rest gebucht
+"""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List, Iterable, Tuple
+
+from api_client import JtlWawiClient, ApiError
+
+
+@dataclass
+class FlushResult:
+    """Ergebnis eines Flush-Vorgangs"""
+    booked: int = 0  # erfolgreich gebuchte Nettoänderungen
+    failed: int = 0  # Ausgang unklar; wird beim nächsten Flush über recover() geklärt
+    rejected: int = 0  # vom Server abgelehnt (4xx), bleibt "failed" bis retry_failed()
+    recovered: int = 0  # nach Absturz über /stocks/changes als bereits gebucht erkannt
+    netted_out: int = 0  # (Artikel, Lager)-Paare, die sich zu 0 saldiert haben
+
+
+@dataclass
+class PipelineStats:
+    """Zähler über die Lebensdauer der Pipeline"""
+    movements: int = 0
+    requests: int = 0
+    booked: int = 0
+    failed: int = 0
+    rejected: int = 0
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending (
+    article_id INTEGER NOT NULL,
+    warehouse_id INTEGER NOT NULL,
+    quantity REAL NOT NULL,
+    PRIMARY KEY (article_id, warehouse_id)
+);
+CREATE TABLE IF NOT EXISTS adjustments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    article_id INTEGER NOT NULL,
+    warehouse_id INTEGER NOT NULL,
+    quantity REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'open',  -- open | sending | done | failed
+    created_at TEXT NOT NULL,
+    sent_at TEXT,  -- UTC
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS adjustments_status ON adjustments (status);
+"""
+
+# Statusübergänge: open -> sending -> done; bei Ablehnung (übrige 4xx) -> failed,
+# erst retry_failed() setzt wieder auf open.
+# Bei unklarem Ausgang (Timeout, 408, 429, 5xx) bleibt "sending", bis recover() die
+# Buchung in /stocks/changes gefunden (done) oder sicher nicht gefunden hat (open).
+_OPEN, _SENDING, _DONE, _FAILED = "open", "sending", "done", "failed"
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_utc(value: str) -> datetime:
+    """Liest sent_at; Journale älterer Versionen enthalten lokale Zeit ohne Offset"""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return moment.astimezone(timezone.utc)
+
+
+class StockPipeline:
+    """
+    Saldierende Bulk-Pipeline für Bestandsbuchungen
+
+    Attributes:
+        client: JtlWawiClient für die Buchungen
+        journal_path: Pfad zum SQLite-Journal
+        window: Sekunden, über die Bewegungen saldiert werden, bevor gebucht wird
+        max_workers: Maximale Anzahl gleichzeitiger Buchungen
+        comment: Kommentar-Präfix der Buchungen (Journal-ID wird angehängt)
+        settle_after: Sekunden, die eine Buchung mit unklarem Ausgang mindestens
+            alt sein muss, bevor flush() sie über /stocks/changes klärt
+    """
+
+    def __init__(
+        self,
+        client: JtlWawiClient,
+        journal_path: str = "stock_journal.sqlite",
+        window: float = 5.0,
+        max_workers: int = 8,
+        comment: str = "API-Bestandsanpassung",
+        settle_after: float = 30.0
+    ):
+        self.client = client
+        self.journal_path = journal_path
+        self.window = window
+        self.max_workers = max_workers
+        self.comment = comment
+        self.settle_after = settle_after
+        self.stats = PipelineStats()
+
+        self._db = sqlite3.connect(journal_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()  # Journal wird aus den Worker-Threads beschrieben
+        self._last_flush = time.monotonic()
+
+    def __enter__(self) -> "StockPipeline":
+        self.recover()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Bucht alle offenen Bewegungen und schließt das Journal"""
+        try:
+            self.flush()
+        finally:
+            self._db.close()
+
+    # ==================== Bewegungen ====================
+
+    def add(self, article_id: int, warehouse_id: int, quantity: float) -> None:
+        """
+        Nimmt eine Bestandsbewegung an.
+
+        Die Bewegung wird sofort saldiert im Journal gespeichert. Ist das
+        Zeitfenster abgelaufen, werden alle Nettoänderungen gebucht.
+
+        Args:
+            article_id: Artikel-ID
+            warehouse_id: Lager-ID
+            quantity: Menge (positiv = Zugang, negativ = Abgang)
+        """
+        with self._db:
+            self._db.execute(
+                "INSERT INTO pending (article_id, warehouse_id, quantity) VALUES (?, ?, ?) "
+                "ON CONFLICT (article_id, warehouse_id) DO UPDATE SET quantity = quantity + excluded.quantity",
+                (article_id, warehouse_id, quantity)
+            )
+        self.stats.movements += 1
+
+        if time.monotonic() - self._last_flush >= self.window:
+            self.flush()
+
+    def pending_count(self) -> int:
+        """Anzahl der (Artikel, Lager)-Paare mit noch nicht gebuchter Nettoänderung"""
+        return self._db.execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+
+    # ==================== Buchen ====================
+
+    def flush(self) -> FlushResult:
+        """
+        Überführt die saldierten Bewegungen in Buchungen und sendet alle offenen Buchungen.
+
+        Abgelehnte Buchungen (4xx) werden "failed" und nicht erneut gesendet
+        (siehe errors() und retry_failed()). Buchungen mit unklarem Ausgang
+        werden zuerst über recover() geklärt und nur erneut gesendet, wenn sie
+        nicht gebucht sind.
+        """
+        result = FlushResult()
+        now = _utc_now().isoformat()
+
+        with self._db:
+            result.netted_out = self._db.execute(
+                "SELECT COUNT(*) FROM pending WHERE quantity = 0"
+            ).fetchone()[0]
+            self._db.execute(
+                "INSERT INTO adjustments (article_id, warehouse_id, quantity, status, created_at) "
+                "SELECT article_id, warehouse_id, quantity, ?, ? FROM pending WHERE quantity != 0",
+                (_OPEN, now)
+            )
+            self._db.execute("DELETE FROM pending")
+        self._last_flush = time.monotonic()
+
+        result.recovered = self.recover(min_age=self.settle_after).recovered
+
+        rows = self._db.execute(
+            "SELECT id, article_id, warehouse_id, quantity FROM adjustments WHERE status = ? ORDER BY id",
+            (_OPEN,)
+        ).fetchall()
+        if not rows:
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for status in executor.map(self._book, rows):
+                if status == _DONE:
+                    result.booked += 1
+                elif status == _FAILED:
+                    result.rejected += 1
+                else:
+                    result.failed += 1
+
+        self.stats.booked += result.booked
+        self.stats.failed += result.failed
+        self.stats.rejected += result.rejected
+        return result
+
+    def _book(self, row: Tuple[int, int, int, float]) -> str:
+        """Sendet eine Nettobuchung und führt den Journalstatus nach; liefert den neuen Status"""
+        adjustment_id, article_id, warehouse_id, quantity = row
+
+        # Vor dem Senden als "sending" markieren: bei Absturz ist der Ausgang unklar
+        with self._db_lock, self._db:
+            self._db.execute(
+                "UPDATE adjustments SET status = ?, sent_at = ? WHERE id = ?",
+                (_SENDING, _utc_now().isoformat(), adjustment_id)
+            )
+
+        response = self.client.create_stock(
+            article_id, warehouse_id, quantity, comment=self._tag(adjustment_id)
+        )
+        with self._db_lock, self._db:
+            self.stats.requests += 1
+            if response.success:
+                self._db.execute("UPDATE adjustments SET status = ?, error = NULL WHERE id = ?", (_DONE, adjustment_id))
+                return _DONE
+            if response.outcome_unknown:
+                # Kann trotzdem gebucht sein: "sending" lassen, recover() klärt das vor jedem neuen Versuch
+                self._db.execute("UPDATE adjustments SET error = ? WHERE id = ?", (response.error, adjustment_id))
+                return _SENDING
+            # Ablehnung: ein erneuter Versuch würde genauso scheitern
+            self._db.execute(
+                "UPDATE adjustments SET status = ?, error = ? WHERE id = ?",
+                (_FAILED, response.error, adjustment_id)
+            )
+            return _FAILED
+
+    def _tag(self, adjustment_id: int) -> str:
+        """Kommentar mit Journal-ID, über den eine Buchung in /stocks/changes wiedergefunden wird"""
+        return f"{self.comment} [journal:{adjustment_id}]"
+
+    # ==================== Fehler ====================
+
+    def summary(self) -> Dict[str, int]:
+        """Anzahl der Buchungen je Status im Journal"""
+        with self._db_lock:
+            return dict(self._db.execute("SELECT status, COUNT(*) FROM adjustments GROUP BY status").fetchall())
+
+    def errors(self, limit: int = 100) -> List[Tuple[int, int, int, float, str]]:
+        """Abgelehnte Buchungen: (Journal-ID, Artikel, Lager, Menge, Fehler)"""
+        with self._db_lock:
+            return self._db.execute(
+                "SELECT id, article_id, warehouse_id, quantity, error FROM adjustments "
+                "WHERE status = ? ORDER BY id LIMIT ?",
+                (_FAILED, limit)
+            ).fetchall()
+
+    def retry_failed(self, adjustment_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Plant abgelehnte Buchungen nach einer Korrektur (z.B. Artikel angelegt)
+        für den nächsten Flush erneut ein.
+
+        Args:
+            adjustment_ids: Nur diese Journal-IDs (Standard: alle abgelehnten)
+
+        Returns:
+            Anzahl erneut eingeplanter Buchungen
+        """
+        with self._db_lock, self._db:
+            if adjustment_ids is None:
+                cursor = self._db.execute("UPDATE adjustments SET status = ? WHERE status = ?", (_OPEN, _FAILED))
+                return cursor.rowcount
+            return sum(
+                self._db.execute(
+                    "UPDATE adjustments SET status = ? WHERE id = ? AND status = ?", (_OPEN, adjustment_id, _FAILED)
+                ).rowcount
+                for adjustment_id in adjustment_ids
+            )
+
+    # ==================== Wiederanlauf ====================
+
+    def recover(self, min_age: float = 0.0) -> FlushResult:
+        """
+        Klärt Buchungen, deren Ausgang unklar ist ("sending": Absturz, Timeout, 5xx).
+
+        Für jede solche Buchung wird in /stocks/changes nach der Journal-ID im
+        Kommentar gesucht. Gefunden: als gebucht markieren. Nicht gefunden:
+        zurück auf "open", damit der nächste Flush sie erneut sendet.
+
+        Args:
+            min_age: Nur Buchungen klären, die mindestens so viele Sekunden alt
+                sind (der Server kann eine abgebrochene Anfrage noch verarbeiten)
+        """
+        result = FlushResult()
+        with self._db_lock:
+            rows: List[Tuple[int, int, str]] = self._db.execute(
+                "SELECT id, article_id, sent_at FROM adjustments WHERE status = ?", (_SENDING,)
+            ).fetchall()
+
+        cutoff = _utc_now() - timedelta(seconds=min_age)
+        for adjustment_id, article_id, sent_at in rows:
+            if min_age and sent_at and _parse_utc(sent_at) > cutoff:
+                continue
+            booked = self._find_booking(adjustment_id, article_id, sent_at)
+            if booked is None:
+                # Server nicht erreichbar: Status unverändert lassen und später erneut prüfen
+                continue
+            with self._db_lock, self._db:
+                self._db.execute(
+                    "UPDATE adjustments SET status = ? WHERE id = ?",
+                    (_DONE if booked else _OPEN, adjustment_id)
+                )
+            if booked:
+                result.recovered += 1
+        return result
+
+    def _find_booking(self, adjustment_id: int, article_id: int, sent_at: Optional[str]) -> Optional[bool]:
+        """Sucht eine Buchung in /stocks/changes (None = Prüfung nicht möglich)"""
+        params = {"itemId": article_id}
+        if sent_at:
+            # In UTC, damit Zeitzone des Clients keine Rolle spielt; etwas früher beginnen,
+            # falls die Serveruhr nachgeht
+            start = _parse_utc(sent_at) - timedelta(minutes=10)
+            params["startDate"] = start.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        tag = self._tag(adjustment_id)
+        try:
+            for change in self.client.paginate("/stocks/changes", params, page_size=500):
+                if change.get("Comment") == tag:
+                    return True
+        except ApiError:
+            return None
+        return False
+
+
+# ==================== Beispiele ====================
+
+if __name__ == "__main__":
+    import random
+
+    try:
+        client = JtlWawiClient(pool_maxsize=8)
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        print("Setzen Sie die Umgebungsvariable JTL_API_KEY oder übergeben Sie den API-Key.")
+        exit(1)
+
+    with client, StockPipeline(client, window=5, max_workers=8) as pipeline:
+        # Beispiel: 10.000 zufällige +1/-1-Bewegungen auf 50 Artikel
+        for _ in range(10_000):
+            pipeline.add(random.randint(1, 50), 1, random.choice((1, -1)))
+
+    print(f"{pipeline.stats.movements} Bewegungen, {pipeline.stats.requests} Anfragen, "
+          f"{pipeline.stats.failed} unklar, {pipeline.stats.rejected} abgelehnt")
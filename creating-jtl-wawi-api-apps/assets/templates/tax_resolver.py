@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi Steuersätze für Warenkörbe und Aufträge
+
+Der Steuersatz einer Position hängt nur von der Steuerklasse des Artikels,
+der Firma und dem Länderpaar (Versand von/nach) ab. ``TaxResolver`` merkt
+sich daher je Artikel die Steuerklasse und je
+(Steuerklasse, Firma, Abgangsland, Lieferland) den Satz:
+
+- Unbekannte Artikel werden einmal über ``/tax/item/...`` abgefragt; die
+  Antwort liefert Satz und ``TaxClassId`` zugleich. Artikel aus einem Abzug
+  (``scan_items``, DeltaSync) können mit ``add_items`` ohne Anfrage
+  eingetragen werden.
+- Alle weiteren Länderpaare kommen aus der Matrix Steuerklasse × Firma ×
+  Länderpaar (``/tax/taxclass/...``), die mit ``precompute`` vorab
+  gefüllt werden kann.
+- ``resolve_lines`` löst alle Positionen eines Auftrags auf einmal auf; die
+  fehlenden Einträge werden parallel und jeweils nur einmal geladen.
+
+Nicht abgedeckt sind Abfragen mit ``taxNumber`` (z.B. innergemeinschaftliche
+Lieferung) oder Bundesstaaten; dafür ``client.get_item_tax(..., taxNumber=...)``
+direkt verwenden.
+
+Verwendung:
+    from api_client import JtlWawiClient
+    from tax_resolver import TaxResolver
+
+    with JtlWawiClient() as client:
+        taxes = TaxResolver(client, company_id=1, departure_country="DE")
+        taxes.precompute(["DE", "AT", "FR", "NL"])
+
+        rates = taxes.resolve_lines(order["LineItems"], shipment_country="AT")
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+
+from api_client import JtlWawiClient, ApiError
+
+# (Steuerklasse, Firma, Abgangsland, Lieferland)
+CellKey = Tuple[int, int, str, str]
+
+
+@dataclass
+class TaxStats:
+    """Trefferquote des Resolvers"""
+    items: int = 0  # Artikel mit bekannter Steuerklasse
+    cells: int = 0  # bekannte Sätze in der Matrix
+    hits: int = 0  # ohne Anfrage beantwortet (je Artikel bzw. Steuerklasse)
+    requests: int = 0  # Anfragen an /tax/...
+
+
+class TaxResolver:
+    """
+    Steuersätze je Position aus dem Speicher (thread-sicher)
+
+    Attributes:
+        client: Der JtlWawiClient für Abrufe
+        company_id: Standard-Firma (CompanyId)
+        departure_country: Standard-Abgangsland (ISO, z.B. "DE")
+        max_workers: Parallele Anfragen beim Nachladen
+    """
+
+    def __init__(
+        self,
+        client: JtlWawiClient,
+        company_id: int,
+        departure_country: str = "DE",
+        max_workers: int = 8
+    ):
+        self.client = client
+        self.company_id = company_id
+        self.departure_country = departure_country.upper()
+        self.max_workers = max_workers
+
+        self._item_classes: Dict[int, int] = {}
+        self._rates: Dict[CellKey, Any] = {}
+        self._tax_classes: Optional[List[int]] = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._requests = 0
+
+    # ==================== Artikel → Steuerklasse ====================
+
+    def add_items(self, items: Iterable[Dict[str, Any]]) -> int:
+        """
+        Übernimmt die Steuerklassen aus Artikel-Datensätzen (``Id``, ``TaxClassId``).
+
+        Überschreibt vorhandene Einträge; nach einem Delta-Sync erneut
+        aufrufen, damit geänderte Steuerklassen übernommen werden.
+
+        Returns:
+            Anzahl übernommener Artikel
+        """
+        mapping = {
+            item["Id"]: item["TaxClassId"]
+            for item in items
+            if item.get("Id") is not None and item.get("TaxClassId") is not None
+        }
+        with self._lock:
+            self._item_classes.update(mapping)
+        return len(mapping)
+
+    def item_class(self, item_id: int) -> Optional[int]:
+        """Bekannte Steuerklasse eines Artikels (ohne Anfrage)"""
+        return self._item_classes.get(item_id)
+
+    # ==================== Matrix ====================
+
+    def _key(self, tax_class_id: int, company_id: Optional[int], departure: Optional[str],
+             shipment: str) -> CellKey:
+        return (
+            tax_class_id,
+            self.company_id if company_id is None else company_id,
+            (departure or self.departure_country).upper(),
+            shipment.upper()
+        )
+
+    def tax_classes(self) -> List[int]:
+        """Ids aller Steuerklassen (``GET /taxClasses``, einmal pro Resolver)"""
+        if self._tax_classes is None:
+            response = self.client._request("GET", "/taxClasses")
+            if not response.success:
+                raise ApiError(response)
+            self._tax_classes = [entry["Id"] for entry in response.data or []]
+        return self._tax_classes
+
+    def precompute(
+        self,
+        shipment_countries: Iterable[str],
+        company_ids: Optional[Iterable[int]] = None,
+        departure_countries: Optional[Iterable[str]] = None,
+        tax_classes: Optional[Iterable[int]] = None
+    ) -> int:
+        """
+        Lädt die Matrix Steuerklasse × Firma × Länderpaar parallel.
+
+        Args:
+            shipment_countries: Lieferländer (ISO)
+            company_ids: Firmen (Standard: ``company_id``)
+            departure_countries: Abgangsländer (Standard: ``departure_country``)
+            tax_classes: Steuerklassen (Standard: alle aus /taxClasses)
+
+        Returns:
+            Anzahl neu geladener Sätze
+        """
+        classes = list(tax_classes) if tax_classes is not None else self.tax_classes()
+        companies = list(company_ids) if company_ids is not None else [self.company_id]
+        departures = list(departure_countries) if departure_countries is not None else [self.departure_country]
+        keys = {
+            self._key(tax_class, company, departure, shipment)
+            for tax_class in classes
+            for company in companies
+            for departure in departures
+            for shipment in shipment_countries
+        }
+        return self._load_cells(keys)
+
+    def _load_cells(self, keys: Iterable[CellKey]) -> int:
+        missing = [key for key in keys if key not in self._rates]
+        if not missing:
+            return 0
+
+        def fetch(key: CellKey) -> Tuple[CellKey, Any]:
+            response = self.client.get_tax_class_tax(*key)
+            if not response.success:
+                raise ApiError(response)
+            return key, response.data["Rate"]
+
+        results = self._parallel(fetch, missing)
+        with self._lock:
+            self._rates.update(results)
+        return len(results)
+
+    def _load_items(self, item_ids: Iterable[int], company_id: Optional[int], departure: Optional[str],
+                    shipment: str) -> None:
+        """Fragt unbekannte Artikel über /tax/item ab: liefert Steuerklasse und einen Satz der Matrix"""
+        def fetch(item_id: int) -> Tuple[int, Dict[str, Any]]:
+            key = self._key(0, company_id, departure, shipment)
+            response = self.client.get_item_tax(item_id, *key[1:])
+            if not response.success:
+                raise ApiError(response)
+            return item_id, response.data
+
+        results = self._parallel(fetch, list(item_ids))
+        with self._lock:
+            for item_id, tax in results:
+                self._item_classes[item_id] = tax["TaxClassId"]
+                self._rates[self._key(tax["TaxClassId"], company_id, departure, shipment)] = tax["Rate"]
+
+    def _parallel(self, fn, args: List[Any]) -> List[Any]:
+        with self._lock:
+            self._requests += len(args)
+        if len(args) == 1:
+            return [fn(args[0])]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(args))) as executor:
+            return list(executor.map(fn, args))
+
+    # ==================== Abfragen ====================
+
+    def class_rate(self, tax_class_id: int, shipment_country: str, company_id: Optional[int] = None,
+                   departure_country: Optional[str] = None) -> Any:
+        """Steuersatz einer Steuerklasse (lädt fehlende Sätze nach)"""
+        key = self._key(tax_class_id, company_id, departure_country, shipment_country)
+        rate = self._rates.get(key)
+        if rate is None:
+            self._load_cells([key])
+            return self._rates[key]
+        with self._lock:
+            self._hits += 1
+        return rate
+
+    def item_rate(self, item_id: int, shipment_country: str, company_id: Optional[int] = None,
+                  departure_country: Optional[str] = None) -> Any:
+        """Steuersatz eines Artikels"""
+        return self.resolve_lines([{"ItemId": item_id}], shipment_country, company_id, departure_country)[0]
+
+    def resolve_lines(
+        self,
+        lines: Iterable[Dict[str, Any]],
+        shipment_country: str,
+        company_id: Optional[int] = None,
+        departure_country: Optional[str] = None
+    ) -> List[Optional[Any]]:
+        """
+        Steuersätze für alle Positionen eines Warenkorbs oder Auftrags.
+
+        Jeder unbekannte Artikel und jeder fehlende Satz wird genau einmal
+        geladen, unabhängig von der Zahl der Positionen.
+
+        Args:
+            lines: Positionen mit ``ItemId`` (z.B. CreateSalesOrderLineItem)
+            shipment_country: Lieferland (ISO)
+
+        Returns:
+            Satz je Position in gleicher Reihenfolge; None für Positionen ohne ItemId
+
+        Raises:
+            ApiError: Wenn ein Satz nicht ermittelt werden kann
+        """
+        item_ids = [line.get("ItemId") for line in lines]
+        unique = {item_id for item_id in item_ids if item_id is not None}
+
+        unknown = [item_id for item_id in unique if item_id not in self._item_classes]
+        if unknown:
+            self._load_items(unknown, company_id, departure_country, shipment_country)
+
+        keys = {
+            item_id: self._key(self._item_classes[item_id], company_id, departure_country, shipment_country)
+            for item_id in unique
+        }
+        self._load_cells(set(keys.values()))
+
+        rates = self._rates
+        result = [rates[keys[item_id]] if item_id is not None else None for item_id in item_ids]
+        with self._lock:
+            self._hits += len(unique) - len(unknown)
+        return result
+
+    def clear(self) -> None:
+        """Verwirft alle Sätze (z.B. nach einer Steuersatzänderung); Artikelzuordnung bleibt"""
+        with self._lock:
+            self._rates.clear()
+            self._tax_classes = None
+
+    def stats(self) -> TaxStats:
+        with self._lock:
+            return TaxStats(
+                items=len(self._item_classes),
+                cells=len(self._rates),
+                hits=self._hits,
+                requests=self._requests
+            )
+
+
+# ==================== Beispiele ====================
+
+if __name__ == "__main__":
+    import time
+
+    try:
+        client = JtlWawiClient()
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        print("Setzen Sie die Umgebungsvariable JTL_API_KEY oder übergeben Sie den API-Key.")
+        exit(1)
+
+    with client:
+        taxes = TaxResolver(client, company_id=1, departure_country="DE")
+        started = time.perf_counter()
+        loaded = taxes.precompute(["DE", "AT", "CH", "FR", "NL"])
+        print(f"{loaded} Steuersätze in {(time.perf_counter() - started) * 1000:.0f} ms geladen")
+
+        order_lines = [{"ItemId": item_id % 50 + 1, "Quantity": 1} for item_id in range(200)]
+        for country in ("DE", "AT", "CH"):
+            started = time.perf_counter()
+            rates = taxes.resolve_lines(order_lines, shipment_country=country)
+            print(f"200 Positionen nach {country}: {(time.perf_counter() - started) * 1000:.1f} ms, "
+                  f"Sätze {sorted(set(rates))}")
+        print(taxes.stats())
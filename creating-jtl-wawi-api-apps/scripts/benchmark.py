@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi Client-Benchmark
+
+Misst Durchsatz und Latenz von JtlWawiClient gegen den lokalen Mock-Server
+(``mock_server.py``), der dafür in einem eigenen Prozess gestartet wird.
+
+Szenarien:
+- get:    Einzelabrufe über ``client.get_customer`` (mit Cache/Zusammenfassen des Clients)
+- scan:   Vollständiger Abzug von /items (``client.scan``); die Scans laufen
+          nacheinander, die Parallelität gilt für die Seitenabrufe je Scan
+- write:  Bestandsbuchungen POST /stocks (``client.create_stock``)
+- mixed:  70 % get, 20 % Seitenabruf ``client.query_articles``, 10 % write
+
+Je Szenario und Parallelität werden Operationen/s, Anfragen/s, Latenz
+(p50/p95/p99), Speicherallokationen (tracemalloc, eigener Durchlauf) und
+übertragene Bytes (vom Mock-Server gezählt) ermittelt. Die Ergebnisse werden
+als JSON gespeichert und lassen sich mit einem früheren Lauf vergleichen.
+
+Verwendung:
+    python benchmark.py "../../openapi (1).json" --output bench/$(git rev-parse --short HEAD).json
+    python benchmark.py "openapi.json" --scenarios get,mixed --concurrency 1,8,32 --ops 2000
+    python benchmark.py "openapi.json" --compare bench/alt.json --output bench/neu.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from itertools import count
+from typing import Optional, Dict, Any, List, Callable, Tuple
+
+import requests
+
+TEMPLATES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets", "templates")
+sys.path.insert(0, os.path.abspath(TEMPLATES))
+
+from api_client import JtlWawiClient  # noqa: E402
+
+SCENARIOS = ("get", "scan", "write", "mixed")
+SCAN_PAGE_SIZE = 500
+MIN_SCAN_OPS = 20  # Mindestanzahl Scans, damit p95/p99 aussagekräftig sind
+REGRESSION_THRESHOLD = 0.10  # 10 % langsamer = Regression
+
+
+@dataclass
+class BenchResult:
+    """Messwerte eines Szenarios bei einer Parallelität"""
+    scenario: str
+    concurrency: int
+    ops: int
+    errors: int
+    seconds: float
+    ops_per_second: float
+    requests: int
+    requests_per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    bytes_sent: int  # Client -> Server
+    bytes_received: int  # Server -> Client
+    alloc_peak_kb: float  # Spitzenspeicher während des Allokations-Durchlaufs
+    alloc_kb_per_op: float  # nach dem Durchlauf noch belegter Speicher je Operation
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Perzentil nach Nearest-Rank (values muss sortiert sein)"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(q * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+# ==================== Mock-Server ====================
+
+class MockProcess:
+    """Startet mock_server.py in einem eigenen Prozess (eigener GIL)"""
+
+    def __init__(self, spec: str, total_items: int, latency: float):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_server.py")
+        self._process = subprocess.Popen(
+            [sys.executable, script, spec, "--port", str(self.port),
+             "--total-items", str(total_items), "--latency", str(latency)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        self._session = requests.Session()
+        for _ in range(100):
+            try:
+                self._session.get(f"{self.base_url}/__mock/config", timeout=1)
+                return
+            except requests.exceptions.ConnectionError:
+                time.sleep(0.1)
+        self.close()
+        raise RuntimeError("Mock-Server startet nicht")
+
+    def reset(self) -> None:
+        self._session.delete(f"{self.base_url}/__mock/stats")
+
+    def stats(self) -> Dict[str, Any]:
+        return self._session.get(f"{self.base_url}/__mock/stats").json()
+
+    def close(self) -> None:
+        self._process.terminate()
+        self._process.wait(timeout=10)
+
+
+# ==================== Szenarien ====================
+
+def _operation(scenario: str, client: JtlWawiClient, concurrency: int, total_items: int) -> Callable[[int], bool]:
+    """Liefert die Operation eines Szenarios (Argument: laufende Nummer, Ergebnis: Erfolg)"""
+    if scenario == "get":
+        return lambda n: client.get_customer(n % total_items + 1).success
+
+    if scenario == "scan":
+        def scan(n: int) -> bool:
+            rows = client.scan("/items", page_size=SCAN_PAGE_SIZE, max_workers=concurrency)
+            return sum(1 for _ in rows) == total_items
+        return scan
+
+    if scenario == "write":
+        return lambda n: client.create_stock(n % 500 + 1, 1, 1.0, comment="Benchmark").success
+
+    if scenario == "mixed":
+        def mixed(n: int) -> bool:
+            roll = n * 37 % 100  # deterministische Verteilung, gleich in jedem Lauf
+            if roll < 70:
+                return client.get_customer(n % total_items + 1).success
+            if roll < 90:
+                page_index = n % max(total_items // 100, 1)
+                return client.query_articles(page_size=100, page_index=page_index).success
+            return client.create_stock(n % 500 + 1, 1, -1.0, comment="Benchmark").success
+        return mixed
+
+    raise ValueError(f"Unbekanntes Szenario: {scenario}")
+
+
+def _run(operation: Callable[[int], bool], ops: int, concurrency: int) -> Tuple[List[float], int, float]:
+    """Führt ``ops`` Operationen mit ``concurrency`` Threads aus: (Latenzen, Fehler, Dauer)"""
+    counter = count()
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def worker() -> None:
+        local: List[float] = []
+        failed = 0
+        while True:
+            n = next(counter)
+            if n >= ops:
+                break
+            started = time.perf_counter()
+            try:
+                ok = operation(n)
+            except Exception:
+                ok = False
+            local.append(time.perf_counter() - started)
+            failed += not ok
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return latencies, errors[0], time.perf_counter() - started
+
+
+def run_benchmark(
+    mock: MockProcess,
+    scenario: str,
+    concurrency: int,
+    ops: int,
+    total_items: int,
+    alloc_ops: int,
+    cache_size: int = 0
+) -> BenchResult:
+    """Misst ein Szenario bei einer Parallelität"""
+    threads = concurrency
+    if scenario == "scan":
+        # Scans nacheinander: parallel gestartete identische Scans würden vom
+        # Zusammenfassen gleicher GETs (coalesce) zu einem verschmolzen
+        threads = 1
+        pages = max(-(-total_items // SCAN_PAGE_SIZE), 1)
+        ops = max(ops // pages, MIN_SCAN_OPS)  # etwa so viele Anfragen wie die übrigen Szenarien
+        alloc_ops = 1
+
+    with JtlWawiClient(
+        base_url=mock.base_url, api_key="MOCK-KEY", pool_maxsize=max(concurrency, 10), cache_size=cache_size
+    ) as client:
+        operation = _operation(scenario, client, concurrency, total_items)
+        _run(operation, min(ops, 20, 2 * threads), threads)  # Aufwärmen: Verbindungen aufbauen
+
+        mock.reset()
+        latencies, errors, seconds = _run(operation, ops, threads)
+        stats = mock.stats()
+
+        # Allokationen in einem eigenen, kürzeren Durchlauf (tracemalloc bremst stark)
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        _run(operation, alloc_ops, threads)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    latencies.sort()
+    return BenchResult(
+        scenario=scenario,
+        concurrency=concurrency,
+        ops=ops,
+        errors=errors,
+        seconds=round(seconds, 3),
+        ops_per_second=round(ops / seconds, 1),
+        requests=stats["requests"],
+        requests_per_second=round(stats["requests"] / seconds, 1),
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 2),
+        p95_ms=round(percentile(latencies, 0.95) * 1000, 2),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 2),
+        bytes_sent=stats["bytes_received"],
+        bytes_received=stats["bytes_sent"],
+        alloc_peak_kb=round((peak - baseline) / 1024, 1),
+        alloc_kb_per_op=round(max(current - baseline, 0) / 1024 / alloc_ops, 2),
+    )
+
+
+# ==================== Ergebnisse ====================
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: List[BenchResult]) -> None:
+    print(f"{'Szenario':<8} {'Par.':>4} {'Ops/s':>9} {'Anfr./s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'KB rein':>9} {'Peak KB':>8} {'Fehler':>6}")
+    for r in results:
+        print(f"{r.scenario:<8} {r.concurrency:>4} {r.ops_per_second:>9.1f} {r.requests_per_second:>9.1f} "
+              f"{r.p50_ms:>8.2f} {r.p95_ms:>8.2f} {r.p99_ms:>8.2f} {r.bytes_received / 1024:>9.0f} "
+              f"{r.alloc_peak_kb:>8.0f} {r.errors:>6}")
+
+
+def compare(old_path: str, results: List[BenchResult]) -> int:
+    """Vergleicht mit einem früheren Lauf; liefert die Anzahl der Regressionen"""
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    previous = {(r["scenario"], r["concurrency"]): r for r in old["results"]}
+
+    print(f"\nVergleich mit {old_path} (Commit {old.get('commit') or '?'}):")
+    regressions = 0
+    for r in results:
+        before = previous.get((r.scenario, r.concurrency))
+        if before is None:
+            continue
+        throughput = r.ops_per_second / before["ops_per_second"] - 1 if before["ops_per_second"] else 0
+        latency = r.p95_ms / before["p95_ms"] - 1 if before["p95_ms"] else 0
+        regressed = throughput < -REGRESSION_THRESHOLD or latency > REGRESSION_THRESHOLD
+        regressions += regressed
+        marker = "✗ REGRESSION" if regressed else "✓"
+        print(f"  {r.scenario:<8} x{r.concurrency:<3} Ops/s {throughput:+7.1%}   p95 {latency:+7.1%}   {marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für JtlWawiClient gegen den Mock-Server")
+    parser.add_argument("spec", help="Pfad zur OpenAPI-JSON-Datei")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Kommagetrennt: get,scan,write,mixed")
+    parser.add_argument("--concurrency", default="1,8,32", help="Parallelitätsstufen, kommagetrennt")
+    parser.add_argument("--ops", type=int, default=2000, help="Operationen je Messung")
+    parser.add_argument("--alloc-ops", type=int, default=200, help="Operationen im Allokations-Durchlauf")
+    parser.add_argument("--total-items", type=int, default=5000, help="Einträge je PagedList im Mock")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulierte Serverlatenz in Sekunden")
+    parser.add_argument("--cache-size", type=int, default=0, help="Entity-Cache des Clients (0 = aus)")
+    parser.add_argument("--output", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--compare", help="Früheres Ergebnis-JSON zum Vergleich")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    levels = [int(level) for level in args.concurrency.split(",")]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        print(f"Fehler: Unbekannte Szenarien: {', '.join(sorted(unknown))}")
+        sys.exit(1)
+
+    mock = MockProcess(args.spec, args.total_items, args.latency)
+    results: List[BenchResult] = []
+    try:
+        for scenario in scenarios:
+            for concurrency in levels:
+                result = run_benchmark(
+                    mock, scenario, concurrency, args.ops, args.total_items, args.alloc_ops, args.cache_size
+                )
+                results.append(result)
+                print(f"  {scenario} x{concurrency}: {result.ops_per_second} Ops/s, p95 {result.p95_ms} ms",
+                      file=sys.stderr)
+    finally:
+        mock.close()
+
+    print()
+    print_results(results)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "commit": _git_commit(),
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "settings": {
+                    "ops": args.ops, "total_items": args.total_items, "latency": args.latency,
+                    "cache_size": args.cache_size,
+                },
+                "results": [asdict(result) for result in results],
+            }, f, indent=2)
+        print(f"\n✓ Ergebnisse gespeichert: {args.output}")
+
+    if args.compare and compare(args.compare, results):
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,647 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi Endpoint-Generator
+
+Erzeugt aus der OpenAPI-Spezifikation der JTL-Wawi ein Python-Paket mit
+typisierten Endpoint-Wrappern und schlanken Response-Modellen (``__slots__``).
+
+- Ein Untermodul pro Tag (``customer``, ``item``, ``wms``, ...)
+- Modelle nach Namespace gruppiert in ``models/`` (``models/customer.py``, ...)
+- Untermodule werden erst beim ersten Attributzugriff importiert (PEP 562);
+  zur Laufzeit wird die Spezifikation nicht gelesen.
+- Modelle aus anderen Modulen werden in Annotationen nur für Typprüfer
+  importiert (``if TYPE_CHECKING``); ``wawi_api.type_hints()`` löst sie zur
+  Laufzeit auf.
+
+Verwendung:
+    python generate_endpoints.py "openapi (1).json" --output ../assets/templates/wawi_api
+
+    from api_client import JtlWawiClient
+    from wawi_api import WawiApi
+
+    with JtlWawiClient() as client:
+        api = WawiApi(client)
+        response = api.item.query_item_sales_channel_price(item_id=42)
+        for price in response.data:
+            print(price.SalesChannelId, price.NetPrice)
+
+Das erzeugte Paket wird neben ``api_client.py`` abgelegt und importiert
+``ApiResponse`` von dort.
+"""
+
+import argparse
+import json
+import keyword
+import os
+import re
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Header-Parameter setzt der Client selbst
+SKIPPED_HEADERS = {"api-version", "x-appid", "x-appversion", "x-runas", "x-sessionid"}
+
+PRIMITIVES = {
+    "integer": "int",
+    "number": "float",
+    "string": "str",
+    "boolean": "bool",
+}
+
+PAGED_LIST_PREFIX = "JTL.Wawi.Rest.Contracts.Models.PagedListOf"
+V1_PREFIX = "JTL.Wawi.Rest.Contracts.Models.V1."
+
+TYPING_NAMES = ("Any", "Dict", "List", "Optional")
+
+
+# ==================== Namen ====================
+
+def snake_case(name: str) -> str:
+    """camelCase/PascalCase -> snake_case (z.B. departureCountryISO -> departure_country_iso)"""
+    name = re.sub(r"[^0-9a-zA-Z]+", "_", name)
+    name = re.sub(r"([A-Z]+)([A-Z][a-z])", r"\1_\2", name)
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", name)
+    name = name.strip("_").lower()
+    if not name or name[0].isdigit():
+        name = f"_{name}"
+    return f"{name}_" if keyword.iskeyword(name) else name
+
+
+def method_name(operation_id: str) -> str:
+    """CustomerHeader_QueryCustomersAsync -> query_customers"""
+    name = operation_id.split("_", 1)[-1]
+    if name.endswith("Async"):
+        name = name[:-len("Async")]
+    return snake_case(name)
+
+
+def schema_namespace(full_name: str) -> str:
+    """Namespace (= Modell-Modul) eines Schemas, z.B. ...V1.Customer.Address -> customer"""
+    if full_name.startswith(PAGED_LIST_PREFIX):
+        full_name = full_name[len(PAGED_LIST_PREFIX):]
+    if full_name.startswith(V1_PREFIX):
+        return snake_case(full_name[len(V1_PREFIX):].split(".")[0])
+    return "common"
+
+
+def class_names(schemas: Dict[str, Any]) -> Dict[str, str]:
+    """Vergibt eindeutige Klassennamen für alle Objekt- und Enum-Schemas"""
+    names: Dict[str, str] = {}
+    taken: Dict[str, str] = {}
+    for full_name in sorted(schemas):
+        if full_name.startswith(PAGED_LIST_PREFIX):
+            short = "PagedListOf" + full_name.rsplit(".", 1)[-1]
+        else:
+            short = re.sub(r"\W", "_", full_name.rsplit(".", 1)[-1])
+        if short in taken:
+            # Namenskonflikt: Namespace voranstellen
+            prefix = "".join(part.title() for part in schema_namespace(full_name).split("_"))
+            short = f"{prefix}{short}"
+        taken[short] = full_name
+        names[full_name] = short
+    return names
+
+
+# ==================== Typen ====================
+
+class Resolver:
+    """Löst $ref-Verweise auf und bildet Schemas auf Python-Typen ab"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.schemas: Dict[str, Any] = spec.get("components", {}).get("schemas", {})
+        self.models = {
+            name: schema for name, schema in self.schemas.items()
+            if schema.get("type") == "object" or "enum" in schema
+        }
+        self.names = class_names(self.models)
+
+    @staticmethod
+    def ref_name(schema: Dict[str, Any]) -> Optional[str]:
+        ref = schema.get("$ref")
+        return ref.rsplit("/", 1)[-1] if ref else None
+
+    def deref(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        name = self.ref_name(schema)
+        return self.schemas.get(name, {}) if name else schema
+
+    def model_of(self, schema: Dict[str, Any]) -> Optional[str]:
+        """Klassenname, falls das Schema ein (Objekt-)Modell referenziert"""
+        name = self.ref_name(schema)
+        if name in self.models and "enum" not in self.models[name]:
+            return self.names[name]
+        return None
+
+    def py_type(
+        self, schema: Dict[str, Any], usage: Optional["ModuleUsage"] = None, shadow: Optional[str] = None
+    ) -> str:
+        """
+        Python-Typannotation für ein Schema (Modelle als String-Referenz).
+
+        Referenzierte Modelle werden in ``usage`` gesammelt. Heißt das Feld
+        wie die Klasse (``shadow``), wird über das Modul referenziert
+        (``"common.Dimensions"``), da der Feldname die Klasse im Klassenkörper verdeckt.
+        """
+        name = self.ref_name(schema)
+        if name:
+            target = self.schemas.get(name, {})
+            if name in self.models:
+                class_name = self.names[name]
+                if usage is not None and class_name == shadow:
+                    usage.modules.add(schema_namespace(name))
+                    return f'"{schema_namespace(name)}.{class_name}"'
+                if usage is not None:
+                    usage.refs.add(name)
+                return f'"{class_name}"'
+            return self.py_type(target, usage, shadow)
+        kind = schema.get("type")
+        if kind == "array":
+            return f"List[{self.py_type(schema.get('items', {}), usage, shadow)}]"
+        if kind == "object":
+            return "Dict[str, Any]"
+        return PRIMITIVES.get(kind, "Any")
+
+    def field_spec(self, schema: Dict[str, Any]) -> Tuple[Optional[str], bool]:
+        """(Modellklasse, ist_liste) für die Umwandlung verschachtelter Felder"""
+        if schema.get("type") == "array":
+            return self.model_of(schema.get("items", {})), True
+        return self.model_of(schema), False
+
+
+@dataclass
+class ModuleUsage:
+    """Was ein erzeugtes Modul in Annotationen verwendet (bestimmt dessen Importe)"""
+    refs: Set[str] = field(default_factory=set)  # referenzierte Modelle (voller Schemaname)
+    modules: Set[str] = field(default_factory=set)  # als Modul referenzierte Namespaces
+    annotations: List[str] = field(default_factory=list)
+
+    def typing_names(self) -> List[str]:
+        text = " ".join(self.annotations)
+        return [name for name in TYPING_NAMES if re.search(rf"\b{name}\b", text)]
+
+
+def render_imports(stdlib: List[str], local: List[str], type_imports: Dict[str, Set[str]]) -> str:
+    """
+    Import-Block eines erzeugten Moduls.
+
+    ``type_imports`` (Modulpfad -> Klassennamen) landen unter ``if TYPE_CHECKING``:
+    Typprüfer kennen die Namen, zur Laufzeit bleibt der Import aus.
+    """
+    text = "\n\n".join("\n".join(lines) for lines in (stdlib, local) if lines)
+    if type_imports:
+        lines = ["if TYPE_CHECKING:"]
+        for module in sorted(type_imports):
+            names = sorted(type_imports[module])
+            line = f"    from {module} import {', '.join(names)}"
+            if len(line) <= 100:
+                lines.append(line)
+            else:
+                lines += [f"    from {module} import ("] + [f"        {name}," for name in names] + ["    )"]
+        text += "\n\n" + "\n".join(lines)
+    return text
+
+
+def typing_import(usage: ModuleUsage, type_checking: bool) -> List[str]:
+    names = (["TYPE_CHECKING"] if type_checking else []) + usage.typing_names()
+    return [f"from typing import {', '.join(names)}"] if names else []
+
+
+# ==================== Modelle ====================
+
+MODEL_HEADER = '''"""
+JTL-Wawi Modelle: {namespace}
+
+Automatisch erzeugt von generate_endpoints.py - nicht von Hand bearbeiten.
+"""
+
+{imports}
+'''
+
+
+def render_model(resolver: Resolver, full_name: str, usage: ModuleUsage) -> str:
+    schema = resolver.models[full_name]
+    name = resolver.names[full_name]
+    description = (schema.get("description") or full_name).strip().replace('"""', "'")
+
+    if "enum" in schema:
+        labels = schema.get("x-enumNames") or [f"VALUE_{value}" for value in schema["enum"]]
+        lines = [f"class {name}(IntEnum):", f'    """{description}"""']
+        for label, value in zip(labels, schema["enum"]):
+            label = re.sub(r"\W", "_", str(label))
+            if not label.isidentifier() or keyword.iskeyword(label):
+                label = f"VALUE_{value}"
+            lines.append(f"    {label} = {value!r}")
+        return "\n".join(lines)
+
+    properties = schema.get("properties", {})
+    fields = []
+    for prop, prop_schema in properties.items():
+        model, is_list = resolver.field_spec(prop_schema)
+        fields.append((prop, resolver.py_type(prop_schema, usage, shadow=prop), model, is_list))
+
+    lines = [f"class {name}(Model):", f'    """{description}"""', ""]
+    lines.append(f"    __slots__ = {tuple(prop for prop, *_ in fields)!r}")
+    nested = {prop: (model, is_list) for prop, _, model, is_list in fields if model}
+    lines.append(f"    _nested = {nested!r}")
+    if fields:
+        lines.append("")
+        for prop, annotation, _, _ in fields:
+            lines.append(f"    {prop}: Optional[{annotation}]")
+            usage.annotations.append(f"Optional[{annotation}]")
+    return "\n".join(lines)
+
+
+def render_model_module(resolver: Resolver, module: str, full_names: List[str]) -> str:
+    usage = ModuleUsage()
+    classes = [render_model(resolver, full_name, usage) for full_name in full_names]
+
+    type_imports: Dict[str, Set[str]] = defaultdict(set)
+    for ref in usage.refs:
+        if schema_namespace(ref) != module:
+            type_imports[f".{schema_namespace(ref)}"].add(resolver.names[ref])
+    if usage.modules:
+        type_imports["."] = usage.modules
+
+    has_enum = any("enum" in resolver.models[name] for name in full_names)
+    has_model = any("enum" not in resolver.models[name] for name in full_names)
+    stdlib = (["from enum import IntEnum"] if has_enum else []) + typing_import(usage, bool(type_imports))
+    local = ["from .._runtime import Model"] if has_model else []
+    header = MODEL_HEADER.format(namespace=module, imports=render_imports(stdlib, local, type_imports))
+    return "\n\n\n".join([header.rstrip()] + classes) + "\n"
+
+
+def render_models_init(modules: Dict[str, List[str]]) -> str:
+    index = {name: module for module, names in modules.items() for name in names}
+    return f'''"""
+JTL-Wawi Modelle
+
+Automatisch erzeugt von generate_endpoints.py - nicht von Hand bearbeiten.
+Die Modelle liegen nach Namespace in Untermodulen und werden erst beim
+ersten Zugriff importiert.
+"""
+
+import importlib
+from typing import Any
+
+# Klassenname -> Untermodul
+_INDEX = {json.dumps(index, indent=4, sort_keys=True)}
+
+__all__ = sorted(_INDEX)
+
+
+def __getattr__(name: str) -> Any:
+    module = _INDEX.get(name)
+    if module is None:
+        raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+    value = getattr(importlib.import_module(f".{{module}}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return __all__
+'''
+
+
+# ==================== Endpoints ====================
+
+ENDPOINT_HEADER = '''"""
+JTL-Wawi Endpoints: {tag}
+
+Automatisch erzeugt von generate_endpoints.py - nicht von Hand bearbeiten.
+"""
+
+{imports}
+
+
+class {class_name}(EndpointGroup):
+    """Endpoints des Tags '{tag}'"""
+'''
+
+
+def render_operation(
+    resolver: Resolver, path: str, method: str, operation: Dict[str, Any], usage: ModuleUsage
+) -> str:
+    name = method_name(operation["operationId"])
+    summary = (operation.get("summary") or operation["operationId"]).strip().replace('"""', "'")
+
+    path_params: List[Tuple[str, str, str]] = []
+    query_params: List[Tuple[str, str, str, bool]] = []
+    for param in operation.get("parameters", []):
+        if param["in"] == "header" and param["name"].lower() in SKIPPED_HEADERS:
+            continue
+        arg = snake_case(param["name"])
+        annotation = resolver.py_type(param.get("schema", {}), usage)
+        if param["in"] == "path":
+            path_params.append((param["name"], arg, annotation))
+        elif param["in"] == "query":
+            query_params.append((param["name"], arg, annotation, bool(param.get("required"))))
+
+    has_body = "requestBody" in operation
+    args = ["self"]
+    args += [f"{arg}: {annotation}" for _, arg, annotation in path_params]
+    if has_body:
+        args.append("body: Dict[str, Any]" if operation["requestBody"].get("required") else "body: Optional[Dict[str, Any]] = None")
+    args += [f"{arg}: {annotation}" for _, arg, annotation, required in query_params if required]
+    args += [f"{arg}: Optional[{annotation}] = None" for _, arg, annotation, required in query_params if not required]
+    args.append("raw: bool = False")
+    usage.annotations += args
+
+    response_model, is_list = None, False
+    for code, response in operation.get("responses", {}).items():
+        if code.startswith("2"):
+            schema = response.get("content", {}).get("application/json", {}).get("schema", {})
+            response_model, is_list = resolver.field_spec(schema)
+            break
+
+    url = path
+    for original, arg, _ in path_params:
+        url = url.replace("{" + original + "}", "{" + arg + "}")
+
+    lines = [f"    def {name}({', '.join(args)}) -> ApiResponse:"]
+    lines.append(f'        """{method.upper()} {path}: {summary}"""')
+    if query_params:
+        lines.append("        params = {")
+        lines += [f"            {original!r}: {arg}," for original, arg, _, _ in query_params]
+        lines.append("        }")
+    else:
+        lines.append("        params = None")
+    endpoint = f"f{url!r}" if path_params else repr(url)
+    lines.append(
+        f"        return self._call({method.upper()!r}, {endpoint}, "
+        f"{'body' if has_body else 'None'}, params, {response_model!r}, {is_list}, raw)"
+    )
+    return "\n".join(lines)
+
+
+def render_package_init(tags: Dict[str, str]) -> str:
+    return f'''"""
+JTL-Wawi Endpoints (generiert)
+
+Automatisch erzeugt von generate_endpoints.py - nicht von Hand bearbeiten.
+
+Verwendung:
+    from wawi_api import WawiApi
+
+    api = WawiApi(client)
+    api.customer.query_customers(search_key_word="Muster")
+
+Jedes Tag-Modul wird erst beim ersten Zugriff importiert.
+"""
+
+import importlib
+from typing import Any, Dict, get_type_hints
+
+# Attributname -> (Untermodul, Klasse)
+_GROUPS = {json.dumps(tags, indent=4, sort_keys=True)}
+
+__all__ = ["WawiApi", "type_hints"] + sorted(_GROUPS)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _GROUPS:
+        module = importlib.import_module(f".{{name}}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+
+
+def __dir__():
+    return __all__
+
+
+class _ModelNamespace(dict):
+    """Namensraum für get_type_hints: lädt Modellklassen und -module erst beim Nachschlagen"""
+
+    def __missing__(self, name: str) -> Any:
+        models = importlib.import_module(".models", __name__)
+        if name in models.__all__:
+            return getattr(models, name)
+        if name in models._INDEX.values():
+            return importlib.import_module(f".models.{{name}}", __name__)
+        raise KeyError(name)
+
+
+def type_hints(obj: Any) -> Dict[str, Any]:
+    """
+    typing.get_type_hints() für generierte Endpoints und Modelle.
+
+    Modelle anderer Module werden nur für Typprüfer importiert
+    (``if TYPE_CHECKING``) und hier bei Bedarf geladen.
+    """
+    return get_type_hints(obj, localns=_ModelNamespace())
+
+
+class WawiApi:
+    """
+    Einstieg in alle generierten Endpoints
+
+    ``WawiApi(client).item`` importiert beim ersten Zugriff das Modul ``item``
+    und liefert dessen Endpoint-Gruppe, gebunden an ``client``.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self._groups: Dict[str, Any] = {{}}
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in _GROUPS:
+            raise AttributeError(name)
+        group = self._groups.get(name)
+        if group is None:
+            module = importlib.import_module(f".{{name}}", __name__)
+            group = self._groups[name] = getattr(module, _GROUPS[name])(self._client)
+        return group
+
+    def __dir__(self):
+        return sorted(_GROUPS)
+'''
+
+
+RUNTIME = '''"""
+Laufzeit-Basis der generierten Endpoints und Modelle.
+
+Automatisch erzeugt von generate_endpoints.py - nicht von Hand bearbeiten.
+"""
+
+import importlib
+from typing import Any, Dict, Optional, Tuple
+
+from api_client import ApiResponse
+
+
+def _model_class(name: str):
+    return getattr(importlib.import_module(f"{__package__}.models"), name)
+
+
+class Model:
+    """Basis für Response-Modelle: feste Felder über __slots__, keine Instanz-Dicts"""
+
+    __slots__ = ()
+    _nested: Dict[str, Tuple[str, bool]] = {}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]):
+        """Erzeugt ein Modell aus einer API-Antwort (unbekannte Felder werden ignoriert)"""
+        if data is None:
+            return None
+        instance = cls.__new__(cls)
+        nested = cls._nested
+        for name in cls.__slots__:
+            value = data.get(name)
+            if value is not None and name in nested:
+                model_name, is_list = nested[name]
+                model = _model_class(model_name)
+                value = [model.from_dict(entry) for entry in value] if is_list else model.from_dict(value)
+            setattr(instance, name, value)
+        return instance
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Wandelt das Modell zurück in ein Dict (ohne leere Felder)"""
+        result = {}
+        for name in self.__slots__:
+            value = getattr(self, name, None)
+            if value is None:
+                continue
+            if isinstance(value, Model):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = [entry.to_dict() if isinstance(entry, Model) else entry for entry in value]
+            result[name] = value
+        return result
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name, None)!r}" for name in self.__slots__[:3])
+        return f"{type(self).__name__}({fields}, ...)"
+
+
+class EndpointGroup:
+    """Basis der Endpoint-Gruppen: leitet Aufrufe an JtlWawiClient._request weiter"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def _call(
+        self,
+        method: str,
+        endpoint: str,
+        body: Optional[Dict[str, Any]],
+        params: Optional[Dict[str, Any]],
+        model: Optional[str],
+        is_list: bool,
+        raw: bool
+    ) -> ApiResponse:
+        if params:
+            params = {key: value for key, value in params.items() if value is not None}
+        response = self._client._request(method, endpoint, data=body, params=params or None)
+        if raw or not model or not response.success or response.data is None:
+            return response
+
+        cls = _model_class(model)
+        data = [cls.from_dict(entry) for entry in response.data] if is_list else cls.from_dict(response.data)
+        return ApiResponse(
+            success=response.success,
+            data=data,
+            error=response.error,
+            status_code=response.status_code
+        )
+'''
+
+
+# ==================== Generator ====================
+
+def generate(spec_path: str, output: str) -> Dict[str, int]:
+    with open(spec_path, encoding="utf-8") as f:
+        spec = json.load(f)
+
+    resolver = Resolver(spec)
+
+    # Operationen nach Tag gruppieren (die /v1/-Duplikate auslassen)
+    operations: Dict[str, List[Tuple[str, str, Dict[str, Any]]]] = defaultdict(list)
+    for path, methods in spec.get("paths", {}).items():
+        if path.startswith("/v1/"):
+            continue
+        for method, operation in methods.items():
+            tag = (operation.get("tags") or ["default"])[0]
+            operations[tag].append((path, method, operation))
+
+    os.makedirs(os.path.join(output, "models"), exist_ok=True)
+
+    # Modelle nach Namespace
+    model_modules: Dict[str, List[str]] = defaultdict(list)
+    for full_name in sorted(resolver.models):
+        model_modules[schema_namespace(full_name)].append(full_name)
+
+    for module, full_names in model_modules.items():
+        _write(os.path.join(output, "models", f"{module}.py"), render_model_module(resolver, module, full_names))
+
+    _write(
+        os.path.join(output, "models", "__init__.py"),
+        render_models_init({
+            module: [resolver.names[name] for name in names] for module, names in model_modules.items()
+        })
+    )
+
+    # Endpoints nach Tag
+    groups: Dict[str, str] = {}
+    for tag, entries in sorted(operations.items()):
+        module = snake_case(tag)
+        class_name = "".join(part.title() for part in module.split("_")) + "Endpoints"
+        groups[module] = class_name
+
+        methods = []
+        seen = set()
+        usage = ModuleUsage()
+        for path, method, operation in sorted(entries, key=lambda entry: entry[2]["operationId"]):
+            name = method_name(operation["operationId"])
+            if name in seen:
+                continue
+            seen.add(name)
+            methods.append(render_operation(resolver, path, method, operation, usage))
+
+        type_imports: Dict[str, Set[str]] = defaultdict(set)
+        for ref in usage.refs:
+            type_imports[f".models.{schema_namespace(ref)}"].add(resolver.names[ref])
+        imports = render_imports(
+            typing_import(usage, bool(type_imports)),
+            ["from api_client import ApiResponse", "from ._runtime import EndpointGroup"],
+            type_imports
+        )
+        source = (
+            ENDPOINT_HEADER.format(tag=tag, class_name=class_name, imports=imports)
+            + "\n" + "\n\n".join(methods) + "\n"
+        )
+        _write(os.path.join(output, f"{module}.py"), source)
+
+    _write(os.path.join(output, "_runtime.py"), RUNTIME)
+    _write(os.path.join(output, "__init__.py"), render_package_init(groups))
+
+    return {
+        "tags": len(groups),
+        "operations": sum(len(entries) for entries in operations.values()),
+        "models": len(resolver.models),
+    }
+
+
+def _write(path: str, content: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Erzeugt Endpoint-Wrapper aus der JTL-Wawi OpenAPI-Spezifikation")
+    parser.add_argument("spec", help="Pfad zur OpenAPI-JSON-Datei")
+    parser.add_argument("--output", default="wawi_api", help="Zielverzeichnis des Pakets (Standard: wawi_api)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.spec):
+        print(f"Fehler: Spezifikation nicht gefunden: {args.spec}")
+        sys.exit(1)
+
+    counts = generate(args.spec, args.output)
+    print(f"✓ {counts['operations']} Operationen in {counts['tags']} Modulen, "
+          f"{counts['models']} Modelle -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
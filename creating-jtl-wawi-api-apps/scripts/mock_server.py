@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+"""
+JTL-Wawi Mock-Server
+
+Lokaler Ersatz für den JTL-Wawi REST-Server, erzeugt aus der
+OpenAPI-Spezifikation. Für Last- und Regressionstests, bei denen keine echte
+Wawi zur Verfügung steht (oder nicht belastet werden darf).
+
+- Jeder Endpoint der Spezifikation antwortet mit Beispieldaten passend zum
+  Response-Schema; PagedList-Endpoints mit echter Paginierung (TotalItems,
+  HasNextPage, fortlaufende Ids) in konfigurierbarer Größe.
+- Latenz, Fehlerquote und 429-Drosselung lassen sich einstellen.
+- Die App-Registrierung (/authentication) läuft wie auf dem echten Server:
+  202 mit RegistrationRequestId, danach Status 0 beim Polling, bis die
+  Registrierung nach ``--approve-after`` Abfragen genehmigt wird (Status 1 + Token).
+  Der Ablauf folgt dem in references/registration-flow.md beschriebenen
+  Serververhalten (die Enum-Beschreibung der Spezifikation weicht davon ab).
+- Die älteren Pfade der Komfortmethoden von ``JtlWawiClient`` (``/customer/{id}``,
+  ``/customer/query``, ``/article/query``, ``/company/query`` …) stehen nicht in
+  der Spezifikation. Der Mock leitet sie auf die passenden Endpoints um
+  (``/customers/{id}``, ``GET /customers`` …); bei ``*/query`` werden
+  ``PageSize``/``PageIndex`` aus dem Body zu ``pageSize``/``pageNumber``.
+
+Verwendung:
+    python mock_server.py "openapi (1).json" --port 5883 --total-items 5000 \\
+        --latency 0.02 --jitter 0.03 --error-rate 0.01 --rate-limit 200
+
+    JTL_API_BASE_URL=http://localhost:5883 JTL_API_KEY=MOCK-KEY python api_client.py
+    JTL_API_BASE_URL=http://localhost:5883 JTL_POLL_INTERVAL=0.2 python register_app.py
+
+    # Zähler abrufen / zurücksetzen
+    curl http://localhost:5883/__mock/stats
+    curl -X DELETE http://localhost:5883/__mock/stats
+
+Aus Python (z.B. in Lasttests):
+    from mock_server import MockConfig, serve
+
+    server = serve("openapi (1).json", port=0, config=MockConfig(total_items=10_000))
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    ...
+    server.shutdown()
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlsplit, parse_qsl
+
+PAGED_LIST_PREFIX = "JTL.Wawi.Rest.Contracts.Models.PagedListOf"
+BASE_PATH = "/api/eazybusiness"  # Basis-Pfad laut "servers" der Spezifikation (optional)
+MAX_DEPTH = 3  # Verschachtelungstiefe der Beispieldaten
+PAGE_CACHE_SIZE = 512
+
+
+@dataclass
+class MockConfig:
+    """Verhalten des Mock-Servers"""
+    total_items: int = 1000  # Einträge je PagedList-Endpoint
+    page_size: int = 50  # Seitengröße ohne pageSize-Parameter
+    max_page_size: int = 1000
+    latency: float = 0.0  # feste Antwortverzögerung in Sekunden
+    jitter: float = 0.0  # zusätzliche zufällige Verzögerung (0..jitter)
+    error_rate: float = 0.0  # Anteil der Anfragen mit HTTP 503
+    rate_limit: float = 0.0  # Anfragen pro Sekunde, darüber HTTP 429 (0 = unbegrenzt)
+    approve_after: int = 2  # Polling-Abfragen bis zur Genehmigung
+    reject: bool = False  # Registrierungen ablehnen statt genehmigen
+    api_key: str = "MOCK-KEY"
+    require_auth: bool = True  # "Authorization: Wawi <key>" prüfen
+    blob_size: int = 16 * 1024  # Größe von Binärdaten (Bilder, PDFs) in Bytes
+    seed: int = 42
+
+
+@dataclass
+class MockStats:
+    """Zähler seit Start bzw. letztem Zurücksetzen"""
+    requests: int = 0
+    errors: int = 0
+    throttled: int = 0
+    bytes_received: int = 0  # Anfragezeile, Header und Body
+    bytes_sent: int = 0  # Statuszeile, Header und Body
+    by_status: Dict[int, int] = field(default_factory=dict)
+
+
+@dataclass
+class Route:
+    """Ein Endpoint der Spezifikation"""
+    method: str
+    template: str
+    pattern: "re.Pattern"
+    params: List[str]
+    status: int
+    schema: Optional[Dict[str, Any]]
+
+
+# ==================== Beispieldaten ====================
+
+_BASE_DATE = datetime(2024, 1, 1, 8, 0, 0)
+
+
+class SampleGenerator:
+    """Erzeugt Beispieldaten passend zu den Schemas der Spezifikation"""
+
+    def __init__(self, spec: Dict[str, Any], config: MockConfig):
+        self.schemas: Dict[str, Any] = spec.get("components", {}).get("schemas", {})
+        self.config = config
+        self._random = random.Random(config.seed)
+        self._prototypes: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._blob = base64.b64encode(os.urandom(config.blob_size)).decode("ascii")
+
+    @staticmethod
+    def ref_name(schema: Dict[str, Any]) -> Optional[str]:
+        ref = schema.get("$ref")
+        return ref.rsplit("/", 1)[-1] if ref else None
+
+    def prototype(self, name: str) -> Any:
+        """Beispielobjekt eines benannten Schemas (einmal erzeugt, danach wiederverwendet)"""
+        with self._lock:
+            if name not in self._prototypes:
+                self._prototypes[name] = self.value(self.schemas.get(name, {}), name, 0)
+            return self._prototypes[name]
+
+    def value(self, schema: Dict[str, Any], name: str, depth: int) -> Any:
+        """Beispielwert für ein Schema; ``name`` ist der Feldname (für sprechende Werte)"""
+        ref = self.ref_name(schema)
+        if ref:
+            schema = self.schemas.get(ref, {})
+
+        if "enum" in schema:
+            return schema["enum"][0]
+
+        kind = schema.get("type")
+        if kind == "object" or "properties" in schema:
+            if depth >= MAX_DEPTH:
+                return None
+            return {
+                prop: self.value(prop_schema, prop, depth + 1)
+                for prop, prop_schema in schema.get("properties", {}).items()
+            }
+        if kind == "array":
+            if depth >= MAX_DEPTH:
+                return []
+            return [self.value(schema.get("items", {}), name, depth + 1) for _ in range(2)]
+        if kind == "integer":
+            return self._random.randint(1, 500)
+        if kind == "number":
+            return round(self._random.uniform(1, 250), 2)
+        if kind == "boolean":
+            return self._random.random() < 0.5
+        if kind == "string":
+            return self._string(schema.get("format"), name, depth)
+        return None
+
+    def _string(self, fmt: Optional[str], name: str, depth: int) -> str:
+        if fmt == "date-time":
+            return (_BASE_DATE + timedelta(minutes=self._random.randint(0, 500_000))).isoformat()
+        if fmt == "byte":
+            return self._blob if depth == 0 else "AAAA"
+        if fmt == "uuid":
+            return str(uuid.UUID(int=self._random.getrandbits(128)))
+
+        lowered = name.lower()
+        if "mail" in lowered:
+            return f"kunde{self._random.randint(1, 9999)}@example.com"
+        if "iso" in lowered or "country" in lowered:
+            return "DE"
+        if "currency" in lowered:
+            return "EUR"
+        if "zip" in lowered or "postcode" in lowered:
+            return f"{self._random.randint(10000, 99999)}"
+        if "city" in lowered:
+            return self._random.choice(("Berlin", "Hamburg", "München", "Köln", "Hückelhoven"))
+        if "phone" in lowered or "fax" in lowered:
+            return f"+49 {self._random.randint(100, 999)} {self._random.randint(100000, 999999)}"
+        if "number" in lowered or "sku" in lowered:
+            return f"{name[:2].upper()}-{self._random.randint(10000, 99999)}"
+        if "url" in lowered or "website" in lowered:
+            return "https://www.example.com"
+        return f"{name or 'Wert'} {self._random.randint(1, 999)}"
+
+    def record(self, name: str, record_id: int, overrides: Dict[str, Any]) -> Any:
+        """Beispielobjekt mit eigener Id und übernommenen Filter-/Pfadwerten"""
+        proto = self.prototype(name)
+        if not isinstance(proto, dict):
+            return proto
+        record = dict(proto)
+        if "Id" in record:
+            record["Id"] = record_id
+        for key in ("LastChange", "LastChangeDate", "Changed", "ChangedDate"):
+            if key in record:
+                record[key] = (_BASE_DATE + timedelta(minutes=record_id)).isoformat()
+        for key, value in overrides.items():
+            record[key] = value
+        return record
+
+
+def _overrides(record: Any, values: Dict[str, str]) -> Dict[str, Any]:
+    """Ordnet Pfad-/Query-Parameter gleichnamigen Feldern zu (itemId -> ItemId)"""
+    if not isinstance(record, dict) or not values:
+        return {}
+    fields = {key.lower(): key for key in record}
+    result = {}
+    for name, raw in values.items():
+        key = fields.get(name.lower())
+        if key is None:
+            continue
+        original = record[key]
+        try:
+            result[key] = int(raw) if isinstance(original, int) and not isinstance(original, bool) else raw
+        except ValueError:
+            result[key] = raw
+    return result
+
+
+# Ältere Pfade der Komfortmethoden im Client -> (Methode, Pfad der Spezifikation)
+LEGACY_ROUTES: List[Tuple[str, "re.Pattern", str, str]] = [
+    (method, re.compile(pattern), target_method, target)
+    for method, pattern, target_method, target in [
+        ("POST", r"^/customer/query$", "GET", "/customers"),
+        ("POST", r"^/customer$", "POST", "/customers"),
+        ("GET", r"^/customer/(?P<id>\d+)$", "GET", "/customers/{id}"),
+        ("PUT", r"^/customer/(?P<id>\d+)$", "PATCH", "/customers/{id}"),
+        ("DELETE", r"^/customer/(?P<id>\d+)$", "DELETE", "/customers/{id}"),
+        ("POST", r"^/salesorder/query$", "GET", "/salesOrders"),
+        ("POST", r"^/salesorder$", "POST", "/salesOrders"),
+        ("GET", r"^/salesorder/(?P<id>\d+)$", "GET", "/salesOrders/{id}"),
+        ("POST", r"^/article/query$", "GET", "/items"),
+        ("GET", r"^/article/(?P<id>\d+)$", "GET", "/items/{id}"),
+        ("POST", r"^/stock/query$", "GET", "/stocks"),
+        ("POST", r"^/stock/adjustment$", "POST", "/stocks"),
+        ("POST", r"^/invoice/query$", "GET", "/invoices"),
+        ("GET", r"^/invoice/(?P<id>\d+)$", "GET", "/invoices/{id}"),
+        ("POST", r"^/company/query$", "GET", "/companies"),
+        ("POST", r"^/category/query$", "GET", "/categories"),
+        ("GET", r"^/category/(?P<id>\d+)$", "GET", "/categories/{id}"),
+    ]
+]
+
+# Body-Felder der älteren */query-Aufrufe -> Query-Parameter der Spezifikation
+_LEGACY_QUERY_FIELDS = {"PageSize": "pageSize", "ArticleId": "itemId", "WarehouseId": "warehouseId"}
+
+
+def _legacy_route(
+    method: str,
+    path: str,
+    query: Dict[str, str],
+    body: bytes
+) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """Übersetzt einen älteren Client-Pfad: (Methode, Pfad, Query, Body) oder None"""
+    for legacy_method, pattern, target_method, target in LEGACY_ROUTES:
+        found = pattern.match(path) if method == legacy_method else None
+        if not found:
+            continue
+        path = target.format(**found.groupdict())
+        if target_method == "GET" and body:
+            try:
+                filters = json.loads(body)
+            except ValueError:
+                filters = {}
+            query = dict(query)
+            for name, value in (filters if isinstance(filters, dict) else {}).items():
+                if name == "PageIndex":
+                    query["pageNumber"] = str(_int(str(value), 0) + 1)
+                elif name in _LEGACY_QUERY_FIELDS:
+                    query[_LEGACY_QUERY_FIELDS[name]] = str(value)
+            body = b""
+        return target_method, path, query, body
+    return None
+
+
+# ==================== Server-Logik ====================
+
+class MockWawi:
+    """Routing, Beispielantworten, Fehlerinjektion und Registrierungsablauf"""
+
+    def __init__(self, spec: Dict[str, Any], config: MockConfig):
+        self.config = config
+        self.generator = SampleGenerator(spec, config)
+        self.routes = self._build_routes(spec)
+        self.stats = MockStats()
+
+        self._lock = threading.Lock()
+        self._random = random.Random(config.seed)
+        self._tokens = config.rate_limit
+        self._refilled = time.monotonic()
+        self._registrations: Dict[str, Dict[str, Any]] = {}
+        self._pages: "OrderedDict[Tuple, bytes]" = OrderedDict()
+
+    @staticmethod
+    def _build_routes(spec: Dict[str, Any]) -> Dict[str, List[Route]]:
+        routes: Dict[str, List[Route]] = {}
+        for template, methods in spec.get("paths", {}).items():
+            params = re.findall(r"{([^}]+)}", template)
+            regex = "^" + re.sub(r"\\{([^}]+)\\}", r"(?P<\1>[^/]+)", re.escape(template)) + "$"
+            for method, operation in methods.items():
+                status, schema = 200, None
+                for code, response in sorted(operation.get("responses", {}).items()):
+                    if code.startswith("2"):
+                        status = int(code)
+                        schema = response.get("content", {}).get("application/json", {}).get("schema")
+                        break
+                routes.setdefault(method.upper(), []).append(
+                    Route(method.upper(), template, re.compile(regex), params, status, schema)
+                )
+        # Feste Pfade vor Pfaden mit Platzhaltern (/stocks/changes vor /stocks/{id})
+        for entries in routes.values():
+            entries.sort(key=lambda route: (len(route.params), -len(route.template)))
+        return routes
+
+    def match(self, method: str, path: str) -> Tuple[Optional[Route], Dict[str, str]]:
+        for route in self.routes.get(method, []):
+            found = route.pattern.match(path)
+            if found:
+                return route, found.groupdict()
+        return None, {}
+
+    # ==================== Anfragen ====================
+
+    def handle(
+        self,
+        method: str,
+        target: str,
+        headers: Dict[str, str],
+        body: bytes
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Beantwortet eine Anfrage: (Status, Header, Body)"""
+        parts = urlsplit(target)
+        path = parts.path
+        if path.startswith(BASE_PATH):
+            path = path[len(BASE_PATH):] or "/"
+        query = dict(parse_qsl(parts.query))
+
+        if path.startswith("/__mock/"):
+            return self._admin(method, path)
+
+        status, extra, payload = self._dispatch(method, path, query, headers, body)
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.by_status[status] = self.stats.by_status.get(status, 0) + 1
+            if status == 429:
+                self.stats.throttled += 1
+            elif status >= 500:
+                self.stats.errors += 1
+        return status, extra, payload
+
+    def _dispatch(self, method, path, query, headers, body) -> Tuple[int, Dict[str, str], bytes]:
+        config = self.config
+        if config.latency or config.jitter:
+            time.sleep(config.latency + self._random.uniform(0, config.jitter))
+
+        if not self._take_token():
+            return 429, {"Retry-After": "1"}, _json({"title": "Too Many Requests", "status": 429})
+        if config.error_rate and self._random.random() < config.error_rate:
+            return 503, {}, _json({"title": "Service Unavailable", "status": 503, "detail": "Mock-Fehler"})
+
+        if path == "/authentication" or path.startswith("/authentication/"):
+            return self._authentication(method, path, headers, body)
+
+        if config.require_auth and headers.get("authorization") != f"Wawi {config.api_key}":
+            return 401, {}, _json({"title": "Unauthorized", "status": 401})
+
+        route, path_params = self.match(method, path)
+        if route is None:
+            legacy = _legacy_route(method, path, query, body)
+            if legacy:
+                method, path, query, body = legacy
+                route, path_params = self.match(method, path)
+        if route is None:
+            return 404, {}, _json({"title": "Not Found", "status": 404, "detail": f"{method} {path}"})
+        if route.status == 204 or route.schema is None:
+            return route.status, {}, b""
+
+        if (self.generator.ref_name(route.schema) or "").startswith(PAGED_LIST_PREFIX):
+            return 200, {}, self._page(route, path, query)
+
+        return route.status, {}, _json(self._body(route.schema, path_params, query, body))
+
+    def count_bytes(self, received: int, sent: int) -> None:
+        """Zählt übertragene Bytes (vom HTTP-Handler gemeldet)"""
+        with self._lock:
+            self.stats.bytes_received += received
+            self.stats.bytes_sent += sent
+
+    def _take_token(self) -> bool:
+        """Token-Bucket für die 429-Drosselung"""
+        rate = self.config.rate_limit
+        if not rate:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(rate, self._tokens + (now - self._refilled) * rate)
+            self._refilled = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def _body(self, schema: Dict[str, Any], path_params: Dict[str, str], query: Dict[str, str], body: bytes) -> Any:
+        """Antwort für Einzelobjekte, Listen und Primitive"""
+        generator = self.generator
+        ref = generator.ref_name(schema)
+        if ref:
+            record_id = _int(list(path_params.values())[-1], 1) if path_params else 1
+            record = generator.record(ref, record_id, {})
+            record.update(_overrides(record, {**query, **path_params}) if isinstance(record, dict) else {})
+            if isinstance(record, dict) and body:
+                # Bei POST/PATCH die gesendeten Felder zurückgeben
+                try:
+                    sent = json.loads(body)
+                    if isinstance(sent, dict):
+                        record.update({key: value for key, value in sent.items() if key in record})
+                except ValueError:
+                    pass
+            return record
+        if schema.get("type") == "array":
+            item_ref = generator.ref_name(schema.get("items", {}))
+            if item_ref:
+                overrides = _overrides(generator.prototype(item_ref), path_params)
+                return [generator.record(item_ref, index, overrides) for index in range(1, 4)]
+        return generator.value(schema, "", 0)
+
+    def _page(self, route: Route, path: str, query: Dict[str, str]) -> bytes:
+        """PagedList-Seite; fertig serialisierte Seiten werden zwischengespeichert"""
+        config = self.config
+        page_number = max(_int(query.get("pageNumber"), 1), 1)
+        page_size = min(max(_int(query.get("pageSize"), config.page_size), 1), config.max_page_size)
+        key = (route.template, path, tuple(sorted(query.items())))
+
+        with self._lock:
+            cached = self._pages.get(key)
+            if cached is not None:
+                self._pages.move_to_end(key)
+                return cached
+
+        item_name = self.generator.ref_name(
+            self.generator.schemas[self.generator.ref_name(route.schema)]["properties"]["Items"]["items"]
+        )
+        filters = {name: value for name, value in query.items() if name not in ("pageNumber", "pageSize")}
+        overrides = _overrides(self.generator.prototype(item_name), filters)
+
+        total = config.total_items
+        total_pages = (total + page_size - 1) // page_size
+        first = (page_number - 1) * page_size
+        items = [
+            self.generator.record(item_name, record_id, overrides)
+            for record_id in range(first + 1, min(first + page_size, total) + 1)
+        ]
+        payload = _json({
+            "TotalItems": total,
+            "PageNumber": page_number,
+            "PageSize": page_size,
+            "Items": items,
+            "TotalPages": total_pages,
+            "HasPreviousPage": page_number > 1,
+            "HasNextPage": page_number < total_pages,
+            "NextPageNumber": page_number + 1 if page_number < total_pages else page_number,
+            "PreviousPageNumber": page_number - 1 if page_number > 1 else page_number,
+        })
+
+        with self._lock:
+            self._pages[key] = payload
+            if len(self._pages) > PAGE_CACHE_SIZE:
+                self._pages.popitem(last=False)
+        return payload
+
+    # ==================== Registrierung ====================
+
+    def _authentication(self, method, path, headers, body) -> Tuple[int, Dict[str, str], bytes]:
+        challenge = headers.get("x-challengecode")
+        if not challenge:
+            return 400, {}, _json({"title": "Bad Request", "status": 400, "detail": "X-ChallengeCode fehlt"})
+
+        if method == "POST" and path == "/authentication":
+            try:
+                app = json.loads(body or b"{}")
+            except ValueError:
+                return 400, {}, _json({"title": "Bad Request", "status": 400, "detail": "Ungültiges JSON"})
+            registration_id = str(uuid.uuid4()).upper()
+            with self._lock:
+                self._registrations[registration_id] = {
+                    "app": app, "challenge": challenge, "polls": 0
+                }
+            return 202, {}, _json({"RequestStatusInfo": {
+                "AppId": app.get("AppId"), "RegistrationRequestId": registration_id, "Status": 0
+            }})
+
+        registration_id = path.rsplit("/", 1)[-1]
+        with self._lock:
+            registration = self._registrations.get(registration_id)
+            if registration is None:
+                return 404, {}, _json({"title": "Not Found", "status": 404})
+            if registration["challenge"] != challenge:
+                return 403, {}, _json({"title": "Forbidden", "status": 403, "detail": "X-ChallengeCode weicht ab"})
+            registration["polls"] += 1
+            polls = registration["polls"]
+
+        app = registration["app"]
+        status = 0
+        if polls > self.config.approve_after:
+            status = 2 if self.config.reject else 1
+        result: Dict[str, Any] = {"RequestStatusInfo": {
+            "AppId": app.get("AppId"), "RegistrationRequestId": registration_id, "Status": status
+        }}
+        if status == 1:
+            scopes = list(app.get("MandatoryApiScopes") or []) + list(app.get("OptionalApiScopes") or [])
+            result["Token"] = {"ApiKey": self.config.api_key}
+            result["GrantedScopes"] = ",".join(scopes)
+        return 200, {}, _json(result)
+
+    # ==================== Verwaltung ====================
+
+    def _admin(self, method: str, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        if path == "/__mock/stats":
+            with self._lock:
+                if method == "DELETE":
+                    self.stats = MockStats()
+                return 200, {}, _json(asdict(self.stats))
+        if path == "/__mock/config":
+            return 200, {}, _json(asdict(self.config))
+        return 404, {}, b""
+
+
+def _json(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _int(value: Optional[str], default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# ==================== HTTP ====================
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-Alive, damit Connection-Pools wiederverwendet werden
+    disable_nagle_algorithm = True  # Header und Body ohne 40-ms-Verzögerung (Nagle + Delayed ACK)
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        headers = {name.lower(): value for name, value in self.headers.items()}
+
+        status, extra, payload = self.server.mock.handle(self.command, self.path, headers, body)
+        self.send_response(status)
+        if payload:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in extra.items():
+            self.send_header(name, value)
+        header_bytes = sum(len(line) for line in self._headers_buffer) + 2
+        self.end_headers()
+        self.wfile.write(payload)
+
+        if not self.path.startswith("/__mock/"):
+            received = len(self.raw_requestline) + sum(len(name) + len(value) + 4 for name, value in self.headers.items()) + 2
+            self.server.mock.count_bytes(received + len(body), header_bytes + len(payload))
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond
+
+    def log_message(self, format, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address: Tuple[str, int], mock: MockWawi, verbose: bool = False):
+        super().__init__(address, _Handler)
+        self.mock = mock
+        self.verbose = verbose
+
+
+def serve(
+    spec_path: str,
+    host: str = "127.0.0.1",
+    port: int = 5883,
+    config: Optional[MockConfig] = None,
+    verbose: bool = False
+) -> MockServer:
+    """Startet den Mock-Server in einem Hintergrund-Thread (Port 0 = freier Port)"""
+    with open(spec_path, encoding="utf-8") as f:
+        spec = json.load(f)
+    server = MockServer((host, port), MockWawi(spec, config or MockConfig()), verbose)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    defaults = MockConfig()
+    parser = argparse.ArgumentParser(description="Mock-Server für die JTL-Wawi REST API")
+    parser.add_argument("spec", help="Pfad zur OpenAPI-JSON-Datei")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5883)
+    parser.add_argument("--total-items", type=int, default=defaults.total_items, help="Einträge je PagedList")
+    parser.add_argument("--page-size", type=int, default=defaults.page_size, help="Seitengröße ohne pageSize")
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="Verzögerung in Sekunden")
+    parser.add_argument("--jitter", type=float, default=defaults.jitter, help="Zusätzliche Zufallsverzögerung")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="Anteil HTTP 503 (0..1)")
+    parser.add_argument("--rate-limit", type=float, default=defaults.rate_limit, help="Anfragen/s vor HTTP 429")
+    parser.add_argument("--approve-after", type=int, default=defaults.approve_after, help="Polls bis Genehmigung")
+    parser.add_argument("--reject", action="store_true", help="Registrierungen ablehnen")
+    parser.add_argument("--api-key", default=defaults.api_key)
+    parser.add_argument("--no-auth", action="store_true", help="Authorization-Header nicht prüfen")
+    parser.add_argument("--blob-size", type=int, default=defaults.blob_size, help="Größe von Binärdaten in Bytes")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--verbose", action="store_true", help="Jede Anfrage protokollieren")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.spec):
+        print(f"Fehler: Spezifikation nicht gefunden: {args.spec}")
+        sys.exit(1)
+
+    config = MockConfig(
+        total_items=args.total_items,
+        page_size=args.page_size,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        approve_after=args.approve_after,
+        reject=args.reject,
+        api_key=args.api_key,
+        require_auth=not args.no_auth,
+        blob_size=args.blob_size,
+        seed=args.seed,
+    )
+    server = serve(args.spec, args.host, args.port, config, args.verbose)
+    print(f"✓ Mock-Server läuft auf http://{args.host}:{server.server_port} "
+          f"({sum(len(routes) for routes in server.mock.routes.values())} Endpoints)")
+    print(f"  API-Key: {config.api_key}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()